@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Per-worker memory of a pre-fork server (i.e: gunicorn ``--preload``),\
+with and without freezing the hooks before forking.\
+``--freeze`` compacts the registries only, ``--gc-freeze``\
+also calls ``gc.freeze()`` right before forking, so each\
+saving can be told apart.
+
+Usage (Linux only)::
+
+    $ python benchmarks/prefork_memory.py --hooks 5000 --workers 8
+    $ python benchmarks/prefork_memory.py --hooks 5000 --workers 8 --freeze
+    $ python benchmarks/prefork_memory.py --hooks 5000 --workers 8 --freeze --gc-freeze
+
+Every worker dispatches all the hooks and runs a full garbage collection,\
+then reports its private (unshared) memory, read from ``/proc/self/smaps_rollup``.
+"""
+
+from __future__ import unicode_literals, print_function
+
+import os
+import sys
+import gc
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django
+from django.conf import settings
+
+settings.configure(
+    INSTALLED_APPS=['hooks'],
+    DATABASES={},
+    TEMPLATES=[{'BACKEND': 'django.template.backends.django.DjangoTemplates'}])
+django.setup()
+
+from hooks.signalhook import hook as signal_hook
+from hooks.templatehook import hook as template_hook
+from hooks.warmup import warm_up
+
+
+def private_kb():
+    """
+    Private memory of the current process in KB
+    """
+    private = 0
+
+    with open('/proc/self/smaps_rollup') as fh:
+        for line in fh:
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                private += int(line.split()[1])
+
+    return private
+
+
+def make_callback(i):
+    def callback(*args, **kwargs):
+        return '<li>%d</li>' % i
+
+    return callback
+
+
+def register(hooks, callbacks):
+    for i in range(hooks):
+        for j in range(callbacks):
+            func = make_callback(j)
+            template_hook.register('hook.%d' % i, func)
+            signal_hook.connect('signal.%d' % i, func, weak=False)
+
+
+def work(hooks):
+    for i in range(hooks):
+        template_hook.render('hook.%d' % i, None)
+        signal_hook.send('signal.%d' % i)
+
+    gc.collect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--hooks', type=int, default=5000)
+    parser.add_argument('--callbacks', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--freeze', action='store_true')
+    parser.add_argument('--gc-freeze', action='store_true')
+    args = parser.parse_args()
+
+    if args.gc_freeze:
+        gc.disable()  # Avoid holes in the master pages
+
+    register(args.hooks, args.callbacks)
+
+    if args.freeze:
+        warm_up()
+
+    if args.gc_freeze:
+        gc.freeze()
+
+    results = []
+
+    for _ in range(args.workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+
+        if pid == 0:
+            os.close(read_fd)
+            gc.enable()
+            work(args.hooks)
+            os.write(write_fd, str(private_kb()).encode('ascii'))
+            os._exit(0)
+
+        os.close(write_fd)
+
+        with os.fdopen(read_fd) as fh:
+            results.append(int(fh.read()))
+
+        os.waitpid(pid, 0)
+
+    print('freeze=%s gc_freeze=%s hooks=%d callbacks=%d workers=%d' % (
+        args.freeze, args.gc_freeze, args.hooks, args.callbacks, args.workers))
+    print('private memory per worker: avg %d KB, max %d KB' % (
+        sum(results) // len(results), max(results)))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,3 +3,5 @@
 from __future__ import unicode_literals
 
 __version__ = "0.2.0-pre"
+
+default_app_config = 'hooks.apps.HooksConfig'
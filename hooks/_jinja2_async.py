@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+# Python 3.5+ only, see jinja2ext
+
+import inspect
+
+from markupsafe import Markup, escape
+
+from .templatehook import hook as templatehook
+
+
+async def hook_async(context, name, *args, **kwargs):
+    """
+    Same as :py:func:`hooks.jinja2ext.hook`,\
+    awaiting the callbacks responses when needed
+    """
+    responses = []
+
+    for response in templatehook(name, context, *args, **kwargs):
+        if inspect.isawaitable(response):
+            response = await response
+
+        responses.append(escape(response))
+
+    return Markup('\n').join(responses)
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class HooksConfig(AppConfig):
+    """
+    Apply the ``HOOKS_REGISTRATIONS`` (see :py:mod:`hooks.reload`)\
+    and warm up (see :py:func:`hooks.warmup.warm_up`)\
+    the hooks when the ``HOOKS_WARMUP`` setting is ``True``.\
+    The ``hooks`` app must be the last one\
+    in ``INSTALLED_APPS``, so the hooks registered\
+    by other apps in their ``ready()`` are warmed up
+    """
+    name = 'hooks'
+    verbose_name = "Hooks"
+
+    def ready(self):
+        if getattr(settings, 'HOOKS_REGISTRATIONS', None) is not None:
+            from .reload import reloader
+
+            reloader.poll()
+
+        if not getattr(settings, 'HOOKS_WARMUP', False):
+            return
+
+        from .warmup import warm_up
+
+        warm_up(
+            templates=getattr(settings, 'HOOKS_WARMUP_TEMPLATES', ()),
+            strict=getattr(settings, 'HOOKS_FROZEN_STRICT', False),
+            gc_freeze=getattr(settings, 'HOOKS_GC_FREEZE', False))
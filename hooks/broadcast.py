@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import os
+import errno
+import json
+import socket
+import logging
+import threading
+
+
+__all__ = [
+    'Backend',
+    'UnixSocketBackend',
+    'Transport'
+]
+
+logger = logging.getLogger(__name__)
+
+# Max datagram size we will send and read
+_MAX_PAYLOAD = 2 ** 16
+
+
+class Backend(object):
+    """
+    Base class for broadcast backends.\
+    A backend moves opaque payloads (bytes)\
+    between sibling processes
+
+    :ivar int max_payload: Max bytes of a payload,\
+    larger batches are split by the transport
+    """
+    max_payload = _MAX_PAYLOAD
+
+    def publish(self, payload):
+        """
+        Send the payload to every sibling process
+
+        :param bytes payload: Encoded batch of messages
+        """
+        raise NotImplementedError
+
+    def receive(self, timeout=None):
+        """
+        Wait for a payload sent by a sibling process
+
+        :param float timeout: Seconds to wait for,\
+        ``None`` waits forever
+        :return: The payload or ``None`` on timeout
+        :rtype: bytes
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Release the backend resources
+        """
+
+
+class UnixSocketBackend(Backend):
+    """
+    Unix domain (datagram) socket backend.\
+    Every process binds a socket within a shared directory,\
+    publishing sends the payload to every other socket there.\
+    It must be created after forking, in each worker
+
+    :param str path: Directory shared by all the processes
+    :param float send_timeout: Seconds to block when a sibling\
+    is not reading fast enough (backpressure), the payload\
+    is dropped for that sibling after that
+    :param int max_payload: Max bytes of a datagram,\
+    it must be within the system limit
+    """
+    def __init__(self, path, send_timeout=0.1, max_payload=_MAX_PAYLOAD):
+        self.path = path
+        self.address = os.path.join(path, '%d.sock' % os.getpid())
+        self.max_payload = max_payload
+        self.dropped = 0
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.bind(self.address)
+        self._out = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._out.settimeout(send_timeout)
+
+    def _peers(self):
+        return [
+            os.path.join(self.path, file_name)
+            for file_name in os.listdir(self.path)
+            if file_name.endswith('.sock') and
+            os.path.join(self.path, file_name) != self.address
+        ]
+
+    def publish(self, payload):
+        for peer in self._peers():
+            try:
+                self._out.sendto(payload, peer)
+            except socket.timeout:
+                self.dropped += 1
+                logger.warning("Broadcast to %s timed out, dropped", peer)
+            except socket.error as err:
+                if err.errno == errno.EMSGSIZE:
+                    self.dropped += 1
+                    logger.warning(
+                        "Broadcast of %d bytes to %s is too long, dropped",
+                        len(payload), peer)
+                    continue
+
+                if err.errno not in (errno.ECONNREFUSED, errno.ENOENT):
+                    raise
+
+                # Stale socket of a dead process
+                try:
+                    os.remove(peer)
+                except OSError:
+                    pass
+
+    def receive(self, timeout=None):
+        self._socket.settimeout(timeout)
+
+        try:
+            return self._socket.recv(self.max_payload)
+        except socket.timeout:
+            return None
+
+    def close(self):
+        self._socket.close()
+        self._out.close()
+
+        try:
+            os.remove(self.address)
+        except OSError:
+            pass
+
+
+class Transport(object):
+    """
+    Publishes signal hook sends to sibling processes\
+    and dispatches the ones they publish. Only selected\
+    hook names are broadcast. See\
+    :py:meth:`hooks.signalhook.Hook.set_transport`
+
+    Keyword arguments sent through a broadcast hook\
+    must be JSON serializable, the sender is not\
+    broadcast (receivers get ``sender=None``).
+
+    Sends are buffered and published by the listener\
+    thread only, so sending never blocks on slow siblings.\
+    Buffered sends are split into payloads of up to\
+    ``backend.max_payload`` bytes
+
+    :param backend: Instance of :py:class:`Backend`
+    :param list names: Hook names to broadcast
+    :param int batch_size: Max number of buffered sends,\
+    further sends are dropped (and counted) until the next flush
+    :param float flush_interval: Seconds between flushes\
+    of the listener thread (see :py:meth:`.start`)
+    :ivar int dropped: Number of sends dropped\
+    because the buffer was full or they were too long
+    """
+    def __init__(self, backend, names, batch_size=100, flush_interval=0.5):
+        assert batch_size > 0, \
+            "batch_size must be greater than zero"
+
+        self.backend = backend
+        self.names = frozenset(names)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.hook = None
+        self.dropped = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def publish(self, name, kwargs):
+        """
+        Buffer a send, it's published by\
+        the listener thread (see :py:meth:`.flush`).\
+        The send is dropped when the buffer is full
+
+        :param str name: The hook name
+        :param dict kwargs: Keyword arguments of the send
+        """
+        message = json.dumps([name, kwargs]).encode('utf-8')
+
+        with self._lock:
+            if len(self._pending) >= self.batch_size:
+                self.dropped += 1
+                logger.warning(
+                    "Broadcast buffer is full, send of %s dropped", name)
+                return
+
+            self._pending.append(message)
+
+    def _payloads(self, messages):
+        """
+        @Api private
+        Join the messages into payloads\
+        no longer than the backend max payload
+        """
+        max_payload = self.backend.max_payload
+        batch = []
+        size = 2  # Brackets
+
+        for message in messages:
+            if len(message) + 2 > max_payload:
+                self.dropped += 1
+                logger.warning(
+                    "Broadcast send of %d bytes is too long, dropped",
+                    len(message))
+                continue
+
+            if batch and size + 1 + len(message) > max_payload:
+                yield b'[' + b','.join(batch) + b']'
+                batch = []
+                size = 2
+
+            size += len(message) + (1 if batch else 0)
+            batch.append(message)
+
+        if batch:
+            yield b'[' + b','.join(batch) + b']'
+
+    def flush(self):
+        """
+        Publish all buffered sends.\
+        This is called by the listener thread
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        for payload in self._payloads(pending):
+            self.backend.publish(payload)
+
+    def dispatch(self, payload):
+        """
+        Send a batch published by a sibling\
+        to the receivers of this process.\
+        Receiver errors are isolated\
+        (see :py:meth:`hooks.signalhook.Hook.send_robust`)
+
+        :param bytes payload: Encoded batch of messages
+        :return: Number of dispatched messages
+        :rtype: int
+        """
+        messages = json.loads(payload.decode('utf-8'))
+
+        for name, kwargs in messages:
+            # A failing receiver must not drop the rest of the batch
+            try:
+                self.hook._send_robust_local(name, None, kwargs)
+            except Exception:
+                logger.exception("Broadcast of hook %s failed", name)
+
+        return len(messages)
+
+    def poll(self, timeout=None):
+        """
+        Wait for a batch and dispatch it
+
+        :param float timeout: Seconds to wait for
+        :return: Number of dispatched messages
+        :rtype: int
+        """
+        payload = self.backend.receive(timeout)
+
+        if payload is None:
+            return 0
+
+        return self.dispatch(payload)
+
+    def _listen(self):
+        while not self._stopped.is_set():
+            try:
+                self.flush()
+                self.poll(timeout=self.flush_interval)
+            except Exception:
+                logger.exception("Broadcast listener error")
+
+    def start(self):
+        """
+        Start a daemon thread that flushes\
+        and dispatches received batches
+        """
+        assert self._thread is None, \
+            "The transport was already started"
+
+        self._thread = threading.Thread(target=self._listen)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the listener thread, flush and close the backend
+        """
+        self._stopped.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+        self.backend.close()
@@ -2,22 +2,285 @@
 
 from __future__ import unicode_literals
 
+import weakref
 
-__all__ = ['Hook']
+from django.db import transaction
+from django.core.exceptions import ValidationError
+from django.forms.fields import FileField
+from django.forms.formsets import BaseFormSet
+from django.forms.models import BaseModelFormSet
+from django.forms.utils import ErrorDict, ErrorList
+
+from .utils import EMPTY_ARGS, intern_name, swapped, FreezeMixin
+from .profiling import profiler
+from . import instrumentation
+from . import tracing
+
+
+__all__ = ['Hook', 'form_prefix']
+
+# Max number of cached plans, they are keyed by\
+# prefix and callable prefixes may be created per call
+MAX_PLANS = 64
+
+
+def form_prefix(form):
+    """
+    Prefix strategy based on the form identity\
+    (module and name), so the prefix of a form\
+    does not change when other forms are registered\
+    or unregistered. Usage: ``Hook(prefix=form_prefix)``
+
+    :param callable form: The form class
+    :return: The prefix, i.e: ``hook_my_app_forms_myform``
+    :rtype: str
+    """
+    return 'hook_%s_%s' % (
+        form.__module__.replace('.', '_'),
+        form.__name__.lower())
+
+
+def _initial(form, field, name):
+    """
+    @Api private
+    Same as ``form.get_initial_for_field()`` (Django 1.11+)
+    """
+    if hasattr(form, 'get_initial_for_field'):
+        return form.get_initial_for_field(field, name)
+
+    value = form.initial.get(name, field.initial)
+
+    if callable(value):
+        value = value()
+
+    return value
+
+
+def _clean_fields(form, names):
+    """
+    Clean some fields of a bound form,\
+    mirrors the form own cleaning of fields
+    """
+    form._errors = ErrorDict()
+    form.cleaned_data = {}
+
+    if not form.is_bound:
+        return
+
+    for name in names:
+        try:
+            field = form.fields[name]
+        except KeyError:
+            continue
+
+        if getattr(field, 'disabled', False):
+            value = _initial(form, field, name)
+        else:
+            value = field.widget.value_from_datadict(
+                form.data, form.files, form.add_prefix(name))
+
+        try:
+            if isinstance(field, FileField):
+                value = field.clean(value, _initial(form, field, name))
+            else:
+                value = field.clean(value)
+
+            form.cleaned_data[name] = value
+
+            if hasattr(form, 'clean_%s' % name):
+                form.cleaned_data[name] = getattr(form, 'clean_%s' % name)()
+        except ValidationError as err:
+            form.add_error(name, err)
+
+
+def _clean_formset_fields(formset, names):
+    """
+    Clean some fields of some forms of a bound formset.\
+    Field names are of the form ``<form index>-<field name>``
+    """
+    fields = {}
+
+    for name in names:
+        index, _, field = name.partition('-')
+        fields.setdefault(index, []).append(field)
+
+    forms = formset.forms
+
+    for index, names_ in fields.items():
+        try:
+            form = forms[int(index)]
+        except (ValueError, IndexError):
+            continue
+
+        _clean_fields(form, names_)
+
+
+def _error_list(errors):
+    """
+    @Api private
+    Same as ``ErrorList.get_json_data()`` (Django 2.0+)
+    """
+    return [
+        {'message': message, 'code': error.code or ''}
+        for error in errors.as_data()
+        for message in error]
+
+
+def _validation_errors(err):
+    """
+    @Api private
+    Errors of a formset with a missing\
+    or tampered management form
+    """
+    return {'__all__': _error_list(ErrorList(err.error_list))}
+
+
+def _form_errors(form):
+    if not isinstance(form, BaseFormSet):
+        return {
+            field: _error_list(errors)
+            for field, errors in form.errors.items()}
+
+    # Forms not cleaned (_errors is None) are left out
+    errors = {
+        str(i): _form_errors(form_)
+        for i, form_ in enumerate(form.forms)
+        if form_._errors}
+
+    if form._non_form_errors:
+        errors['__all__'] = _error_list(form._non_form_errors)
+
+    return errors
+
+
+def _save_model_formset(formset):
+    """
+    Save a model formset with bulk queries:\
+    a single query to delete, another one to create\
+    and one more to update (one per object before Django 2.2).\
+    Model ``save()`` is not called and signals are not sent.\
+    New objects get their primary key on backends\
+    returning it from bulk inserts only (i.e: PostgreSQL)
+    """
+    instances = formset.save(commit=False)
+    model = formset.model
+    manager = model._default_manager
+    deleted = [obj.pk for obj in formset.deleted_objects if obj.pk is not None]
+
+    if deleted:
+        manager.filter(pk__in=deleted).delete()
+
+    if formset.new_objects:
+        manager.bulk_create(formset.new_objects)
+
+    changed = [obj for obj, _ in formset.changed_objects]
+
+    if not changed:
+        return instances
+
+    concrete = set(field.name for field in model._meta.concrete_fields)
+    fields = sorted(set(
+        field
+        for _, fields_ in formset.changed_objects
+        for field in fields_
+        if field in concrete))
+
+    # Only non-model fields changed
+    if not fields:
+        return instances
+
+    if hasattr(manager, 'bulk_update'):
+        manager.bulk_update(changed, fields)
+    else:
+        for obj in changed:
+            obj.save(update_fields=fields)
+
+    return instances
+
+
+def _is_bulk_savable(form):
+    """
+    Model formsets with no custom save and\
+    no many-to-many fields can be saved in bulk
+    """
+    if not isinstance(form, BaseModelFormSet):
+        return False
+
+    save = getattr(type(form).save, '__func__', type(form).save)
+    default_save = getattr(
+        BaseModelFormSet.save, '__func__', BaseModelFormSet.save)
+    return save is default_save and not form.model._meta.many_to_many
+
+
+def _save_form(form, bulk, args, kwargs):
+    """
+    @Api private
+    Save a form or formset, model formsets\
+    are saved in bulk when possible
+    """
+    if bulk and _is_bulk_savable(form):
+        return _save_model_formset(form)
+
+    return form.save(*args, **kwargs)
 
 
 class HookFactory(object):
     """
     Hook factory, provide some short-cuts\
-    to make a sequence of forms behave as a single form.\
-    This is used by :py:class:`Hook`
+    to make a sequence of forms and formsets\
+    behave as a single form.\
+    This is used by :py:class:`Hook`. Forms are created\
+    on first access, :py:func:`.validate` only creates\
+    the forms it validates
 
-    :param list instances: Sequence of callables,\
+    :param list instances: Sequence of form instances,\
     usually :py:class:`django.forms.Form` or\
     :py:class:`django.forms.ModelForm`
+    :param tuple plans: Sequence of (form, prefix)\
+    used to create the forms, when no instances are given
+    :param tuple args: Positional arguments passed to the forms
+    :param dict kwargs: Keyword arguments passed to the forms
+    :param str name: The hook name, set by :py:class:`Hook`
     """
-    def __init__(self, instances):
-        self.instances = instances
+    __slots__ = ('_plans', '_args', '_kwargs', '_forms', '_instances', 'name')
+
+    def __init__(self, instances=None, plans=EMPTY_ARGS, args=EMPTY_ARGS, kwargs=None, name=None):
+        if instances is not None:
+            plans = tuple(
+                (type(form), getattr(form, 'prefix', None))
+                for form in instances)
+
+        self._plans = plans
+        self._args = args
+        self._kwargs = kwargs or {}
+        self._forms = dict(enumerate(instances or ()))
+        self._instances = instances
+        self.name = name
+
+    def _form(self, i):
+        try:
+            return self._forms[i]
+        except KeyError:
+            pass
+
+        form, prefix = self._plans[i]
+        instance = form(prefix=prefix, *self._args, **self._kwargs)
+        self._forms[i] = instance
+        return instance
+
+    @property
+    def instances(self):
+        """
+        All the form instances
+
+        :rtype: list
+        """
+        if self._instances is None:
+            self._instances = [
+                self._form(i)
+                for i in range(len(self._plans))]
+
+        return self._instances
 
     def __iter__(self):
         """
@@ -35,71 +298,259 @@ class HookFactory(object):
         :return: The result of validating all the forms
         :rtype: bool
         """
+        if tracing.tracer.enabled:
+            with tracing.dispatch_span(
+                    tracing.FORM_IS_VALID, 'form', self.name) as span:
+                tracing.set_result_size(span, self.instances)
+                return self._is_valid()
+
+        return self._is_valid()
+
+    def _is_valid(self):
+        """
+        @Api private
+        """
+        if tracing.tracer.callbacks:
+            return all([
+                tracing.call(
+                    'form', self.name, type(form), form.is_valid)
+                for form in self.instances])
+
         # Avoid short-circuit evaluation
         return all([form.is_valid() for form in self.instances])
 
+    def _find_form(self, field):
+        """
+        @Api private
+        Index of the form owning the (prefixed) field name
+        """
+        found = None
+        found_prefix = ''
+
+        for i, (_, prefix) in enumerate(self._plans):
+            if (prefix and len(prefix) > len(found_prefix) and
+                    field.startswith(prefix + '-')):
+                found = i
+                found_prefix = prefix
+
+        return found
+
+    def validate(self, fields=None, forms=None):
+        """
+        Validate some of the forms, or some fields of them.\
+        Forms not being validated are not created.\
+        Useful to validate a single field through AJAX::
+
+            errors = form_hook.validate(fields=['hook0-email'])
+            return JsonResponse(errors)
+
+        :param list fields: Prefixed names (as in the HTML form)\
+        of the fields to validate, i.e: ``hook0-email``\
+        or ``hook0-1-email`` for the second form of a formset.\
+        Only these fields are cleaned, form-wide validation is skipped
+        :param list forms: Prefixes of the forms\
+        to be fully validated, i.e: ``hook0``
+        :return: JSON serializable errors of\
+        the form ``{prefix: {field: [{message, code}]}}``,\
+        formset errors are of the form\
+        ``{prefix: {form index: {field: [{message, code}]}}}``.\
+        Forms without errors are left out. Validate all\
+        the forms when no fields or forms are given.\
+        A missing or tampered formset management form\
+        is reported as ``{prefix: {'__all__': [{message, code}]}}``
+        :rtype: dict
+        """
+        full = set()
+        partial = {}
+
+        if fields is None and forms is None:
+            full.update(range(len(self._plans)))
+
+        for i, (_, prefix) in enumerate(self._plans):
+            if prefix in (forms or ()):
+                full.add(i)
+
+        for field in fields or ():
+            i = self._find_form(field)
+
+            if i is None or i in full:
+                continue
+
+            prefix = self._plans[i][1]
+            partial.setdefault(i, []).append(field[len(prefix) + 1:])
+
+        errors = {}
+
+        for i in sorted(full):
+            form = self._form(i)
+
+            try:
+                form.is_valid()
+                errors[self._plans[i][1]] = _form_errors(form)
+            except ValidationError as err:  # Formset management form
+                errors[self._plans[i][1]] = _validation_errors(err)
+
+        for i, names in sorted(partial.items()):
+            form = self._form(i)
+
+            try:
+                if isinstance(form, BaseFormSet):
+                    _clean_formset_fields(form, names)
+                else:
+                    _clean_fields(form, names)
+
+                errors[self._plans[i][1]] = _form_errors(form)
+            except ValidationError as err:  # Formset management form
+                errors[self._plans[i][1]] = _validation_errors(err)
+
+        return {
+            prefix: form_errors
+            for prefix, form_errors in errors.items()
+            if form_errors}
+
     def save(self, *args, **kwargs):
         """
-        Save all the forms
+        Save all the forms within a single transaction
 
+        :param bool bulk: Save model formsets (with no custom save)\
+        with bulk queries, model ``save()`` is not called\
+        and no model signals are sent for them. ``False`` by default
         :param \*args: Positional arguments passed to the forms
         :param \*\*kwargs: Keyword arguments passed to the forms
         :return: Sequence of returned values by all the forms as tuples of (instance, result)
         :rtype: list
         """
-        return [
-            (form, form.save(*args, **kwargs))
-            for form in self.instances
-        ]
+        bulk = kwargs.pop('bulk', False)
+
+        if tracing.tracer.enabled:
+            with tracing.dispatch_span(
+                    tracing.FORM_SAVE, 'form', self.name) as span:
+                tracing.set_result_size(span, self.instances)
+                return self._save(bulk, args, kwargs)
+
+        return self._save(bulk, args, kwargs)
+
+    def _save(self, bulk, args, kwargs):
+        """
+        @Api private
+        """
+        if instrumentation.active():
+            profile = profiler.sample()
+
+            with transaction.atomic():
+                return [
+                    (form, instrumentation.call(
+                        'form', self.name, type(form), profile,
+                        _save_form, form, bulk, args, kwargs))
+                    for form in self.instances
+                ]
 
+        with transaction.atomic():
+            return [
+                (form, _save_form(form, bulk, args, kwargs))
+                for form in self.instances
+            ]
 
-class Hook(object):
+
+class Hook(FreezeMixin):
     """
     Container of forms
 
     :param list providing_args: A list of the arguments\
     this hook can pass along in a :py:func:`.__call__`
+    :param str name: Optional name, used for introspection
+    :param prefix: Default prefix for the forms,\
+    see :py:func:`.__call__`
     """
-    def __init__(self, providing_args=None):
-        self.providing_args = providing_args or []
+    # All created hooks, used for introspection
+    _instances = weakref.WeakSet()
+
+    def __init__(self, providing_args=None, name=None, prefix='hook%d'):
+        self.providing_args = providing_args or EMPTY_ARGS
+        self.name = name and intern_name(name)
+        self.prefix = prefix
         self._registry = []
+        self._swapped = []
+        self._prefixes = {}
+        self._plans = {}
+        self._instances.add(self)
 
     def __call__(self, *args, **kwargs):
         """
         Call all registered forms
 
-        :param str prefix: Prefix for the forms to avoid clashing of fields,\
-        it must be of the form ``text_%d``. Defaults to ``hook%d``
+        :param prefix: Prefix for the forms to avoid clashing of fields,\
+        either a string of the form ``text_%d`` (the form position)\
+        or a callable receiving the form class, such as\
+        :py:func:`form_prefix`. Defaults to the hook prefix (``hook%d``).\
+        Forms registered with a prefix always use that one
         :param \*args: Positional arguments passed to the forms
         :param \*\*kwargs: Keyword arguments passed to the forms
         :return: Factory to handle all the forms as they were one
         :rtype: :py:class:`HookFactory`
         """
-        prefix = kwargs.pop('prefix', 'hook%d')
+        prefix = kwargs.pop('prefix', self.prefix)
 
-        return HookFactory(
-            instances=[
-                form(prefix=self._prefix(prefix, i), *args, **kwargs)  # todo: update kwargs is cleaner
-                for i, form in enumerate(self._registry)
-            ]
-        )
+        try:
+            plans = self._plans[prefix]
+        except KeyError:
+            plans = self._plan(prefix)
 
-    @staticmethod
-    def _prefix(prefix, i):
-        return prefix % i
+        return HookFactory(plans=plans, args=args, kwargs=kwargs, name=self.name)
+
+    def _plan(self, prefix):
+        """
+        @Api private
+        Compute and cache the (form, prefix) of every form
 
-    def register(self, form):
+        :param prefix: Prefix format or callable
+        :return: Sequence of (form, prefix)
+        :rtype: tuple
+        """
+        plans = tuple(
+            (form,
+             self._prefixes.get(form) or
+             (prefix(form) if callable(prefix) else prefix % i))
+            for i, form in enumerate(self._registry))
+
+        if len(self._plans) >= MAX_PLANS:
+            self._plans.clear()
+
+        self._plans[prefix] = plans
+        return plans
+
+    def warm_up(self):
+        """
+        Precompute the forms prefixes for the default prefix
+        """
+        self._plan(self.prefix)
+
+    def register(self, form, prefix=None):
         """
         Register form
 
         :param callable form: The form, usually\
-        :py:class:`django.forms.Form` or\
-        :py:class:`django.forms.ModelForm`
+        :py:class:`django.forms.Form`,\
+        :py:class:`django.forms.ModelForm` or a formset
+        :param str prefix: Optional prefix for the form,\
+        it won't change when other forms are registered/unregistered
         """
         assert callable(form), \
             "Form must be callable"
 
-        self._registry.append(form)
+        if self.frozen:
+            self._late_registration(self.name or form)
+
+        if form in self._swapped:
+            # Added by a reload, now owned by the code
+            self._swapped.remove(form)
+        else:
+            self._registry.append(form)
+
+        if prefix is not None:
+            self._prefixes[form] = prefix
+
+        self._plans.clear()
 
     def unregister(self, form):
         """
@@ -110,4 +561,31 @@ class Hook(object):
         try:
             self._registry.remove(form)
         except ValueError:
-            pass
+            return
+
+        if form not in self._registry:
+            self._prefixes.pop(form, None)
+
+        self._plans.clear()
+
+    def swap(self, add=EMPTY_ARGS, remove=EMPTY_ARGS):
+        """
+        Register and remove forms at once.\
+        The forms are replaced by a new list,\
+        so factories already created keep the previous ones.\
+        Frozen registries are allowed to change,\
+        this is meant for reloading (see :py:mod:`hooks.reload`)
+
+        :param list add: Forms to register,\
+        the ones already registered are skipped
+        :param list remove: Forms to remove, only the ones\
+        added by a swap (see :py:func:`hooks.utils.swapped`)
+        """
+        registry, self._swapped = swapped(
+            self._registry, self._swapped, add, remove)
+        self._prefixes = {
+            form: prefix
+            for form, prefix in self._prefixes.items()
+            if form in registry}
+        self._registry = registry
+        self._plans = {}
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.db import close_old_connections
+
+from .utils import EMPTY_ARGS, qualname
+
+
+__all__ = ['requires', 'Graph']
+
+# Max number of cached plans, they are keyed by\
+# callbacks so a new plan is built on every registry change
+MAX_PLANS = 256
+
+
+def requires(*names):
+    """
+    Decorator to declare the values a callback\
+    or provider requires (see :py:meth:`Graph.provide`).\
+    Values are passed as keyword arguments::
+
+        @requires('user_profile')
+        def user_menu(context, *args, **kwargs):
+            profile = kwargs['user_profile']
+            # ...
+
+    :param \*names: Names of the required values
+    """
+    def decorator(func):
+        func.requires = names
+        return func
+
+    return decorator
+
+
+def _requires(func):
+    """
+    @Api private
+    """
+    return getattr(func, 'requires', EMPTY_ARGS)
+
+
+def _call_in_pool(func, args, kwargs):
+    """
+    @Api private
+    Call a provider within a pool thread,\
+    closing the unusable or expired database\
+    connections of the thread, same as a request does
+    """
+    close_old_connections()
+
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+class Graph(object):
+    """
+    Providers of named values shared by the callbacks of\
+    a dispatcher. Every provider required by the callbacks\
+    of a hook is called once per dispatch, in dependency order,\
+    and its value is passed to the callbacks requiring it.\
+    When a pool is set, independent providers run concurrently.\
+    Callbacks always run in the calling thread
+
+    :ivar dict providers: Providers by value name
+    :ivar pool: Executor (i.e: :py:class:`concurrent.futures.ThreadPoolExecutor`)\
+    or ``None``
+    """
+    def __init__(self):
+        self.providers = {}
+        self.pool = None
+        self._plans = {}
+
+    def set_pool(self, pool):
+        """
+        Run independent providers concurrently.\
+        Providers run in the pool threads, so they\
+        get their own database connections, closed\
+        as the ``CONN_MAX_AGE`` setting says, and thread\
+        locals (i.e: the active translation). They are not\
+        profiled, traced nor counted by the query counter.\
+        Callbacks run in the calling thread, since they\
+        may share state that is not thread-safe\
+        (i.e: the template context)
+
+        :param pool: Executor with a ``submit`` method\
+        (i.e: :py:class:`concurrent.futures.ThreadPoolExecutor`)\
+        or ``None`` to run everything in the calling thread
+        """
+        assert pool is None or hasattr(pool, 'submit'), \
+            "The pool must have a submit method"
+
+        self.pool = pool
+
+    def provide(self, name, func):
+        """
+        Register the provider of a value.\
+        Providers receive the same arguments\
+        as the callbacks, and may require\
+        other values (see :py:func:`requires`)
+
+        :param str name: The value name
+        :param callable func: The provider
+        """
+        assert callable(func), \
+            "Provider must be a callable"
+
+        self.providers[name] = func
+        self._plans.clear()
+
+    def unprovide(self, name):
+        """
+        Remove the provider of a value
+
+        :param str name: The value name
+        """
+        self.providers.pop(name, None)
+        self._plans.clear()
+
+    def plan(self, callbacks):
+        """
+        Providers to call for the callbacks,\
+        grouped in levels of independent providers.\
+        The plan is built once for the same callbacks
+
+        :param tuple callbacks: The callbacks
+        :return: Sequence of levels, each one\
+        a sequence of (name, provider)
+        :rtype: tuple
+        :raises ValueError: When a value has no provider\
+        or the providers depend on each other (cycle)
+        """
+        try:
+            return self._plans[callbacks]
+        except KeyError:
+            pass
+
+        plan = self._build(callbacks)
+
+        if len(self._plans) >= MAX_PLANS:
+            self._plans.clear()
+
+        self._plans[callbacks] = plan
+        return plan
+
+    def _build(self, callbacks):
+        """
+        @Api private
+        Sort the required providers by depth
+        """
+        depths = {}
+        visiting = set()
+
+        def depth(name, required_by):
+            try:
+                return depths[name]
+            except KeyError:
+                pass
+
+            if name in visiting:
+                raise ValueError(
+                    "Providers of %r depend on each other" % (name, ))
+
+            try:
+                provider = self.providers[name]
+            except KeyError:
+                raise ValueError(
+                    "%s requires %r, which has no provider" % (
+                        qualname(required_by), name))
+
+            visiting.add(name)
+            depths[name] = 1 + max(
+                [depth(dep, provider) for dep in _requires(provider)] or [-1])
+            visiting.discard(name)
+            return depths[name]
+
+        for func in callbacks:
+            for name in _requires(func):
+                depth(name, func)
+
+        levels = [[] for _ in range(max(depths.values() or [-1]) + 1)]
+
+        for name, level in sorted(depths.items()):
+            levels[level].append((name, self.providers[name]))
+
+        return tuple(tuple(level) for level in levels)
+
+    def resolve(self, plan, args, kwargs):
+        """
+        Call the providers of the plan
+
+        :param tuple plan: See :py:meth:`plan`
+        :param tuple args: Positional arguments for the providers
+        :param dict kwargs: Keyword arguments for the providers
+        :return: Values by name
+        :rtype: dict
+        """
+        values = {}
+
+        for level in plan:
+            if self.pool is not None and len(level) > 1:
+                futures = [
+                    (name, self.pool.submit(
+                        _call_in_pool, func, args, self.kwargs(func, kwargs, values)))
+                    for name, func in level]
+
+                for name, future in futures:
+                    values[name] = future.result()
+
+                continue
+
+            for name, func in level:
+                values[name] = func(*args, **self.kwargs(func, kwargs, values))
+
+        return values
+
+    def kwargs(self, func, kwargs, values):
+        """
+        Keyword arguments for a callback or\
+        provider, including the values it requires
+
+        :param callable func: The callback or provider
+        :param dict kwargs: The dispatch keyword arguments
+        :param dict values: The provided values
+        :return: The keyword arguments
+        :rtype: dict
+        """
+        names = _requires(func)
+
+        if not names:
+            return kwargs
+
+        kwargs = dict(kwargs)
+
+        for name in names:
+            kwargs[name] = values[name]
+
+        return kwargs
+
+    def map(self, calls):
+        """
+        Run the calls in the calling thread
+
+        :param list calls: Sequence of (func, args, kwargs)
+        :return: The results, in the same order
+        :rtype: list
+        """
+        return [func(*args, **kwargs) for func, args, kwargs in calls]
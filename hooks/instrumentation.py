@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from .profiling import profiler
+from .queries import query_counter
+from . import tracing
+
+
+def active():
+    """
+    @Api private
+    Whether callbacks must be called through :py:func:`call`
+    """
+    return bool(
+        profiler.rate or
+        tracing.tracer.callbacks or
+        query_counter.enabled)
+
+
+def call(hook_type, hook_name, callback, profile, func, *args, **kwargs):
+    """
+    @Api private
+    Call a callback within a tracing span,\
+    counting its queries and profiling it,\
+    as enabled
+
+    :param str hook_type: template, signal or form
+    :param str hook_name: The hook name
+    :param callback: The callback, used for naming
+    :param bool profile: Profile this call,\
+    see :py:meth:`hooks.profiling.Profiler.sample`
+    :param callable func: The callable to call
+    """
+    if tracing.tracer.callbacks:
+        return tracing.call(
+            hook_type, hook_name, callback,
+            _count, hook_name, callback, profile, func, args, kwargs)
+
+    return _count(hook_name, callback, profile, func, args, kwargs)
+
+
+def _count(hook_name, callback, profile, func, args, kwargs):
+    """
+    @Api private
+    """
+    if query_counter.enabled:
+        with query_counter.count(hook_name, callback):
+            return _profile(hook_name, profile, func, args, kwargs)
+
+    return _profile(hook_name, profile, func, args, kwargs)
+
+
+def _profile(hook_name, profile, func, args, kwargs):
+    """
+    @Api private
+    """
+    if profile:
+        return profiler.runcall(hook_name, func, *args, **kwargs)
+
+    return func(*args, **kwargs)
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import weakref
+
+from django.dispatch.dispatcher import _make_id
+
+from . import formhook
+from . import signalhook
+from . import templatehook
+from . import viewmixin
+from .profiling import profiler, ANONYMOUS
+from .queries import query_counter
+from .utils import qualname
+
+
+__all__ = [
+    'describe_callback',
+    'signal_hooks',
+    'template_hooks',
+    'form_hooks',
+    'view_hooks',
+    'all_hooks'
+]
+
+
+def describe_callback(func, priority, hook_name=None):
+    """
+    Describe a registered callback. The profile\
+    (calls and cumulative seconds) is read from the\
+    stats sampled by :py:data:`hooks.profiling.profiler`,\
+    and the queries from the totals of the current\
+    thread of :py:data:`hooks.queries.query_counter`,\
+    they are ``None`` when nothing was collected
+
+    :param callable func: The callback
+    :param int priority: Position in which the callback is called
+    :param str hook_name: The hook name
+    :return: The callback qualified name, source module,\
+    priority, profile and queries
+    :rtype: dict
+    """
+    return {
+        'name': qualname(func),
+        'module': getattr(func, '__module__', None),
+        'priority': priority,
+        'stats': None,
+        'profile': _describe_profile(func, hook_name),
+        'queries': _describe_queries(func, hook_name)}
+
+
+def _describe_profile(func, hook_name):
+    """
+    @Api private
+    """
+    stats = profiler.stats(hook_name or ANONYMOUS)
+    code = getattr(func, '__code__', None)
+
+    if stats is None or code is None:
+        return None
+
+    try:
+        _cc, nc, _tt, ct, _callers = stats.stats[
+            (code.co_filename, code.co_firstlineno, code.co_name)]
+    except KeyError:
+        return None
+
+    return {
+        'calls': nc,
+        'cumtime': ct}
+
+
+def _describe_queries(func, hook_name):
+    """
+    @Api private
+    """
+    stats = query_counter.totals().get((hook_name or '', qualname(func)))
+
+    if stats is None:
+        return None
+
+    return {
+        'calls': stats.calls,
+        'queries': stats.queries,
+        'elapsed': stats.elapsed}
+
+
+def _describe_stats(stats):
+    return {
+        'calls': stats.calls,
+        'errors': stats.errors,
+        'disabled': stats.disabled,
+        'histogram': list(stats.histogram)}
+
+
+def signal_hooks(hook=signalhook.hook):
+    """
+    Describe the registered signal hooks.\
+    Callbacks stats are collected by\
+    :py:meth:`hooks.signalhook.Hook.send_robust`
+
+    :param hook: Instance of :py:class:`hooks.signalhook.Hook`
+    :return: Sequence of hooks
+    :rtype: list
+    """
+    hooks = []
+
+    for name, signal in sorted(hook._registry.items()):
+        callbacks = []
+
+        for (_, sender_key), receiver in list(signal.receivers):
+            if isinstance(receiver, weakref.ReferenceType):
+                receiver = receiver()
+
+            if receiver is None:
+                continue
+
+            callback = describe_callback(receiver, len(callbacks), name)
+            stats = getattr(signal, 'stats', {}).get(_make_id(receiver))
+
+            if stats is not None:
+                callback['stats'] = _describe_stats(stats)
+
+            callbacks.append(callback)
+
+        hooks.append({
+            'type': 'signal',
+            'name': name,
+            'callbacks': callbacks})
+
+    return hooks
+
+
+def template_hooks(hook=templatehook.hook):
+    """
+    Describe the registered template hooks
+
+    :param hook: Instance of :py:class:`hooks.templatehook.Hook`
+    :return: Sequence of hooks
+    :rtype: list
+    """
+    return [
+        {
+            'type': 'template',
+            'name': name,
+            'callbacks': [
+                describe_callback(func, i, name)
+                for i, func in enumerate(template_hook._registry)]}
+        for name, template_hook in sorted(hook._registry.items())]
+
+
+def form_hooks():
+    """
+    Describe all the created form hooks,\
+    the hook name is ``None`` unless it was given
+
+    :return: Sequence of hooks
+    :rtype: list
+    """
+    return [
+        {
+            'type': 'form',
+            'name': hook.name,
+            'callbacks': [
+                describe_callback(form, i, hook.name)
+                for i, form in enumerate(hook._registry)]}
+        for hook in sorted(
+            formhook.Hook._instances,
+            key=lambda hook: hook.name or '')]
+
+
+def view_hooks():
+    """
+    Describe all the created view hooks\
+    (:py:class:`hooks.viewmixin.Hook`),\
+    their name is always ``None``
+
+    :return: Sequence of hooks
+    :rtype: list
+    """
+    return [
+        {
+            'type': 'view',
+            'name': None,
+            'callbacks': [
+                describe_callback(view_hook, i)
+                for i, view_hook in enumerate(hook._registry)]}
+        for hook in sorted(
+            viewmixin.Hook._instances,
+            key=lambda hook: [qualname(view_hook) for view_hook in hook._registry])]
+
+
+def all_hooks():
+    """
+    Describe every signal, template, form and view hook
+
+    :return: Sequence of hooks
+    :rtype: list
+    """
+    return signal_hooks() + template_hooks() + form_hooks() + view_hooks()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+try:
+    from jinja2 import pass_context
+except ImportError:  # Jinja2 < 3.0
+    from jinja2 import contextfunction as pass_context
+
+from .templatehook import hook as templatehook
+
+
+__all__ = ['HooksExtension', 'hook']
+
+
+@pass_context
+def hook(context, name, *args, **kwargs):
+    """
+    Hook function to call within Jinja2 templates,\
+    this is the same as the ``hook`` template tag::
+
+        {{ hook('within_head', 'foo', bar='bar') }}
+
+    :param context: This is automatically passed,\
+    the Jinja2 template context
+    :param str name: The hook which will be dispatched
+    :param \*args: Positional arguments, will be passed to hook callbacks
+    :param \*\*kwargs: Keyword arguments, will be passed to hook callbacks
+    :return: A concatenation of all callbacks\
+    responses marked as safe (conditionally)
+    :rtype: :py:class:`markupsafe.Markup`
+    """
+    if getattr(context.environment, 'is_async', False):
+        from ._jinja2_async import hook_async
+        return hook_async(context, name, *args, **kwargs)
+
+    return Markup(templatehook.render(name, context, *args, **kwargs))
+
+
+class HooksExtension(Extension):
+    """
+    Jinja2 extension adding the ``hook``\
+    function to the environment globals.\
+    Callbacks receive the Jinja2 context.\
+    In async environments, callbacks may\
+    return awaitables. Usage::
+
+        # settings.py
+
+        TEMPLATES = [
+            {
+                'BACKEND': 'django.template.backends.jinja2.Jinja2',
+                'OPTIONS': {
+                    'extensions': ['hooks.jinja2ext.HooksExtension'],
+                },
+                # ...
+            },
+        ]
+    """
+    def __init__(self, environment):
+        super(HooksExtension, self).__init__(environment)
+        environment.globals['hook'] = hook
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from ... import introspection
+
+
+class Command(BaseCommand):
+    help = (
+        "List the registered hooks and their callbacks. "
+        "The command runs in a new process, so the stats, "
+        "profile and queries of the callbacks are always empty; "
+        "call hooks.introspection.all_hooks() within the "
+        "running server to get them")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=('text', 'json'),
+            default='text',
+            help="Output format")
+        parser.add_argument(
+            '--type',
+            choices=('signal', 'template', 'form', 'view'),
+            default=None,
+            help="Only list hooks of this type")
+
+    def handle(self, *args, **options):
+        hooks = [
+            hook
+            for hook in introspection.all_hooks()
+            if options['type'] in (None, hook['type'])]
+
+        if options['format'] == 'json':
+            self.stdout.write(json.dumps(hooks, indent=2, sort_keys=True))
+            return
+
+        for hook in hooks:
+            self.stdout.write("%s %s" % (hook['type'], hook['name']))
+
+            for callback in hook['callbacks']:
+                line = "  %d. %s" % (callback['priority'], callback['name'])
+                stats = callback['stats']
+
+                if stats is not None:
+                    line += " (calls=%d, errors=%d%s, histogram=%s)" % (
+                        stats['calls'],
+                        stats['errors'],
+                        ", disabled" if stats['disabled'] else "",
+                        stats['histogram'])
+
+                profile = callback['profile']
+
+                if profile is not None:
+                    line += " (profiled calls=%d, cumtime=%.6f)" % (
+                        profile['calls'], profile['cumtime'])
+
+                queries = callback['queries']
+
+                if queries is not None:
+                    line += " (queries=%d in %d calls)" % (
+                        queries['queries'], queries['calls'])
+
+                self.stdout.write(line)
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import logging
+
+try:
+    from django.utils.deprecation import MiddlewareMixin
+except ImportError:  # Django < 1.10
+    MiddlewareMixin = object
+
+from .queries import query_counter
+from .reload import reloader
+from . import rollout
+
+
+__all__ = ['QueryCountMiddleware', 'ReloadMiddleware', 'RolloutMiddleware']
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCountMiddleware(MiddlewareMixin):
+    """
+    Reset the hooks query totals on every request\
+    and log them once the response is ready.\
+    The totals are available as ``request.hook_queries``,\
+    see :py:class:`hooks.queries.QueryCounter`
+    """
+    def process_request(self, request):
+        query_counter.reset()
+        request.hook_queries = query_counter.totals()
+
+    def process_response(self, request, response):
+        totals = getattr(request, 'hook_queries', None)
+
+        for (hook_name, callback), stats in sorted((totals or {}).items()):
+            logger.debug(
+                "Hook %s callback %s ran %d queries in %.3fs (%d calls)",
+                hook_name, callback, stats.queries,
+                stats.elapsed, stats.calls)
+
+        return response
+
+
+class ReloadMiddleware(MiddlewareMixin):
+    """
+    Apply the changes of the ``HOOKS_REGISTRATIONS``\
+    source every ``HOOKS_RELOAD_INTERVAL`` seconds,\
+    see :py:class:`hooks.reload.Reloader`
+    """
+    def process_request(self, request):
+        reloader.poll()
+
+
+class RolloutMiddleware(MiddlewareMixin):
+    """
+    Compute the rollout bucket of the user once\
+    per request, see :py:func:`hooks.rollout.activate`.\
+    The bucket is available as ``request.hook_bucket``.\
+    It must go after the authentication middleware
+    """
+    def process_request(self, request):
+        session = getattr(request, 'session', None)
+        rollout.activate(
+            getattr(request, 'user', None),
+            session_key=getattr(session, 'session_key', None))
+        request.hook_bucket = rollout.bucket()
+
+    def process_response(self, request, response):
+        rollout.deactivate()
+        return response
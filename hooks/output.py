@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import logging
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.utils.html import conditional_escape, strip_spaces_between_tags
+from django.utils.safestring import SafeData, mark_safe
+
+from .utils import qualname
+
+
+__all__ = ['OutputPolicy', 'get_policy', 'TRUNCATE', 'DROP']
+
+logger = logging.getLogger(__name__)
+
+#: Truncate the output over the limit
+TRUNCATE = 'truncate'
+#: Drop the output over the limit
+DROP = 'drop'
+
+_OVERSIZE = (TRUNCATE, DROP)
+
+
+def _truncate(text, size):
+    """
+    @Api private
+    Truncate the text to the size,\
+    without leaving a broken tag or entity at the end.\
+    Tags are not closed
+    """
+    text = text[:size]
+    tag_start = text.rfind('<')
+
+    if tag_start > text.rfind('>'):
+        text = text[:tag_start]
+
+    entity_start = text.rfind('&')
+
+    if entity_start > text.rfind(';'):
+        text = text[:entity_start]
+
+    return text
+
+
+class OutputPolicy(object):
+    """
+    Output pipeline of the ``hook`` tag.\
+    Safe responses are not escaped, oversized ones\
+    are truncated or dropped, logging a warning,\
+    and the whitespace between tags may be removed
+
+    :param int callback_max_size: Max characters of every callback output
+    :param int max_size: Max characters of the whole hook output
+    :param str oversize: What to do with the output\
+    over the limits, :py:data:`TRUNCATE` or :py:data:`DROP`
+    :param bool minify: Remove the whitespace between tags,\
+    same as the ``{% spaceless %}`` tag
+    """
+    def __init__(self, callback_max_size=None, max_size=None, oversize=TRUNCATE, minify=False):
+        assert callback_max_size is None or callback_max_size >= 0, \
+            "callback_max_size must be a positive number or zero"
+        assert max_size is None or max_size >= 0, \
+            "max_size must be a positive number or zero"
+        assert oversize in _OVERSIZE, \
+            "Unknown oversize %r" % (oversize, )
+
+        self.callback_max_size = callback_max_size
+        self.max_size = max_size
+        self.oversize = oversize
+        self.minify = minify
+
+    @property
+    def active(self):
+        """
+        Whether the pipeline changes the output,\
+        otherwise it's the same as\
+        :py:meth:`hooks.templatehook.Hook.render`
+
+        :rtype: bool
+        """
+        return (
+            self.callback_max_size is not None or
+            self.max_size is not None or
+            self.minify)
+
+    def _fit(self, name, func, text, size):
+        """
+        @Api private
+        Truncate or drop (return ``None``) the text over the size
+        """
+        if len(text) <= size:
+            return text
+
+        logger.warning(
+            "Hook %s callback %s output is %d characters long, "
+            "over the %d limit (%s)",
+            name, qualname(func), len(text), size, self.oversize)
+
+        if self.oversize == DROP:
+            return None
+
+        return _truncate(text, size)
+
+    def _responses(self, hook, name, args, kwargs):
+        """
+        @Api private
+        Sequence of (callback, escaped response)
+        """
+        if hook.graph.providers:
+            callbacks, calls = hook._graph_calls(name, args, kwargs)
+            groups = [(callbacks, hook.graph.map(calls))]
+        else:
+            groups = (
+                (templatehook._selected(),
+                 templatehook(*args, **kwargs))
+                for templatehook in hook._lookup(name)
+                if templatehook._registry)
+
+        for funcs, responses in groups:
+            for func, response in zip(funcs, responses):
+                if not isinstance(response, SafeData):
+                    response = conditional_escape(response)
+
+                if self.minify:
+                    response = strip_spaces_between_tags(response.strip())
+
+                yield func, response
+
+    def render(self, hook, name, *args, **kwargs):
+        """
+        Render all callbacks responses for this template hook
+
+        :param hook: The dispatcher,\
+        usually :py:data:`hooks.templatehook.hook`
+        :param str name: Hook name
+        :param \*args: Positional arguments passed to the callbacks
+        :param \*\*kwargs: Keyword arguments passed to the callbacks
+        :return: A concatenation of all callbacks\
+        responses marked as safe (conditionally)
+        :rtype: str
+        """
+        parts = []
+        size = 0
+
+        for func, text in self._responses(hook, name, args, kwargs):
+            if self.callback_max_size is not None:
+                text = self._fit(name, func, text, self.callback_max_size)
+
+                if text is None:
+                    continue
+
+            if self.max_size is not None:
+                separator = 1 if parts else 0
+                available = max(self.max_size - size - separator, 0)
+
+                if len(text) > available:
+                    text = self._fit(name, func, text, available)
+
+                    if text is None:
+                        continue
+
+                    if text:
+                        parts.append(text)
+
+                    break
+
+                size += separator + len(text)
+
+            parts.append(text)
+
+        return mark_safe('\n'.join(parts))
+
+
+_policy = None
+
+
+def get_policy():
+    """
+    The output policy set by the ``HOOKS_CALLBACK_MAX_SIZE``,\
+    ``HOOKS_MAX_SIZE``, ``HOOKS_OVERSIZE`` and ``HOOKS_MINIFY``\
+    settings. The settings are read once
+
+    :rtype: :py:class:`OutputPolicy`
+    """
+    global _policy
+
+    if _policy is None:
+        _policy = OutputPolicy(
+            callback_max_size=getattr(settings, 'HOOKS_CALLBACK_MAX_SIZE', None),
+            max_size=getattr(settings, 'HOOKS_MAX_SIZE', None),
+            oversize=getattr(settings, 'HOOKS_OVERSIZE', TRUNCATE),
+            minify=getattr(settings, 'HOOKS_MINIFY', False))
+
+    return _policy
+
+
+def _reset_policy(setting, **kwargs):
+    """
+    @Api private
+    Read the settings again when they change (tests)
+    """
+    global _policy
+
+    if setting.startswith('HOOKS_'):
+        _policy = None
+
+
+setting_changed.connect(_reset_policy)
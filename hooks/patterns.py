@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+
+__all__ = [
+    'is_pattern',
+    'PatternIndex'
+]
+
+SEPARATOR = '.'
+#: Matches a single name segment
+WILDCARD = '*'
+#: Matches one or more trailing name segments
+DEEP_WILDCARD = '**'
+
+# Max number of cached matches, names may be\
+# built at runtime so the cache must be bounded
+MAX_MATCHES = 1024
+
+
+def is_pattern(name):
+    """
+    Check whether the hook name is a pattern
+
+    :param str name: Hook name
+    :rtype: bool
+    """
+    return WILDCARD in name
+
+
+class _Node(object):
+
+    __slots__ = ('children', 'value', 'order')
+
+    def __init__(self):
+        self.children = {}
+        self.value = None
+        self.order = 0
+
+
+class PatternIndex(object):
+    """
+    Trie of hierarchical hook name patterns,\
+    such as ``orders.*`` or ``orders.**``.\
+    Names are split by dots, ``*`` matches one segment\
+    and ``**`` (last segment only) matches one or more.
+
+    Matches are cached by name, the cache\
+    is cleared every time a pattern is added or removed,\
+    and when it holds ``MAX_MATCHES`` names
+    """
+    def __init__(self):
+        self._root = _Node()
+        self._cache = {}
+        self._count = 0
+        self._order = 0
+
+    def __len__(self):
+        return self._count
+
+    def _validate(self, pattern):
+        segments = pattern.split(SEPARATOR)
+
+        for i, segment in enumerate(segments):
+            assert segment, \
+                "Empty segment in pattern %r" % (pattern, )
+            assert (WILDCARD not in segment or
+                    segment in (WILDCARD, DEEP_WILDCARD)), \
+                "Wildcards must be a whole segment in %r" % (pattern, )
+            assert segment != DEEP_WILDCARD or i == len(segments) - 1, \
+                "** must be the last segment in %r" % (pattern, )
+
+        return segments
+
+    def add(self, pattern, value):
+        """
+        Add or replace a pattern
+
+        :param str pattern: Hook name pattern
+        :param value: Anything but ``None``,\
+        returned when a name matches the pattern
+        """
+        node = self._root
+
+        for segment in self._validate(pattern):
+            node = node.children.setdefault(segment, _Node())
+
+        if node.value is None:
+            self._count += 1
+
+        self._order += 1
+        node.value = value
+        node.order = self._order
+        self._cache.clear()
+
+    def remove(self, pattern):
+        """
+        Remove a pattern, do nothing if it does not exists
+
+        :param str pattern: Hook name pattern
+        """
+        node = self._root
+
+        for segment in pattern.split(SEPARATOR):
+            try:
+                node = node.children[segment]
+            except KeyError:
+                return
+
+        if node.value is not None:
+            self._count -= 1
+
+        node.value = None
+        self._cache.clear()
+
+    def _collect(self, node, segments, i, found):
+        if i == len(segments):
+            if node.value is not None:
+                found.append(node)
+
+            return
+
+        deep = node.children.get(DEEP_WILDCARD)
+
+        if deep is not None and deep.value is not None:
+            found.append(deep)
+
+        for key in (segments[i], WILDCARD):
+            child = node.children.get(key)
+
+            if child is not None:
+                self._collect(child, segments, i + 1, found)
+
+    def match(self, name):
+        """
+        Values of all the patterns matching the name,\
+        in the order they were added
+
+        :param str name: Hook name (not a pattern)
+        :return: Matched values
+        :rtype: tuple
+        """
+        if not self._count:
+            return ()
+
+        try:
+            return self._cache[name]
+        except KeyError:
+            pass
+
+        found = []
+
+        if not is_pattern(name):
+            self._collect(self._root, name.split(SEPARATOR), 0, found)
+
+        values = tuple(
+            node.value
+            for node in sorted(found, key=lambda node: node.order))
+
+        if len(self._cache) >= MAX_MATCHES:
+            self._cache.clear()
+
+        self._cache[name] = values
+        return values
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import os
+import io
+import pstats
+import cProfile
+import itertools
+import threading
+
+
+__all__ = ['profiler', 'Profiler']
+
+# Key of the profiles of hooks with no name
+ANONYMOUS = '<anonymous>'
+
+# Deepest call stack written by Profiler.collapsed
+MAX_DEPTH = 64
+
+# Profiler.disable() call recorded by every profile
+_DISABLE_LABEL = "<method 'disable' of '_lsprof.Profiler' objects>"
+
+
+def _label(func):
+    """
+    @Api private
+    Frame label of a pstats function key
+    """
+    filename, lineno, funcname = func
+
+    if filename == '~':
+        label = funcname
+    else:
+        label = '%s:%s:%d' % (os.path.basename(filename), funcname, lineno)
+
+    return label.replace(';', ',').replace(' ', '_')
+
+
+def _collapse(name, stats, lines):
+    """
+    @Api private
+    Add the collapsed stacks of the stats to the lines.\
+    cProfile records caller/callee pairs, not full stacks,\
+    so the time of a function called from many places is\
+    split among them by its cumulative time on each call site
+    """
+    raw = stats.stats
+    children = {}
+
+    for func, (cc, nc, tt, ct, callers) in raw.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((func, edge))
+
+    def walk(func, path, tt, ct):
+        path = path + (_label(func), )
+        key = ';'.join(path)
+        lines[key] = lines.get(key, 0) + tt
+
+        total = raw[func][3]
+
+        if not total or len(path) > MAX_DEPTH:
+            return
+
+        ratio = ct / total
+
+        for child, edge in children.get(func, ()):
+            if _label(child) in path:  # Recursion
+                continue
+
+            walk(child, path, edge[2] * ratio, edge[3] * ratio)
+
+    for func, (cc, nc, tt, ct, callers) in raw.items():
+        if not callers and func[2] != _DISABLE_LABEL:
+            walk(func, (name, ), tt, ct)
+
+
+class Profiler(object):
+    """
+    Sampled profiler of hook callbacks.\
+    One in ``rate`` dispatches is profiled\
+    with :py:mod:`cProfile`, each callback\
+    separately, and the stats are aggregated\
+    by hook name. Profiling is disabled by default::
+
+        from hooks.profiling import profiler
+
+        profiler.set_rate(100)
+        # ...
+        profiler.dump('/tmp/hooks.folded')
+
+    :param int rate: Profile one in ``rate``\
+    dispatches, ``0`` disables profiling
+    """
+    def __init__(self, rate=0):
+        self.rate = 0
+        self._counter = itertools.count(1)
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        """
+        Change the sampling rate
+
+        :param int rate: Profile one in ``rate``\
+        dispatches, ``0`` disables profiling
+        """
+        assert rate >= 0, \
+            "The rate must be a positive number or zero"
+
+        self.rate = rate
+
+    def sample(self):
+        """
+        Whether the current dispatch\
+        should be profiled or not
+
+        :rtype: bool
+        """
+        rate = self.rate
+        return bool(rate) and next(self._counter) % rate == 0
+
+    def runcall(self, name, func, *args, **kwargs):
+        """
+        Call and profile a callback. Callbacks\
+        dispatching other hooks are profiled as a whole
+
+        :param str name: The hook name
+        :param callable func: The callback
+        :param \*args: Positional arguments passed to the callback
+        :param \*\*kwargs: Keyword arguments passed to the callback
+        :return: The callback response
+        """
+        if getattr(self._local, 'active', False):
+            return func(*args, **kwargs)
+
+        profile = cProfile.Profile()
+        self._local.active = True
+
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            self._local.active = False
+            self._add(name or ANONYMOUS, profile)
+
+    def _add(self, name, profile):
+        """
+        @Api private
+        """
+        with self._lock:
+            try:
+                self._stats[name].add(profile)
+            except KeyError:
+                self._stats[name] = pstats.Stats(profile)
+
+    def names(self):
+        """
+        :return: Names of the profiled hooks
+        :rtype: list
+        """
+        with self._lock:
+            return sorted(self._stats)
+
+    def stats(self, name):
+        """
+        Aggregated stats of a hook
+
+        :param str name: The hook name
+        :return: The stats or ``None``\
+        if the hook was not profiled
+        :rtype: :py:class:`pstats.Stats`
+        """
+        return self._stats.get(name)
+
+    def clear(self):
+        """
+        Remove all the collected stats
+        """
+        with self._lock:
+            self._stats.clear()
+
+    def collapsed(self, name=None):
+        """
+        Collected stats in the collapsed stack format\
+        (``frame;frame;frame microseconds`` per line),\
+        as read by FlameGraph's ``flamegraph.pl``\
+        and speedscope. The root frame is the hook name
+
+        :param str name: Optional hook name,\
+        defaults to all the hooks
+        :return: The collapsed stacks
+        :rtype: str
+        """
+        with self._lock:
+            if name is None:
+                profiles = sorted(self._stats.items())
+            elif name in self._stats:
+                profiles = [(name, self._stats[name])]
+            else:
+                profiles = []
+
+            lines = {}
+
+            for hook_name, stats in profiles:
+                _collapse(hook_name, stats, lines)
+
+        return ''.join(
+            '%s %d\n' % (stack, int(elapsed * 1000000))
+            for stack, elapsed in sorted(lines.items())
+            if elapsed >= 0.000001)
+
+    def dump(self, path, name=None):
+        """
+        Write the collected stats in\
+        the collapsed stack format to a file,\
+        see :py:meth:`.collapsed`
+
+        :param str path: The file path
+        :param str name: Optional hook name,\
+        defaults to all the hooks
+        """
+        with io.open(path, 'w', encoding='utf-8') as fh:
+            fh.write(self.collapsed(name))
+
+
+#: Shared profiler used by all the hooks
+profiler = Profiler()
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import logging
+import threading
+from contextlib import contextmanager
+from timeit import default_timer
+
+from django.db import connections
+
+from .utils import qualname
+
+
+__all__ = ['query_counter', 'QueryCounter', 'QueryStats']
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats(object):
+    """
+    Database queries ran by a callback
+
+    :ivar int calls: Number of times the callback was called
+    :ivar int queries: Number of queries
+    :ivar float elapsed: Seconds spent running the queries
+    """
+    __slots__ = ('calls', 'queries', 'elapsed')
+
+    def __init__(self):
+        self.calls = 0
+        self.queries = 0
+        self.elapsed = 0.0
+
+    def add(self, other):
+        self.calls += other.calls
+        self.queries += other.queries
+        self.elapsed += other.elapsed
+
+    def __repr__(self):
+        return '<QueryStats calls=%d queries=%d elapsed=%.6f>' % (
+            self.calls, self.queries, self.elapsed)
+
+
+def _execute_wrapper(stats):
+    """
+    @Api private
+    Database execute wrapper counting the queries
+    """
+    def wrapper(execute, sql, params, many, context):
+        start = default_timer()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            stats.queries += 1
+            stats.elapsed += default_timer() - start
+
+    return wrapper
+
+
+@contextmanager
+def _count_wrapped(stats, conns):
+    """
+    @Api private
+    Count the queries through execute wrappers
+    """
+    wrapper = _execute_wrapper(stats)
+
+    for conn in conns:
+        conn.execute_wrappers.append(wrapper)
+
+    try:
+        yield
+    finally:
+        for conn in conns:
+            conn.execute_wrappers.remove(wrapper)
+
+
+@contextmanager
+def _count_logged(stats, conns):
+    """
+    @Api private
+    Count the queries through the queries log,\
+    for Django < 2.0 which has no execute wrappers
+    """
+    states = [
+        (conn, conn.force_debug_cursor, len(conn.queries_log))
+        for conn in conns]
+
+    for conn in conns:
+        conn.force_debug_cursor = True
+
+    try:
+        yield
+    finally:
+        for conn, force_debug_cursor, start in states:
+            conn.force_debug_cursor = force_debug_cursor
+            queries = list(conn.queries_log)[start:]
+            stats.queries += len(queries)
+            stats.elapsed += sum(float(q['time']) for q in queries)
+
+
+def _count_queries(stats):
+    """
+    @Api private
+    Count the queries ran on every database\
+    connection of the current thread
+    """
+    conns = connections.all()
+
+    if all(hasattr(conn, 'execute_wrappers') for conn in conns):
+        return _count_wrapped(stats, conns)
+
+    return _count_logged(stats, conns)
+
+
+class QueryCounter(object):
+    """
+    Count the database queries ran by every\
+    callback, per thread (usually a request).\
+    A warning is logged when a callback runs more\
+    queries than the budget. Counting is disabled by default::
+
+        from hooks.queries import query_counter
+
+        query_counter.enable(budget=5)
+
+    See :py:class:`hooks.middleware.QueryCountMiddleware`\
+    to get the totals of every request
+
+    :ivar bool enabled: Whether queries are counted
+    :ivar int budget: Max queries per callback call or ``None``
+    """
+    def __init__(self):
+        self.enabled = False
+        self.budget = None
+        self._local = threading.local()
+
+    def enable(self, budget=None):
+        """
+        Start counting queries
+
+        :param int budget: Max number of queries\
+        a callback can run without getting a warning
+        """
+        assert budget is None or budget >= 0, \
+            "The budget must be a positive number or zero"
+
+        self.budget = budget
+        self.enabled = True
+
+    def disable(self):
+        """
+        Stop counting queries
+        """
+        self.enabled = False
+
+    def totals(self):
+        """
+        Queries ran since the last :py:meth:`.reset`\
+        within the current thread
+
+        :return: :py:class:`QueryStats` by (hook name, callback name)
+        :rtype: dict
+        """
+        try:
+            return self._local.totals
+        except AttributeError:
+            self._local.totals = {}
+            return self._local.totals
+
+    def reset(self):
+        """
+        Clear the totals of the current thread
+        """
+        self._local.totals = {}
+
+    @contextmanager
+    def count(self, hook_name, callback):
+        """
+        Count the queries ran within the block
+
+        :param str hook_name: The hook name
+        :param callback: The callback, used for naming
+        """
+        stats = QueryStats()
+        stats.calls = 1
+
+        try:
+            with _count_queries(stats):
+                yield stats
+        finally:
+            key = (hook_name or '', qualname(callback))
+            totals = self.totals()
+
+            try:
+                totals[key].add(stats)
+            except KeyError:
+                totals[key] = stats
+
+            if self.budget is not None and stats.queries > self.budget:
+                logger.warning(
+                    "Hook %s callback %s ran %d queries, the budget is %d",
+                    key[0], key[1], stats.queries, self.budget)
+
+
+#: Shared query counter used by all the hooks
+query_counter = QueryCounter()
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import logging
+import threading
+from collections import OrderedDict
+from timeit import default_timer
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+from . import signalhook
+from . import templatehook
+
+try:
+    string_types = basestring
+except NameError:  # Python 3
+    string_types = str
+
+
+__all__ = ['reloader', 'Reloader', 'TEMPLATE', 'SIGNAL', 'FORM']
+
+logger = logging.getLogger(__name__)
+
+#: Template hook callback registration
+TEMPLATE = 'template'
+#: Signal hook receiver registration
+SIGNAL = 'signal'
+#: Form hook form registration
+FORM = 'form'
+
+_KINDS = (TEMPLATE, SIGNAL, FORM)
+
+
+def _load(source):
+    """
+    @Api private
+    Registrations of the source, without duplicates
+    """
+    if isinstance(source, string_types):
+        source = import_string(source)
+
+    if callable(source):
+        source = source()
+
+    registrations = OrderedDict()
+
+    for registration in source or ():
+        registration = tuple(registration)
+        assert len(registration) == 3, \
+            "Registrations must be (kind, hook, callback), " \
+            "got %r" % (registration, )
+        assert registration[0] in _KINDS, \
+            "Unknown registration kind %r" % (registration[0], )
+        registrations[registration] = None
+
+    return list(registrations)
+
+
+class Reloader(object):
+    """
+    Apply registrations declared by a source\
+    (usually the ``HOOKS_REGISTRATIONS`` setting),\
+    so plugins can be enabled and disabled\
+    without restarting the process.
+
+    A registration is a tuple of (kind, hook, callback):
+
+    * ``(TEMPLATE, 'hook name', 'dotted.path.to.callback')``
+    * ``(SIGNAL, 'hook name', 'dotted.path.to.receiver')``
+    * ``(FORM, 'dotted.path.to.form_hook', 'dotted.path.to.Form')``
+
+    On reload, only the registrations added or removed\
+    since the last reload are applied, every affected\
+    registry is swapped at once (see :py:meth:`hooks.templatehook.Hook.swap`),\
+    so dispatches in progress are not disturbed and the registries\
+    that did not change keep their warm caches.\
+    Registrations done in code are left alone
+
+    :param source: List of registrations, a callable returning\
+    them (i.e: reading a database table) or the dotted path to either.\
+    ``None`` reads the ``HOOKS_REGISTRATIONS`` setting
+    :param float interval: Min seconds between reloads\
+    done by :py:meth:`poll`. ``None`` reads the\
+    ``HOOKS_RELOAD_INTERVAL`` setting (``None`` by default,\
+    meaning :py:meth:`poll` reloads once)
+    """
+    def __init__(self, source=None, interval=None):
+        self.source = source
+        self.interval = interval
+        self._applied = OrderedDict()
+        self._lock = threading.Lock()
+        self._last = None
+
+    def _source(self):
+        """
+        @Api private
+        """
+        if self.source is not None:
+            return self.source
+
+        return getattr(settings, 'HOOKS_REGISTRATIONS', None)
+
+    def _interval(self):
+        """
+        @Api private
+        """
+        if self.interval is not None:
+            return self.interval
+
+        return getattr(settings, 'HOOKS_RELOAD_INTERVAL', None)
+
+    @property
+    def registrations(self):
+        """
+        The applied registrations
+
+        :rtype: list
+        """
+        return list(self._applied)
+
+    def reload(self):
+        """
+        Read the source and apply the changes
+
+        :return: Whether anything changed
+        :rtype: bool
+        """
+        with self._lock:
+            self._last = default_timer()
+            registrations = _load(self._source())
+            current = set(registrations)
+            added = [r for r in registrations if r not in self._applied]
+            removed = [r for r in self._applied if r not in current]
+
+            if not added and not removed:
+                return False
+
+            changes = OrderedDict()
+
+            for registration in removed:
+                kind, target, _path = registration
+                changes.setdefault((kind, target), ([], []))[1].append(
+                    self._applied[registration])
+
+            resolved = {
+                registration: import_string(registration[2])
+                for registration in added}
+
+            for registration in added:
+                kind, target, _path = registration
+                changes.setdefault((kind, target), ([], []))[0].append(
+                    resolved[registration])
+
+            for (kind, target), (add, remove) in changes.items():
+                _swap(kind, target, add, remove)
+
+            for registration in removed:
+                del self._applied[registration]
+
+            self._applied.update(
+                (registration, resolved[registration])
+                for registration in added)
+
+        logger.info(
+            "Hook registrations reloaded, %d added and %d removed",
+            len(added), len(removed))
+        return True
+
+    def poll(self):
+        """
+        Reload when the interval has elapsed since\
+        the last reload, errors are logged.\
+        This is called on every request by\
+        :py:class:`hooks.middleware.ReloadMiddleware`
+
+        :return: Whether anything changed
+        :rtype: bool
+        """
+        interval = self._interval()
+
+        if self._last is not None and (
+                interval is None or
+                default_timer() - self._last < interval):
+            return False
+
+        try:
+            return self.reload()
+        except Exception:
+            logger.exception("Hook registrations could not be reloaded")
+            return False
+
+    def clear(self):
+        """
+        Remove all the applied registrations
+        """
+        with self._lock:
+            changes = OrderedDict()
+
+            for (kind, target, _path), obj in self._applied.items():
+                changes.setdefault((kind, target), []).append(obj)
+
+            for (kind, target), remove in changes.items():
+                _swap(kind, target, (), remove)
+
+            self._applied.clear()
+            self._last = None
+
+
+def _swap(kind, target, add, remove):
+    """
+    @Api private
+    Apply the changes to the registry
+    """
+    if kind == TEMPLATE:
+        templatehook.hook.swap(target, add=add, remove=remove)
+    elif kind == SIGNAL:
+        signalhook.hook.swap(target, add=add, remove=remove)
+    else:
+        import_string(target).swap(add=add, remove=remove)
+
+
+#: Reloader of the ``HOOKS_REGISTRATIONS`` setting
+reloader = Reloader()
+
+
+def _reload_settings(setting, **kwargs):
+    """
+    @Api private
+    Apply the registrations when the setting changes (tests)
+    """
+    if setting == 'HOOKS_REGISTRATIONS' and reloader.source is None:
+        reloader.reload()
+
+
+setting_changed.connect(_reload_settings)
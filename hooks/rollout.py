@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import threading
+import zlib
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.utils.encoding import force_bytes
+
+
+__all__ = [
+    'rollout',
+    'Rule',
+    'activate',
+    'deactivate',
+    'bucket',
+    'allowed',
+    'select',
+    'has_rules'
+]
+
+# Buckets per percent point, so rollouts\
+# may be as small as 0.01%
+RESOLUTION = 100
+
+_local = threading.local()
+_flags = None
+
+
+def _hash(value):
+    """
+    @Api private
+    Stable hash of the value, within [0, 100)
+    """
+    crc = zlib.crc32(force_bytes(value)) & 0xffffffff
+    return (crc % (100 * RESOLUTION)) / float(RESOLUTION)
+
+
+def _enabled_flags():
+    """
+    @Api private
+    The ``HOOKS_FLAGS`` setting, read once
+    """
+    global _flags
+
+    if _flags is None:
+        _flags = frozenset(getattr(settings, 'HOOKS_FLAGS', ()))
+
+    return _flags
+
+
+def _reset_flags(setting, **kwargs):
+    """
+    @Api private
+    Read the setting again when it changes (tests)
+    """
+    global _flags
+
+    if setting == 'HOOKS_FLAGS':
+        _flags = None
+
+
+setting_changed.connect(_reset_flags)
+
+
+class Rule(object):
+    """
+    Rollout rule of a callback, see :py:func:`rollout`
+
+    :param float percent: Percent of users (buckets)\
+    for which the callback is called
+    :param list groups: Names of the user groups\
+    for which the callback is called
+    :param str flag: Name of the flag that must be\
+    enabled in the ``HOOKS_FLAGS`` setting
+    :param str salt: Shifts the buckets of this rule,\
+    so rules with the same percent don't pick the same\
+    users. Rules with no salt pick the same users
+    """
+    __slots__ = ('percent', 'groups', 'flag', 'offset')
+
+    def __init__(self, percent=None, groups=None, flag=None, salt=None):
+        assert percent is None or 0 <= percent <= 100, \
+            "percent must be within 0 and 100"
+
+        self.percent = percent
+        self.groups = frozenset(groups or ())
+        self.flag = flag
+        self.offset = _hash(salt) if salt else 0
+
+    def allows(self):
+        """
+        Whether the callback is called for the current user\
+        (see :py:func:`activate`). The flag must be enabled,\
+        and then the user must be within the percent or the groups
+
+        :rtype: bool
+        """
+        if self.flag is not None and self.flag not in _enabled_flags():
+            return False
+
+        if self.percent is None and not self.groups:
+            return True
+
+        if self.percent is not None:
+            current = bucket()
+
+            if current is not None and (
+                    (current + self.offset) % 100 < self.percent):
+                return True
+
+        return bool(self.groups) and not self.groups.isdisjoint(_user_groups())
+
+
+def rollout(percent=None, groups=None, flag=None, salt=None):
+    """
+    Decorator to call the callback for\
+    some of the users only (see :py:class:`Rule`)::
+
+        @rollout(percent=10, groups=['beta'])
+        def new_menu(context, *args, **kwargs):
+            # ...
+
+    The user bucket is computed once per request by\
+    :py:class:`hooks.middleware.RolloutMiddleware`.\
+    Outside of a request (i.e: tasks) percent\
+    and group rules don't match, see :py:func:`activate`
+
+    :param float percent: Percent of users
+    :param list groups: Names of user groups
+    :param str flag: Name of a flag of the ``HOOKS_FLAGS`` setting
+    :param str salt: Shifts the buckets of the rule
+    """
+    rule = Rule(percent=percent, groups=groups, flag=flag, salt=salt)
+
+    def decorator(func):
+        func.rollout = rule
+        return func
+
+    return decorator
+
+
+def _is_authenticated(user):
+    """
+    @Api private
+    """
+    if user is None:
+        return False
+
+    is_authenticated = user.is_authenticated
+
+    if callable(is_authenticated):  # Django < 1.10
+        is_authenticated = is_authenticated()
+
+    return bool(is_authenticated)
+
+
+def activate(user, session_key=None):
+    """
+    Compute the bucket of the user for the current thread,\
+    from its primary key, or from the session key\
+    when the user is anonymous. This is done once per\
+    request by :py:class:`hooks.middleware.RolloutMiddleware`
+
+    :param user: The user or ``None``
+    :param str session_key: The session key or ``None``
+    """
+    _local.groups = None
+
+    if _is_authenticated(user):
+        _local.user = user
+        _local.bucket = _hash('user:%s' % user.pk)
+    elif session_key:
+        _local.user = None
+        _local.bucket = _hash('session:%s' % session_key)
+    else:
+        _local.user = None
+        _local.bucket = None
+
+
+def deactivate():
+    """
+    Forget the user of the current thread
+    """
+    _local.user = None
+    _local.groups = None
+    _local.bucket = None
+
+
+def bucket():
+    """
+    The bucket of the current user
+
+    :return: A number within [0, 100) or ``None``
+    :rtype: float
+    """
+    return getattr(_local, 'bucket', None)
+
+
+def _user_groups():
+    """
+    @Api private
+    Group names of the current user,\
+    queried once per request
+    """
+    groups = getattr(_local, 'groups', None)
+
+    if groups is not None:
+        return groups
+
+    user = getattr(_local, 'user', None)
+
+    if user is None:
+        groups = frozenset()
+    else:
+        groups = frozenset(user.groups.values_list('name', flat=True))
+
+    _local.groups = groups
+    return groups
+
+
+def allowed(func):
+    """
+    Whether the callback is called for the current user
+
+    :param callable func: The callback
+    :rtype: bool
+    """
+    rule = getattr(func, 'rollout', None)
+    return rule is None or rule.allows()
+
+
+def select(callbacks):
+    """
+    The callbacks called for the current user
+
+    :param list callbacks: The callbacks
+    :return: The allowed callbacks
+    :rtype: list
+    """
+    return [func for func in callbacks if allowed(func)]
+
+
+def has_rules(callbacks):
+    """
+    Whether any of the callbacks has a rollout rule.\
+    Hooks track this on every registration, and\
+    select the callbacks of the gated ones only
+
+    :param list callbacks: The callbacks
+    :rtype: bool
+    """
+    return any(
+        getattr(func, 'rollout', None) is not None
+        for func in callbacks)
@@ -2,13 +2,396 @@
 
 from __future__ import unicode_literals
 
+import inspect
+import weakref
+import logging
+from timeit import default_timer
+
 from django.dispatch import Signal
+from django.dispatch.dispatcher import _make_id, NONE_ID
+
+from .graph import Graph
+from .patterns import is_pattern, PatternIndex
+from .profiling import profiler
+from . import instrumentation
+from . import rollout
+from . import strategies
+from . import tracing
+from .utils import EMPTY_ARGS, intern_name, qualname, frozen_mapping, FreezeMixin
+
+
+__all__ = [
+    'hook',
+    'HookSignal',
+    'ReceiverStats',
+    'LOG',
+    'FAIL_FAST',
+    'DISABLE'
+]
+
+logger = logging.getLogger(__name__)
+
+#: Log the receiver error and keep dispatching
+LOG = 'log'
+#: Propagate the first receiver error, same as ``send``
+FAIL_FAST = 'fail_fast'
+#: Log the receiver error and stop calling\
+#: the receiver after ``max_failures`` errors
+DISABLE = 'disable'
+
+_POLICIES = (LOG, FAIL_FAST, DISABLE)
+
+# Response of the receivers skipped by send_robust
+_DISABLED = object()
+
+#: Upper bounds (in seconds) of the latency histogram\
+#: buckets, the last bucket collects everything above
+LATENCY_BUCKETS = (0.001, 0.01, 0.1, 1.0)
+
+
+class ReceiverStats(object):
+    """
+    Error counter and latency histogram of a receiver.\
+    Collected by :py:meth:`HookSignal.send_robust`
+
+    :param str name: The receiver qualified name
+    """
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.disabled = False
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(self, elapsed, failed=False):
+        """
+        Record a receiver call
+
+        :param float elapsed: Call duration in seconds
+        :param bool failed: Whether the receiver raised an error
+        """
+        self.calls += 1
+
+        if failed:
+            self.errors += 1
+
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if elapsed <= bound:
+                self.histogram[i] += 1
+                return
+
+        self.histogram[-1] += 1
+
+
+class HookSignal(Signal):
+    """
+    Django signal with per-receiver error isolation.\
+    This is what :py:class:`Hook` creates under the hood.
+
+    When all receivers are strong references (``weak=False``),\
+    the receivers of each class sender (or ``None``) are resolved\
+    once and kept in a tuple, so sending skips dereferencing weakrefs\
+    and sweeping dead receivers. The cache is cleared on connect/disconnect
+
+    :param list providing_args: A list of the arguments\
+    this signal can pass along in a send() call
+    :param str policy: What to do when a receiver fails\
+    within :py:meth:`send_robust`. One of\
+    :py:data:`LOG`, :py:data:`FAIL_FAST` or :py:data:`DISABLE`
+    :param int max_failures: Number of errors after which\
+    a receiver gets disabled, required by :py:data:`DISABLE`
+    :param str name: The hook name, set by :py:class:`Hook`
+    :ivar bool gated: Whether any receiver has a rollout rule\
+    (see :py:func:`hooks.rollout.rollout`)
+    """
+    def __init__(self, providing_args=None, policy=LOG, max_failures=None, name=None):
+        super(HookSignal, self).__init__(providing_args=providing_args)
+        self.name = name
+        self.gated = False
+        self.policy = None
+        self.max_failures = None
+        self.stats = {}
+        self._dispatch_cache = {}
+        self._swapped = set()
+        self.set_policy(policy, max_failures)
+
+    def set_policy(self, policy, max_failures=None):
+        """
+        Change the error policy
+
+        :param str policy: One of :py:data:`LOG`,\
+        :py:data:`FAIL_FAST` or :py:data:`DISABLE`
+        :param int max_failures: Number of errors after which\
+        a receiver gets disabled, required by :py:data:`DISABLE`
+        """
+        assert policy in _POLICIES, \
+            "Unknown policy %r" % (policy, )
+        assert policy != DISABLE or (max_failures or 0) > 0, \
+            "The disable policy requires max_failures"
+
+        self.policy = policy
+        self.max_failures = max_failures
+
+    def connect(self, receiver, sender=None, *args, **kwargs):
+        super(HookSignal, self).connect(receiver, sender, *args, **kwargs)
+        self._dispatch_cache.clear()
+        # Connected in code as well, swap must not disconnect it
+        self._swapped.discard((_make_id(receiver), _make_id(sender)))
+        self.gated = self.gated or rollout.has_rules((receiver, ))
+
+    def disconnect(self, receiver=None, *args, **kwargs):
+        if receiver is not None:
+            self.stats.pop(_make_id(receiver), None)
+
+        try:
+            return super(HookSignal, self).disconnect(receiver, *args, **kwargs)
+        finally:
+            self._dispatch_cache.clear()
+            self._update_gated()
+
+    def _update_gated(self):
+        """
+        @Api private
+        Check the rollout rules of the receivers again
+        """
+        receivers = []
+
+        for _lookup_key, receiver in self.receivers:
+            if isinstance(receiver, weakref.ReferenceType):
+                receiver = receiver()
+
+            receivers.append(receiver)
+
+        self.gated = rollout.has_rules(receivers)
+
+    def _strong_receivers(self, sender):
+        """
+        @Api private
+        Resolve and cache the receivers for the sender.\
+        Return ``None`` if there are weak receivers
+        """
+        sender_key = _make_id(sender)
+
+        with self.lock:
+            self._clear_dead_receivers()
+
+            if any(isinstance(r[1], weakref.ReferenceType)
+                   for r in self.receivers):
+                receivers = None
+            else:
+                receivers = tuple(
+                    r[1]
+                    for r in self.receivers
+                    if r[0][1] == NONE_ID or r[0][1] == sender_key)
+
+            self._dispatch_cache[sender_key] = receivers
+
+        return receivers
+
+    def _receivers(self, sender):
+        """
+        @Api private
+        Live receivers for the sender,\
+        gated by their rollout rules
+        """
+        if sender is None or inspect.isclass(sender):
+            try:
+                receivers = self._dispatch_cache[_make_id(sender)]
+            except KeyError:
+                receivers = self._strong_receivers(sender)
+        else:
+            # Instance senders are not cached, they may be\
+            # short lived and their ids reused once collected
+            receivers = None
+
+        if receivers is None:
+            receivers = self._live_receivers(sender)
+
+        if self.gated:
+            return rollout.select(receivers)
+
+        return receivers
+
+    def send(self, sender, **named):
+        """
+        Send signal from sender to all connected receivers.\
+        If any receiver raises an error, the error propagates\
+        back through send, terminating the dispatch loop
+
+        :param class sender: The sender of the signal
+        :return: Signal responses as a sequence of tuples (func, response)
+        :rtype: list
+        """
+        if not self.receivers:
+            return []
+
+        if instrumentation.active():
+            profile = profiler.sample()
+            return [
+                (receiver, instrumentation.call(
+                    'signal', self.name, receiver, profile, receiver,
+                    signal=self, sender=sender, **named))
+                for receiver in self._receivers(sender)
+            ]
+
+        return [
+            (receiver, receiver(signal=self, sender=sender, **named))
+            for receiver in self._receivers(sender)
+        ]
+
+    def iter_send(self, sender, **named):
+        """
+        Same as :py:meth:`send` but lazy,\
+        receivers are called as the responses\
+        are consumed
 
+        :param class sender: The sender of the signal
+        :return: Iterator of responses
+        """
+        if not self.receivers:
+            return
+
+        if instrumentation.active():
+            profile = profiler.sample()
+
+            for receiver in self._receivers(sender):
+                yield instrumentation.call(
+                    'signal', self.name, receiver, profile, receiver,
+                    signal=self, sender=sender, **named)
+
+            return
+
+        for receiver in self._receivers(sender):
+            yield receiver(signal=self, sender=sender, **named)
+
+    def swap(self, add=EMPTY_ARGS, remove=EMPTY_ARGS):
+        """
+        Connect and disconnect receivers at once.\
+        The receivers are replaced by a new list, so\
+        sends in progress keep calling the previous ones.\
+        Receivers are connected for any sender\
+        and strongly referenced (``weak=False``).\
+        Only the receivers connected by a swap are\
+        disconnected, the ones connected by :py:meth:`connect`\
+        are left alone
+
+        :param list add: Receivers to connect
+        :param list remove: Receivers to disconnect
+        """
+        remove_keys = set(
+            (_make_id(receiver), NONE_ID)
+            for receiver in remove) & self._swapped
+
+        with self.lock:
+            self._clear_dead_receivers()
+            receivers = [
+                r for r in self.receivers
+                if r[0] not in remove_keys]
+            keys = set(r[0] for r in receivers)
+            self._swapped -= remove_keys
+
+            for receiver in add:
+                lookup_key = (_make_id(receiver), NONE_ID)
+
+                if lookup_key not in keys:
+                    keys.add(lookup_key)
+                    receivers.append((lookup_key, receiver))
+                    self._swapped.add(lookup_key)
+
+            self.receivers = receivers
+            self.sender_receivers_cache.clear()
+            self._dispatch_cache.clear()
+
+        self._update_gated()
+
+        for receiver_key, _sender_key in remove_keys:
+            self.stats.pop(receiver_key, None)
+
+    def _receiver_stats(self, receiver):
+        key = _make_id(receiver)
+
+        try:
+            return self.stats[key]
+        except KeyError:
+            stats = ReceiverStats(qualname(receiver))
+            self.stats[key] = stats
+            return stats
+
+    def send_robust(self, sender, **named):
+        """
+        Send signal from sender to all connected receivers,\
+        a failing receiver does not stop the dispatch\
+        unless the policy is :py:data:`FAIL_FAST`.\
+        Disabled receivers are skipped
+
+        :param class sender: The sender of the signal
+        :return: Signal responses as a sequence of tuples\
+        (func, response), the response is the exception\
+        instance for failed receivers
+        :rtype: list
+        """
+        if not self.receivers:
+            return []
+
+        named = dict(named, signal=self, sender=sender)
+
+        if instrumentation.active():
+            profile = profiler.sample()
+            responses = [
+                (receiver, self._robust_call(
+                    receiver, instrumentation.call,
+                    ('signal', self.name, receiver, profile, receiver), named))
+                for receiver in self._receivers(sender)]
+        else:
+            responses = [
+                (receiver, self._robust_call(receiver, receiver, EMPTY_ARGS, named))
+                for receiver in self._receivers(sender)]
+
+        return [
+            (receiver, response)
+            for receiver, response in responses
+            if response is not _DISABLED]
+
+    def _robust_call(self, receiver, func, args, kwargs):
+        """
+        @Api private
+        Call the receiver (through func) isolating\
+        its error as the policy says, the error\
+        is returned. Return ``_DISABLED`` for\
+        disabled receivers
+        """
+        stats = self._receiver_stats(receiver)
 
-__all__ = ['hook', ]
+        if stats.disabled:
+            return _DISABLED
 
+        start = default_timer()
 
-class Hook(object):
+        try:
+            response = func(*args, **kwargs)
+        except Exception as err:
+            stats.record(default_timer() - start, failed=True)
+
+            if self.policy == FAIL_FAST:
+                raise
+
+            logger.exception(
+                "Signal receiver %s failed", stats.name)
+
+            if (self.policy == DISABLE and
+                    stats.errors >= self.max_failures):
+                stats.disabled = True
+                logger.warning(
+                    "Signal receiver %s disabled after %d failures",
+                    stats.name, stats.errors)
+
+            return err
+
+        stats.record(default_timer() - start)
+        return response
+
+
+class Hook(FreezeMixin):
     """
     A dynamic-signal dispatcher.\
     Should be used through :py:data:`hook`
@@ -18,40 +401,168 @@ class Hook(object):
     In the meanwhile, you should register/connect/disconnect\
     at import time (global scope) to ensure thread-safety,\
     doing it in the AppConfig.ready() method is safe
+
+    Hook names may be patterns such as ``orders.*``\
+    (one segment) or ``orders.**`` (one or more segments),\
+    receivers connected to a pattern get the sends of every\
+    matching hook name (see :py:class:`hooks.patterns.PatternIndex`)
+
+    Receivers may require values computed once per send\
+    by shared providers (see :py:meth:`provide`)
+
+    :ivar graph: The providers, instance of :py:class:`hooks.graph.Graph`
     """
     def __init__(self):
         self._registry = {}
+        self._patterns = PatternIndex()
+        self._transport = None
+        self.graph = Graph()
 
-    def register(self, name):
+    def register(self, name, policy=LOG, max_failures=None):
         """
         Register a new hook. Not required (see :py:func:`.connect` method)
 
         :param str name: The hook name
+        :param str policy: Error policy used by\
+        :py:func:`.send_robust` (see :py:class:`HookSignal`)
+        :param int max_failures: Errors before a receiver\
+        gets disabled, used by the :py:data:`DISABLE` policy
         :return: Django signal
-        :rtype: :py:class:`django.dispatch.Signal`
+        :rtype: :py:class:`HookSignal`
         """
-        signal = Signal(providing_args=['args', 'kwargs'])
+        if self.frozen:
+            self._late_registration(name)
+
+        name = intern_name(name)
+        signal = HookSignal(
+            providing_args=['args', 'kwargs'],
+            policy=policy,
+            max_failures=max_failures,
+            name=name)
         self._registry[name] = signal
+
+        if is_pattern(name):
+            self._patterns.add(name, signal)
+
         return signal
 
-    def connect(self, name, func, sender=None, dispatch_uid=None):
+    def set_policy(self, name, policy, max_failures=None):
         """
-        Connects a function to a hook.\
+        Change the error policy of a hook.\
         Creates the hook (name) if it does not exists
 
+        :param str name: The hook name
+        :param str policy: One of :py:data:`LOG`,\
+        :py:data:`FAIL_FAST` or :py:data:`DISABLE`
+        :param int max_failures: Errors before a receiver\
+        gets disabled, required by :py:data:`DISABLE`
+        """
+        try:
+            signal = self._registry[name]
+        except KeyError:
+            self.register(name, policy=policy, max_failures=max_failures)
+            return
+
+        signal.set_policy(policy, max_failures)
+
+    def connect(self, name, func, sender=None, dispatch_uid=None, weak=True):
+        """
+        Connects a function to a hook.\
+        Creates the hook (name) if it does not exists.\
+        Use ``weak=False`` to connect lambdas and closures,\
+        or for hot hooks, since sending to strong receivers\
+        is cheaper (see :py:class:`HookSignal`)
+
         :param str name: The hook name
         :param callable func: A function reference used as a callback
         :param class sender: Optional sender __class__ to which the\
         func should respond. Default will match all
         :param str dispatch_uid: Optional unique id,\
         see :py:class:`django.dispatch.Signal` for more info
+        :param bool weak: Whether to keep a weak reference to the func,\
+        weakly referenced funcs are disconnected when garbage collected
         """
+        if self.frozen:
+            self._late_registration(name)
+
         try:
             signal = self._registry[name]
         except KeyError:
             signal = self.register(name)
 
-        signal.connect(func, sender=sender, dispatch_uid=dispatch_uid)
+        signal.connect(
+            func, sender=sender, weak=weak, dispatch_uid=dispatch_uid)
+
+    def provide(self, name, func):
+        """
+        Register the provider of a value.\
+        Receivers requiring the value (see\
+        :py:func:`hooks.graph.requires`) get it as\
+        a keyword argument. The provider is called once\
+        per :py:meth:`send` with the ``sender`` and\
+        the keyword arguments of the send::
+
+            def order_total(sender, order, **kwargs):
+                return order.lines.aggregate(total=Sum('price'))['total']
+
+            hook.provide('order_total', order_total)
+
+            @requires('order_total')
+            def notify(sender, order, order_total, **kwargs):
+                # ...
+
+        :param str name: The value name
+        :param callable func: The provider
+        """
+        if self.frozen:
+            self._late_registration(name)
+
+        self.graph.provide(name, func)
+
+    def unprovide(self, name):
+        """
+        Remove the provider of a value
+
+        :param str name: The value name
+        """
+        self.graph.unprovide(name)
+
+    def set_pool(self, pool):
+        """
+        Run independent providers concurrently\
+        (see :py:meth:`hooks.graph.Graph.set_pool`)
+
+        :param pool: Executor such as\
+        :py:class:`concurrent.futures.ThreadPoolExecutor`\
+        or ``None``
+        """
+        self.graph.set_pool(pool)
+
+    def warm_up(self):
+        """
+        Precompute the receivers tuple (for no sender)\
+        and pattern matches of every registered hook,\
+        and the providers plan when there are providers
+        """
+        for name, signal in list(self._registry.items()):
+            signal._strong_receivers(None)
+            self._patterns.match(name)
+
+            if self.graph.providers:
+                self.graph.plan(tuple(
+                    receiver for _signal, receiver in self._receivers(name, None)))
+
+    def _compact(self):
+        """
+        @Api private
+        """
+        self._registry = frozen_mapping(self._registry)
+
+    def _thaw(self):
+        """
+        @Api private
+        """
+        self._registry = dict(self._registry)
 
     def disconnect(self, name, func, dispatch_uid=None):
         """
@@ -69,6 +580,33 @@ class Hook(object):
 
         signal.disconnect(func, dispatch_uid=dispatch_uid)
 
+    def swap(self, name, add=EMPTY_ARGS, remove=EMPTY_ARGS):
+        """
+        Connect and disconnect receivers at once\
+        (see :py:meth:`HookSignal.swap`).\
+        Creates the hook (name) if it does not exists.\
+        Frozen registries are allowed to change,\
+        this is meant for reloading (see :py:mod:`hooks.reload`)
+
+        :param str name: The hook name
+        :param list add: Receivers to connect
+        :param list remove: Receivers to disconnect
+        """
+        try:
+            signal = self._registry[name]
+        except KeyError:
+            name = intern_name(name)
+            signal = HookSignal(providing_args=['args', 'kwargs'], name=name)
+            registry = dict(self._registry)
+            registry[name] = signal
+            self._registry = (
+                frozen_mapping(registry) if self.frozen else registry)
+
+            if is_pattern(name):
+                self._patterns.add(name, signal)
+
+        signal.swap(add=add, remove=remove)
+
     def send(self, name, sender=None, **kwargs):
         """
         Sends the signal. Return every function response\
@@ -80,11 +618,292 @@ class Hook(object):
         :return: Signal responses as a sequence of tuples (func, response)
         :rtype: list
         """
+        if (self._transport is not None and
+                name in self._transport.names):
+            self._transport.publish(name, kwargs)
+
+        if tracing.tracer.enabled:
+            with tracing.dispatch_span(tracing.SIGNAL, 'signal', name) as span:
+                responses = self._send_local(name, sender, kwargs)
+                tracing.set_result_size(span, responses)
+                return responses
+
+        return self._send_local(name, sender, kwargs)
+
+    def _send_local(self, name, sender, kwargs):
+        """
+        @Api private
+        Send to the receivers of this process only
+        """
+        if self.graph.providers:
+            receivers, calls = self._graph_calls(name, sender, kwargs)
+            return list(zip(receivers, self.graph.map(calls)))
+
+        signals = self._patterns.match(name)
+
+        try:
+            signal = self._registry[name]
+        except KeyError:
+            signal = None
+
+        if not signals:
+            if signal is None:
+                return []
+
+            return signal.send(sender=sender, **kwargs)
+
+        responses = []
+
+        if signal is not None:
+            responses.extend(signal.send(sender=sender, **kwargs))
+
+        for signal in signals:
+            responses.extend(signal.send(sender=sender, **kwargs))
+
+        return responses
+
+    def _iter_send(self, name, sender, kwargs):
+        """
+        @Api private
+        Lazy send to the receivers of this process
+        """
+        if self.graph.providers:
+            receivers, calls = self._graph_calls(name, sender, kwargs)
+
+            for func, call_args, call_kwargs in calls:
+                yield func(*call_args, **call_kwargs)
+
+            return
+
+        try:
+            signal = self._registry[name]
+        except KeyError:
+            pass
+        else:
+            for response in signal.iter_send(sender=sender, **kwargs):
+                yield response
+
+        for signal in self._patterns.match(name):
+            for response in signal.iter_send(sender=sender, **kwargs):
+                yield response
+
+    def _receivers(self, name, sender):
+        """
+        @Api private
+        Sequence of (signal, receiver) of\
+        the hook and matching patterns
+        """
+        signals = self._patterns.match(name)
+
+        try:
+            signals = (self._registry[name], ) + signals
+        except KeyError:
+            pass
+
+        return [
+            (signal, receiver)
+            for signal in signals
+            if signal.receivers
+            for receiver in signal._receivers(sender)]
+
+    def _graph_calls(self, name, sender, kwargs):
+        """
+        @Api private
+        Call the providers required by the receivers\
+        and return the receivers and their calls\
+        (func, args, kwargs), including the provided values
+        """
+        receivers = self._receivers(name, sender)
+        funcs = tuple(receiver for _signal, receiver in receivers)
+        return funcs, self._calls(receivers, sender, kwargs)
+
+    def _calls(self, receivers, sender, kwargs):
+        """
+        @Api private
+        Call the providers required by the\
+        (signal, receiver) sequence and return\
+        the receivers calls (func, args, kwargs)
+        """
+        if not receivers:
+            return []
+
+        graph = self.graph
+        values = graph.resolve(
+            graph.plan(tuple(receiver for _signal, receiver in receivers)),
+            EMPTY_ARGS,
+            dict(kwargs, sender=sender))
+
+        if instrumentation.active():
+            profile = profiler.sample()
+            return [
+                (instrumentation.call,
+                 ('signal', signal.name, receiver, profile, receiver),
+                 graph.kwargs(
+                     receiver, dict(kwargs, signal=signal, sender=sender), values))
+                for signal, receiver in receivers]
+
+        return [
+            (receiver,
+             EMPTY_ARGS,
+             graph.kwargs(
+                 receiver, dict(kwargs, signal=signal, sender=sender), values))
+            for signal, receiver in receivers]
+
+    def _reduce(self, name, strategy, sender, kwargs):
+        """
+        @Api private
+        Apply the strategy to the lazy responses
+        """
+        responses = self._iter_send(name, sender, kwargs)
+
+        if tracing.tracer.enabled:
+            with tracing.dispatch_span(tracing.SIGNAL, 'signal', name):
+                return strategy(responses)
+
+        return strategy(responses)
+
+    def send_first(self, name, sender=None, **kwargs):
+        """
+        Send the signal until a receiver\
+        returns something other than ``None``.\
+        The remaining receivers are not called.\
+        Sends are not broadcast (see :py:meth:`set_transport`)
+
+        :param str name: The hook name
+        :param class sender: Optional sender __class__ to which\
+        registered callback should match (see :py:func:`.connect` method)
+        :return: The first response or ``None``
+        """
+        return self._reduce(name, strategies.first, sender, kwargs)
+
+    def send_any(self, name, sender=None, **kwargs):
+        """
+        Send the signal until a receiver returns\
+        a true value, see :py:meth:`send_first`
+
+        :param str name: The hook name
+        :param class sender: Optional sender __class__
+        :return: Whether any receiver returned a true value
+        :rtype: bool
+        """
+        return self._reduce(name, strategies.any_response, sender, kwargs)
+
+    def send_all(self, name, sender=None, **kwargs):
+        """
+        Send the signal until a receiver returns\
+        a false value (veto), see :py:meth:`send_first`
+
+        :param str name: The hook name
+        :param class sender: Optional sender __class__
+        :return: Whether all the receivers returned a true value
+        :rtype: bool
+        """
+        return self._reduce(name, strategies.all_responses, sender, kwargs)
+
+    def send_reduce(self, name, func, initial, sender=None, **kwargs):
+        """
+        Fold the receivers responses, the reduce\
+        function may return :py:class:`hooks.strategies.Done`\
+        to stop sending, see :py:meth:`send_first`
+
+        :param str name: The hook name
+        :param callable func: Function receiving\
+        the accumulated value and a response
+        :param initial: The initial value
+        :param class sender: Optional sender __class__
+        :return: The accumulated value
+        """
+        return self._reduce(
+            name,
+            lambda responses: strategies.reduce_responses(func, responses, initial),
+            sender,
+            kwargs)
+
+    def set_transport(self, transport):
+        """
+        Broadcast sends of selected hooks to sibling\
+        processes (see :py:class:`hooks.broadcast.Transport`).\
+        Sends published by siblings are dispatched\
+        to the receivers of this process
+
+        :param transport: Instance of\
+        :py:class:`hooks.broadcast.Transport` or ``None`` to disable it
+        """
+        if transport is not None:
+            transport.hook = self
+
+        self._transport = transport
+
+    def send_robust(self, name, sender=None, **kwargs):
+        """
+        Sends the signal isolating receiver errors.\
+        What happens on error depends on the hook policy\
+        (see :py:func:`.set_policy` method).\
+        Sends are broadcast and traced just like :py:meth:`send`
+
+        :param str name: The hook name
+        :param class sender: Optional sender __class__ to which\
+        registered callback should match (see :py:func:`.connect` method)
+        :return: Signal responses as a sequence of tuples\
+        (func, response), the response is the raised exception\
+        for failed receivers
+        :rtype: list
+        """
+        if (self._transport is not None and
+                name in self._transport.names):
+            self._transport.publish(name, kwargs)
+
+        if tracing.tracer.enabled:
+            with tracing.dispatch_span(tracing.SIGNAL, 'signal', name) as span:
+                responses = self._send_robust_local(name, sender, kwargs)
+                tracing.set_result_size(span, responses)
+                return responses
+
+        return self._send_robust_local(name, sender, kwargs)
+
+    def _send_robust_local(self, name, sender, kwargs):
+        """
+        @Api private
+        Robust send to the receivers of this process only
+        """
+        if self.graph.providers:
+            receivers = self._receivers(name, sender)
+            calls = self._calls(receivers, sender, kwargs)
+            responses = self.graph.map([
+                (signal._robust_call, (receiver, ) + call, {})
+                for (signal, receiver), call in zip(receivers, calls)])
+            return [
+                (receiver, response)
+                for (_signal, receiver), response in zip(receivers, responses)
+                if response is not _DISABLED]
+
+        signals = self._patterns.match(name)
+
+        try:
+            signals = (self._registry[name], ) + signals
+        except KeyError:
+            pass
+
+        responses = []
+
+        for signal in signals:
+            responses.extend(signal.send_robust(sender=sender, **kwargs))
+
+        return responses
+
+    def stats(self, name):
+        """
+        Receivers statistics collected by :py:func:`.send_robust`
+
+        :param str name: The hook name
+        :return: Statistics of every receiver that was called
+        :rtype: list of :py:class:`ReceiverStats`
+        """
         try:
             signal = self._registry[name]
         except KeyError:
             return []
 
-        return signal.send(sender=sender, **kwargs)
+        return list(signal.stats.values())
 
 hook = Hook()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+
+__all__ = [
+    'Done',
+    'first',
+    'any_response',
+    'all_responses',
+    'reduce_responses'
+]
+
+
+class Done(object):
+    """
+    Returned by a reduce function to stop the dispatch,\
+    no more callbacks are called::
+
+        def total(acc, response):
+            acc += response
+            return Done(acc) if acc >= 10 else acc
+
+        hook.send_reduce('cart_items', total, 0)
+
+    :param value: The final result
+    """
+    __slots__ = ('value', )
+
+    def __init__(self, value):
+        self.value = value
+
+
+def first(responses):
+    """
+    The first response that is not ``None``,\
+    the remaining callbacks are not called
+
+    :param responses: Iterator of responses
+    :return: The response or ``None``
+    """
+    for response in responses:
+        if response is not None:
+            return response
+
+    return None
+
+
+def any_response(responses):
+    """
+    Whether any response is true,\
+    stops on the first true response
+
+    :param responses: Iterator of responses
+    :rtype: bool
+    """
+    for response in responses:
+        if response:
+            return True
+
+    return False
+
+
+def all_responses(responses):
+    """
+    Whether all responses are true,\
+    stops on the first false response (veto).\
+    ``True`` when there are no callbacks
+
+    :param responses: Iterator of responses
+    :rtype: bool
+    """
+    for response in responses:
+        if not response:
+            return False
+
+    return True
+
+
+def reduce_responses(func, responses, initial):
+    """
+    Fold the responses, same as :py:func:`functools.reduce`.\
+    The reduce function may return :py:class:`Done`\
+    to stop early
+
+    :param callable func: Function receiving\
+    the accumulated value and a response
+    :param responses: Iterator of responses
+    :param initial: The initial value
+    :return: The accumulated value
+    """
+    value = initial
+
+    for response in responses:
+        value = func(value, response)
+
+        if isinstance(value, Done):
+            return value.value
+
+    return value
@@ -2,8 +2,47 @@
 
 from __future__ import unicode_literals
 
+import hashlib
 
-__all__ = ['hook', 'TemplateHook']
+from django.utils.encoding import force_text
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+
+from .graph import Graph
+from .patterns import is_pattern, PatternIndex
+from .profiling import profiler
+from . import instrumentation
+from . import rollout
+from . import strategies
+from . import tracing
+from .utils import EMPTY_ARGS, intern_name, qualname, frozen_mapping, swapped, FreezeMixin
+
+
+__all__ = ['hook', 'TemplateHook', 'StaticHooks', 'static_hooks', 'fragment_key']
+
+# Rendered output of hooks with no callbacks
+EMPTY_OUTPUT = mark_safe('')
+
+
+def fragment_key(key):
+    """
+    Decorator to declare the fragment cache key of a callback,\
+    required for callbacks whose response depends\
+    on the context or arguments when the hook output\
+    is cached (see :py:meth:`Hook.fragment_key`)::
+
+        @fragment_key(lambda context, *args, **kwargs: context['request'].user.pk)
+        def user_menu(context, *args, **kwargs):
+            # ...
+
+    :param key: A string or a callable receiving\
+    the same arguments as the callback and returning a string
+    """
+    def decorator(func):
+        func.fragment_key = key
+        return func
+
+    return decorator
 
 
 class TemplateHook(object):
@@ -13,10 +52,18 @@ class TemplateHook(object):
 
     :param list providing_args: A list of the arguments\
     this hook can pass along in a :py:func:`.__call__`
+    :param str name: The hook name, set by :py:class:`Hook`
+    :ivar bool gated: Whether any callback has a rollout rule\
+    (see :py:func:`hooks.rollout.rollout`)
     """
-    def __init__(self, providing_args=None):
-        self.providing_args = providing_args or []
+    __slots__ = ('providing_args', 'name', 'gated', '_registry', '_swapped')
+
+    def __init__(self, providing_args=None, name=None):
+        self.providing_args = providing_args or EMPTY_ARGS
+        self.name = name
+        self.gated = False
         self._registry = []
+        self._swapped = EMPTY_ARGS
 
     def __call__(self, *args, **kwargs):
         """
@@ -26,7 +73,91 @@ class TemplateHook(object):
         this is usually a list of HTML strings
         :rtype: list
         """
-        return [func(*args, **kwargs) for func in self._registry]
+        registry = self._selected()
+
+        if instrumentation.active():
+            return self._instrumented(registry, args, kwargs)
+
+        return [func(*args, **kwargs) for func in registry]
+
+    def iter_call(self, *args, **kwargs):
+        """
+        Same as :py:func:`.__call__` but lazy,\
+        callbacks are called as the responses\
+        are consumed
+
+        :return: Iterator of responses
+        """
+        registry = self._selected()
+
+        if instrumentation.active():
+            profile = profiler.sample()
+
+            for func in registry:
+                yield instrumentation.call(
+                    'template', self.name, func, profile, func, *args, **kwargs)
+
+            return
+
+        for func in registry:
+            yield func(*args, **kwargs)
+
+    def _selected(self):
+        """
+        @Api private
+        The callbacks called for the current user,\
+        see :py:mod:`hooks.rollout`
+        """
+        if self.gated:
+            return rollout.select(self._registry)
+
+        return self._registry
+
+    def _instrumented(self, registry, args, kwargs):
+        """
+        @Api private
+        Collect the responses, profiling, tracing\
+        and counting the queries of every callback\
+        (see :py:mod:`hooks.instrumentation`)
+        """
+        profile = profiler.sample()
+        return [
+            instrumentation.call(
+                'template', self.name, func, profile, func, *args, **kwargs)
+            for func in registry]
+
+    def render(self, *args, **kwargs):
+        """
+        Render all callbacks responses, this is\
+        the same as joining the responses of :py:func:`.__call__`\
+        by new lines with :py:func:`django.utils.html.format_html_join`,\
+        without the intermediate list when there are none or one callback
+
+        :return: A concatenation of all callbacks\
+        responses marked as safe (conditionally)
+        :rtype: str
+        """
+        return self._render(self._selected(), args, kwargs)
+
+    def _render(self, registry, args, kwargs):
+        """
+        @Api private
+        Render the selected callbacks
+        """
+        if not registry:
+            return EMPTY_OUTPUT
+
+        if instrumentation.active():
+            return mark_safe('\n'.join([
+                conditional_escape(response)
+                for response in self._instrumented(registry, args, kwargs)]))
+
+        if len(registry) == 1:
+            return conditional_escape(registry[0](*args, **kwargs))
+
+        return mark_safe('\n'.join([
+            conditional_escape(func(*args, **kwargs))
+            for func in registry]))
 
     def register(self, func):
         """
@@ -37,7 +168,13 @@ class TemplateHook(object):
         assert callable(func), \
             "Callback func must be a callable"
 
-        self._registry.append(func)
+        if func in self._swapped:
+            # Added by a reload, now owned by the code
+            self._swapped = tuple(f for f in self._swapped if f != func)
+            return
+
+        self._mutable_registry().append(func)
+        self.gated = self.gated or rollout.has_rules((func, ))
 
     def unregister(self, func):
         """
@@ -47,23 +184,184 @@ class TemplateHook(object):
         that was registered previously
         """
         try:
-            self._registry.remove(func)
+            self._mutable_registry().remove(func)
         except ValueError:
-            pass
+            return
+
+        self.gated = rollout.has_rules(self._registry)
 
     def unregister_all(self):
         """
         Remove all callbacks
         """
-        del self._registry[:]
+        self._registry = []
+        self._swapped = EMPTY_ARGS
+        self.gated = False
+
+    def _compact(self):
+        """
+        @Api private
+        Convert the callbacks into a tuple, see\
+        :py:class:`hooks.utils.FreezeMixin`
+        """
+        self._registry = tuple(self._registry)
+
+    def _mutable_registry(self):
+        """
+        @Api private
+        Convert the callbacks back into a list
+        """
+        if isinstance(self._registry, tuple):
+            self._registry = list(self._registry)
+
+        return self._registry
 
 
-class Hook(object):
+class StaticHooks(object):
+    """
+    Name to :py:class:`TemplateHook` mapping\
+    of a module declaring static template hooks.\
+    The module attributes are looked up once,\
+    call :py:meth:`.refresh` to look them up again.\
+    A changed module restarts the development server,\
+    so this is only needed for hooks added at runtime.\
+    Use :py:func:`static_hooks` to get the\
+    shared instance of a module
+
+    :param module module: Module containing\
+    the template hook definitions
+    """
+    __slots__ = ('module', '_hooks')
+
+    def __init__(self, module):
+        self.module = module
+        self._hooks = None
+
+    @property
+    def hooks(self):
+        """
+        The template hooks of the module
+
+        :return: Template hooks by attribute name
+        :rtype: dict
+        """
+        if self._hooks is None:
+            self._hooks = {
+                intern_name(name): value
+                for name, value in vars(self.module).items()
+                if isinstance(value, TemplateHook)}
+
+            for name, templatehook in self._hooks.items():
+                if templatehook.name is None:
+                    templatehook.name = name
+
+        return self._hooks
+
+    def refresh(self):
+        """
+        Look up the module attributes again\
+        on next access, call this after adding or\
+        replacing template hooks of the module
+        """
+        self._hooks = None
+
+    def get(self, name):
+        """
+        Return a template hook by name
+
+        :param str name: The hook name
+        :return: The template hook or ``None``
+        :rtype: :py:class:`TemplateHook`
+        """
+        return self.hooks.get(name)
+
+    def __call__(self, name, *args, **kwargs):
+        """
+        Collect all callbacks responses for this template hook
+
+        :param str name: The hook name
+        :return: Responses by registered callbacks,\
+        this is usually a list of HTML strings
+        :rtype: list
+        """
+        templatehook = self.hooks.get(name)
+
+        if templatehook is None:
+            return []
+
+        return templatehook(*args, **kwargs)
+
+    def render(self, name, *args, **kwargs):
+        """
+        Render all callbacks responses,\
+        see :py:meth:`TemplateHook.render`
+
+        :param str name: The hook name
+        :return: A concatenation of all callbacks\
+        responses marked as safe (conditionally)
+        :rtype: str
+        """
+        templatehook = self.hooks.get(name)
+
+        if templatehook is None:
+            return EMPTY_OUTPUT
+
+        return templatehook.render(*args, **kwargs)
+
+
+# Shared StaticHooks by module name
+_static_hooks = {}
+
+
+def static_hooks(module):
+    """
+    Return the shared :py:class:`StaticHooks`\
+    of a module, creating it on first call::
+
+        import myhooks
+        from hooks.templatehook import static_hooks
+
+        static_hooks(myhooks).render('within_head', context)
+
+    :param module module: Module containing\
+    the template hook definitions
+    :return: The module static hooks
+    :rtype: :py:class:`StaticHooks`
+    """
+    try:
+        hooks = _static_hooks[module.__name__]
+    except KeyError:
+        hooks = _static_hooks[module.__name__] = StaticHooks(module)
+
+    if hooks.module is not module:
+        hooks.module = module
+        hooks.refresh()
+
+    return hooks
+
+
+class Hook(FreezeMixin):
     """
     Dynamic dispatcher (proxy) for :py:class:`TemplateHook`
+
+    Hook names may be patterns such as ``sidebar.*``\
+    (one segment) or ``sidebar.**`` (one or more segments),\
+    callbacks registered to a pattern are called for every\
+    matching hook name (see :py:class:`hooks.patterns.PatternIndex`)
+
+    Callbacks may require values computed once per call\
+    by shared providers (see :py:meth:`provide`)
+
+    :ivar int version: Registry version, changed\
+    on every register/unregister
+    :ivar graph: The providers, instance of :py:class:`hooks.graph.Graph`
     """
     def __init__(self):
         self._registry = {}
+        self._patterns = PatternIndex()
+        self.graph = Graph()
+        self.version = 0
+        self._digests = {}
 
     def __call__(self, name, *args, **kwargs):
         """
@@ -76,12 +374,367 @@ class Hook(object):
         :return: Responses by registered callbacks
         :rtype: list
         """
+        if tracing.tracer.enabled:
+            with tracing.dispatch_span(tracing.TEMPLATE, 'template', name) as span:
+                responses = self._call(name, args, kwargs)
+                tracing.set_result_size(span, responses)
+                return responses
+
+        return self._call(name, args, kwargs)
+
+    def _call(self, name, args, kwargs):
+        """
+        @Api private
+        """
+        if self.graph.providers:
+            callbacks, calls = self._graph_calls(name, args, kwargs)
+            return self.graph.map(calls)
+
+        templatehooks = self._patterns.match(name)
+
         try:
             templatehook = self._registry[name]
         except KeyError:
-            return []
+            templatehook = None
 
-        return templatehook(*args, **kwargs)
+        if not templatehooks:
+            if templatehook is None:
+                return []
+
+            return templatehook(*args, **kwargs)
+
+        responses = []
+
+        if templatehook is not None:
+            responses.extend(templatehook(*args, **kwargs))
+
+        for templatehook in templatehooks:
+            responses.extend(templatehook(*args, **kwargs))
+
+        return responses
+
+    def render(self, name, *args, **kwargs):
+        """
+        Render all callbacks responses for this template hook\
+        (see :py:func:`TemplateHook.render`).\
+        The hook (name) does not need to be pre-created,\
+        it may not exist at call time
+
+        :param str name: Hook name
+        :return: A concatenation of all callbacks\
+        responses marked as safe (conditionally)
+        :rtype: str
+        """
+        if tracing.tracer.enabled:
+            with tracing.dispatch_span(tracing.TEMPLATE, 'template', name) as span:
+                output = self._render(name, args, kwargs)
+                tracing.set_result_size(span, output)
+                return output
+
+        return self._render(name, args, kwargs)
+
+    def _render(self, name, args, kwargs):
+        """
+        @Api private
+        """
+        if self.graph.providers:
+            callbacks, calls = self._graph_calls(name, args, kwargs)
+
+            if not calls:
+                return EMPTY_OUTPUT
+
+            return mark_safe('\n'.join([
+                conditional_escape(response)
+                for response in self.graph.map(calls)]))
+
+        templatehooks = self._patterns.match(name)
+
+        try:
+            templatehook = self._registry[name]
+        except KeyError:
+            templatehook = None
+
+        if not templatehooks:
+            if templatehook is None:
+                return EMPTY_OUTPUT
+
+            return templatehook.render(*args, **kwargs)
+
+        if templatehook is not None:
+            templatehooks = (templatehook, ) + templatehooks
+
+        # Hooks with no selected callbacks add no separator
+        registries = [
+            (templatehook, templatehook._selected())
+            for templatehook in templatehooks]
+        return mark_safe('\n'.join([
+            templatehook._render(registry, args, kwargs)
+            for templatehook, registry in registries
+            if registry]))
+
+    def _iter_call(self, name, args, kwargs):
+        """
+        @Api private
+        Lazy responses of the hook and matching patterns
+        """
+        if self.graph.providers:
+            callbacks, calls = self._graph_calls(name, args, kwargs)
+
+            for func, call_args, call_kwargs in calls:
+                yield func(*call_args, **call_kwargs)
+
+            return
+
+        for templatehook in self._lookup(name):
+            for response in templatehook.iter_call(*args, **kwargs):
+                yield response
+
+    def _graph_calls(self, name, args, kwargs):
+        """
+        @Api private
+        Call the providers required by the callbacks\
+        and return the callbacks and their calls\
+        (func, args, kwargs), including the provided values
+        """
+        templatehooks = self._lookup(name)
+        callbacks = tuple(
+            func
+            for templatehook in templatehooks
+            for func in templatehook._registry)
+
+        if any(templatehook.gated for templatehook in templatehooks):
+            callbacks = tuple(rollout.select(callbacks))
+
+        if not callbacks:
+            return callbacks, []
+
+        graph = self.graph
+        values = graph.resolve(graph.plan(callbacks), args, kwargs)
+
+        if instrumentation.active():
+            profile = profiler.sample()
+            return callbacks, [
+                (instrumentation.call,
+                 ('template', name, func, profile, func) + args,
+                 graph.kwargs(func, kwargs, values))
+                for func in callbacks]
+
+        return callbacks, [
+            (func, args, graph.kwargs(func, kwargs, values))
+            for func in callbacks]
+
+    def _reduce(self, name, strategy, args, kwargs):
+        """
+        @Api private
+        Apply the strategy to the lazy responses
+        """
+        responses = self._iter_call(name, args, kwargs)
+
+        if tracing.tracer.enabled:
+            with tracing.dispatch_span(tracing.TEMPLATE, 'template', name):
+                return strategy(responses)
+
+        return strategy(responses)
+
+    def first(self, name, *args, **kwargs):
+        """
+        Call the callbacks until one returns\
+        something other than ``None``.\
+        The remaining callbacks are not called
+
+        :param str name: Hook name
+        :return: The first response or ``None``
+        """
+        return self._reduce(name, strategies.first, args, kwargs)
+
+    def any(self, name, *args, **kwargs):
+        """
+        Call the callbacks until one returns\
+        a true value, see :py:meth:`first`
+
+        :param str name: Hook name
+        :return: Whether any callback returned a true value
+        :rtype: bool
+        """
+        return self._reduce(name, strategies.any_response, args, kwargs)
+
+    def all(self, name, *args, **kwargs):
+        """
+        Call the callbacks until one returns\
+        a false value (veto), see :py:meth:`first`
+
+        :param str name: Hook name
+        :return: Whether all the callbacks returned a true value
+        :rtype: bool
+        """
+        return self._reduce(name, strategies.all_responses, args, kwargs)
+
+    def reduce(self, name, func, initial, *args, **kwargs):
+        """
+        Fold the callbacks responses, the reduce\
+        function may return :py:class:`hooks.strategies.Done`\
+        to stop calling callbacks, see :py:meth:`first`
+
+        :param str name: Hook name
+        :param callable func: Function receiving\
+        the accumulated value and a response
+        :param initial: The initial value
+        :return: The accumulated value
+        """
+        return self._reduce(
+            name,
+            lambda responses: strategies.reduce_responses(func, responses, initial),
+            args,
+            kwargs)
+
+    def provide(self, name, func):
+        """
+        Register the provider of a value.\
+        Callbacks requiring the value (see\
+        :py:func:`hooks.graph.requires`) get it as\
+        a keyword argument. The provider is called\
+        once per hook call, with the same arguments\
+        as the callbacks::
+
+            def user_profile(context, *args, **kwargs):
+                return Profile.objects.get(user=context['request'].user)
+
+            hook.provide('user_profile', user_profile)
+
+            @requires('user_profile')
+            def user_menu(context, *args, **kwargs):
+                return kwargs['user_profile'].menu
+
+        :param str name: The value name
+        :param callable func: The provider
+        """
+        if self.frozen:
+            self._late_registration(name)
+
+        self.graph.provide(name, func)
+
+    def unprovide(self, name):
+        """
+        Remove the provider of a value
+
+        :param str name: The value name
+        """
+        self.graph.unprovide(name)
+
+    def set_pool(self, pool):
+        """
+        Run independent providers concurrently\
+        (see :py:meth:`hooks.graph.Graph.set_pool`)
+
+        :param pool: Executor such as\
+        :py:class:`concurrent.futures.ThreadPoolExecutor`\
+        or ``None``
+        """
+        self.graph.set_pool(pool)
+
+    def warm_up(self):
+        """
+        Precompute the pattern matches\
+        of every registered hook, and the\
+        providers plan when there are providers
+        """
+        for name in list(self._registry):
+            self._patterns.match(name)
+
+            if self.graph.providers:
+                self.graph.plan(tuple(
+                    func
+                    for templatehook in self._lookup(name)
+                    for func in templatehook._registry))
+
+    def _compact(self):
+        """
+        @Api private
+        """
+        for templatehook in self._registry.values():
+            templatehook._compact()
+
+        self._registry = frozen_mapping(self._registry)
+
+    def _thaw(self):
+        """
+        @Api private
+        """
+        self._registry = dict(self._registry)
+
+    def _lookup(self, name):
+        """
+        @Api private
+        All the template hooks for the name,\
+        including the ones of matching patterns
+        """
+        templatehooks = self._patterns.match(name)
+
+        try:
+            return (self._registry[name], ) + templatehooks
+        except KeyError:
+            return templatehooks
+
+    def fragment_key(self, name, *args, **kwargs):
+        """
+        Key to cache the output of this template hook.\
+        It's made of the hook name, a digest of the\
+        registered callbacks names (the same in every process\
+        with the same callbacks), the keys declared by the callbacks\
+        (see :py:func:`fragment_key`) and whether\
+        the callbacks with a rollout rule are called\
+        (see :py:func:`hooks.rollout.rollout`)
+
+        :param str name: Hook name
+        :param \*args: Positional arguments passed to the callbacks
+        :param \*\*kwargs: Keyword arguments passed to the callbacks
+        :return: The key
+        :rtype: str
+        """
+        parts = [name, self._digest(name)]
+
+        for templatehook in self._lookup(name):
+            for func in templatehook._registry:
+                if getattr(func, 'rollout', None) is not None:
+                    if not func.rollout.allows():
+                        parts.append('-')
+                        continue
+
+                    parts.append('+')
+
+                key = getattr(func, 'fragment_key', None)
+
+                if key is None:
+                    continue
+
+                if callable(key):
+                    key = key(*args, **kwargs)
+
+                parts.append(force_text(key))
+
+        return ':'.join(parts)
+
+    def _digest(self, name):
+        """
+        @Api private
+        Digest of the qualified names of the callbacks,\
+        computed once per registry version
+        """
+        try:
+            version, digest = self._digests[name]
+        except KeyError:
+            version, digest = None, None
+
+        if version == self.version:
+            return digest
+
+        names = '\n'.join(
+            qualname(func)
+            for templatehook in self._lookup(name)
+            for func in templatehook._registry)
+        digest = hashlib.md5(names.encode('utf-8')).hexdigest()[:16]
+        self._digests[name] = (self.version, digest)
+        return digest
 
     def _register(self, name):
         """
@@ -92,8 +745,13 @@ class Hook(object):
         :return: Instance of :py:class:`TemplateHook`
         :rtype: :py:class:`TemplateHook`
         """
-        templatehook = TemplateHook()
+        name = intern_name(name)
+        templatehook = TemplateHook(name=name)
         self._registry[name] = templatehook
+
+        if is_pattern(name):
+            self._patterns.add(name, templatehook)
+
         return templatehook
 
     def register(self, name, func):
@@ -107,12 +765,16 @@ class Hook(object):
         :param str name: Hook name
         :param callable func: A func reference (callback)
         """
+        if self.frozen:
+            self._late_registration(name)
+
         try:
             templatehook = self._registry[name]
         except KeyError:
             templatehook = self._register(name)
 
         templatehook.register(func)
+        self.version += 1
 
     def unregister(self, name, func):
         """
@@ -128,6 +790,7 @@ class Hook(object):
             return
 
         templatehook.unregister(func)
+        self.version += 1
 
     def unregister_all(self, name):
         """
@@ -141,6 +804,41 @@ class Hook(object):
             return
 
         templatehook.unregister_all()
+        self.version += 1
+
+    def swap(self, name, add=EMPTY_ARGS, remove=EMPTY_ARGS):
+        """
+        Register and remove callbacks at once.\
+        The callbacks are replaced by a new sequence,\
+        so calls in progress keep calling the previous ones.\
+        Frozen registries are allowed to change,\
+        this is meant for reloading (see :py:mod:`hooks.reload`)
+
+        :param str name: Hook name
+        :param list add: Callbacks to register,\
+        the ones already registered are skipped
+        :param list remove: Callbacks to remove, only the ones\
+        added by a swap (see :py:func:`hooks.utils.swapped`)
+        """
+        try:
+            templatehook = self._registry[name]
+        except KeyError:
+            templatehook = TemplateHook(name=intern_name(name))
+            registry = dict(self._registry)
+            registry[templatehook.name] = templatehook
+            self._registry = (
+                frozen_mapping(registry) if self.frozen else registry)
+
+            if is_pattern(name):
+                self._patterns.add(templatehook.name, templatehook)
+
+        callbacks, swapped_ = swapped(
+            templatehook._registry, templatehook._swapped, add, remove)
+        templatehook._swapped = tuple(swapped_)
+        templatehook._registry = (
+            tuple(callbacks) if self.frozen else callbacks)
+        templatehook.gated = rollout.has_rules(callbacks)
+        self.version += 1
 
 
 hook = Hook()
@@ -2,22 +2,91 @@
 
 from __future__ import unicode_literals
 
+from functools import wraps
+
 from django import template
-from django.utils.html import format_html_join
+from django.core.cache import caches, InvalidCacheBackendError
+from django.core.cache.utils import make_template_fragment_key
+from django.utils.safestring import mark_safe
 
-from hooks.templatehook import hook
+from hooks.templatehook import hook, static_hooks, EMPTY_OUTPUT
+from hooks.output import get_policy
 
 
 register = template.Library()
 
 
+def _render(name, context, args, kwargs):
+    """
+    @Api private
+    Render the hook through the output policy\
+    when size limits or minifying are set
+    """
+    policy = get_policy()
+
+    if policy.active:
+        return policy.render(hook, name, context, *args, **kwargs)
+
+    return hook.render(name, context, *args, **kwargs)
+
+
 @register.simple_tag(name="hook", takes_context=True)
 def hook_tag(context, name, *args, **kwargs):
     """
-    Hook tag to call within templates
+    Hook tag to call within templates.\
+    The output size may be limited and minified\
+    through settings, see :py:class:`hooks.output.OutputPolicy`
+
+    :param dict context: This is automatically passed,\
+    contains the template state/variables
+    :param str name: The hook which will be dispatched
+    :param \*args: Positional arguments, will be passed to hook callbacks
+    :param \*\*kwargs: Keyword arguments, will be passed to hook callbacks
+    :return: A concatenation of all callbacks\
+    responses marked as safe (conditionally)
+    :rtype: str
+    """
+    return _render(name, context, args, kwargs)
+
+
+@register.simple_tag(name="hook_fragment_key", takes_context=True)
+def hook_fragment_key_tag(context, name, *args, **kwargs):
+    """
+    Key to vary a ``{% cache %}`` block on,\
+    so a hook output can be cached at the fragment level\
+    (see :py:meth:`hooks.templatehook.Hook.fragment_key`).\
+    Example (Django 1.9+)::
+
+        {% hook_fragment_key 'sidebar' as sidebar_key %}
+        {% cache 500 sidebar sidebar_key %}
+            {% hook 'sidebar' %}
+        {% endcache %}
+
+    :param dict context: This is automatically passed,\
+    contains the template state/variables
+    :param str name: The hook name
+    :param \*args: Positional arguments, will be passed to callbacks keys
+    :param \*\*kwargs: Keyword arguments, will be passed to callbacks keys
+    :return: The key
+    :rtype: str
+    """
+    return hook.fragment_key(name, context, *args, **kwargs)
+
+
+@register.simple_tag(name="cached_hook", takes_context=True)
+def cached_hook_tag(context, timeout, name, *args, **kwargs):
+    """
+    Same as the ``hook`` tag, but the output is cached.\
+    The cache key is made of the hook name, registry version\
+    and callbacks declared keys, so registering/unregistering\
+    callbacks invalidates it. Uses the ``template_fragments``\
+    cache when configured, same as ``{% cache %}``::
+
+        {% cached_hook 500 'sidebar' %}
 
     :param dict context: This is automatically passed,\
     contains the template state/variables
+    :param int timeout: Seconds to cache the output for
     :param str name: The hook which will be dispatched
     :param \*args: Positional arguments, will be passed to hook callbacks
     :param \*\*kwargs: Keyword arguments, will be passed to hook callbacks
@@ -25,14 +94,21 @@ def hook_tag(context, name, *args, **kwargs):
     responses marked as safe (conditionally)
     :rtype: str
     """
-    return format_html_join(
-        sep="\n",
-        format_string="{}",
-        args_generator=(
-            (response, )
-            for response in hook(name, context, *args, **kwargs)
-        )
-    )
+    try:
+        cache = caches['template_fragments']
+    except InvalidCacheBackendError:
+        cache = caches['default']
+
+    key = make_template_fragment_key(
+        'hooks.%s' % name,
+        [hook.fragment_key(name, context, *args, **kwargs)])
+    output = cache.get(key)
+
+    if output is None:
+        output = _render(name, context, args, kwargs)
+        cache.set(key, output, timeout if timeout is None else int(timeout))
+
+    return mark_safe(output)
 
 
 def template_hook_collect(module, hook_name, *args, **kwargs):
@@ -59,13 +135,46 @@ def template_hook_collect(module, hook_name, *args, **kwargs):
     try:
         templatehook = getattr(module, hook_name)
     except AttributeError:
-        return ""
-
-    return format_html_join(
-        sep="\n",
-        format_string="{}",
-        args_generator=(
-            (response, )
-            for response in templatehook(*args, **kwargs)
-        )
-    )
+        return EMPTY_OUTPUT
+
+    return templatehook.render(*args, **kwargs)
+
+
+def static_hook_tag(module):
+    """
+    Decorator to declare a custom templatetag\
+    for static TemplateHooks. Hooks are looked up\
+    in a cached mapping of the module\
+    (see :py:class:`hooks.templatehook.StaticHooks`),\
+    the decorated function is only called\
+    for names not defined in the module
+
+    Example::
+
+        import myhooks
+        from hooks.templatetags.hooks_tags import static_hook_tag
+
+        @register.simple_tag(name="hook", takes_context=True)
+        @static_hook_tag(myhooks)
+        def hook(context, name, *args, **kwargs):
+            return ''
+
+    :param module module: Module containing the template hook definitions
+    :return: The decorator
+    :rtype: callable
+    """
+    hooks = static_hooks(module)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(context, name, *args, **kwargs):
+            templatehook = hooks.get(name)
+
+            if templatehook is None:
+                return func(context, name, *args, **kwargs)
+
+            return templatehook.render(context, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
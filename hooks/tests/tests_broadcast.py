@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json
+import shutil
+import socket
+import tempfile
+import unittest
+import multiprocessing
+
+try:
+    from unittest import mock
+except ImportError:  # Python 2
+    import mock
+
+from django.test import TestCase
+
+from hooks import broadcast
+from hooks import signalhook
+from hooks.signalhook import Hook
+from hooks.broadcast import Backend, UnixSocketBackend, Transport
+
+
+class BackendMock(Backend):
+
+    def __init__(self, max_payload=2 ** 16):
+        self.max_payload = max_payload
+        self.published = []
+
+    def publish(self, payload):
+        self.published.append(payload)
+
+    def receive(self, timeout=None):
+        try:
+            return self.published.pop(0)
+        except IndexError:
+            return None
+
+
+def _worker(path, ready, results):
+    # Runs in a sibling process
+    hook = Hook()
+    transport = Transport(UnixSocketBackend(path), names=["foo-hook"])
+    hook.set_transport(transport)
+
+    def func(signal, sender, **kwargs):
+        results.put(kwargs)
+
+    hook.connect("foo-hook", func)
+    ready.set()
+
+    try:
+        transport.poll(timeout=5)
+    finally:
+        transport.backend.close()
+
+
+class TransportTest(TestCase):
+
+    def test_batching(self):
+        backend = BackendMock()
+        transport = Transport(backend, names=["foo-hook"], batch_size=2)
+        hook = Hook()
+        hook.set_transport(transport)
+        hook.send("foo-hook", extra="foo")
+        hook.send("foo-hook", extra="bar")
+
+        # Only the listener thread publishes
+        self.assertListEqual(backend.published, [])
+
+        # not broadcast
+        hook.send("bar-hook", extra="baz")
+        transport.flush()
+        self.assertListEqual(
+            backend.published,
+            [b'[["foo-hook", {"extra": "foo"}],["foo-hook", {"extra": "bar"}]]'])
+
+    def test_buffer_full(self):
+        backend = BackendMock()
+        transport = Transport(backend, names=["foo-hook"], batch_size=1)
+        hook = Hook()
+        hook.set_transport(transport)
+        hook.send("foo-hook", extra="foo")
+
+        with mock.patch.object(broadcast.logger, 'warning') as warning:
+            hook.send("foo-hook", extra="bar")
+
+        self.assertTrue(warning.called)
+        self.assertEqual(transport.dropped, 1)
+        transport.flush()
+        self.assertListEqual(
+            backend.published, [b'[["foo-hook", {"extra": "foo"}]]'])
+
+    def test_split(self):
+        backend = BackendMock(max_payload=100)
+        transport = Transport(backend, names=["foo-hook"])
+        hook = Hook()
+        hook.set_transport(transport)
+
+        for i in range(10):
+            hook.send("foo-hook", extra=i)
+
+        with mock.patch.object(broadcast.logger, 'warning') as warning:
+            hook.send("foo-hook", extra="x" * 100)
+            transport.flush()
+
+        self.assertTrue(warning.called)
+        self.assertEqual(transport.dropped, 1)
+        self.assertTrue(len(backend.published) > 1)
+        self.assertTrue(all(len(p) <= 100 for p in backend.published))
+        self.assertListEqual(
+            [kwargs['extra']
+             for payload in backend.published
+             for _name, kwargs in json.loads(payload.decode('utf-8'))],
+            list(range(10)))
+
+    def test_dispatch(self):
+        def func(signal, sender, **kwargs):
+            self._calls.append((sender, kwargs))
+
+        self._calls = []
+        backend = BackendMock()
+        transport = Transport(backend, names=["foo-hook"])
+        hook = Hook()
+        hook.set_transport(transport)
+        hook.connect("foo-hook", func)
+        hook.send("foo-hook", extra="foo")
+        transport.flush()
+        self.assertEqual(transport.poll(), 1)
+        self.assertListEqual(
+            self._calls,
+            [(None, {'extra': "foo"}), (None, {'extra': "foo"})])
+
+        # received sends are not published again
+        self.assertListEqual(backend.published, [])
+        self.assertEqual(transport.poll(), 0)
+
+    def test_send_robust(self):
+        backend = BackendMock()
+        transport = Transport(backend, names=["foo-hook"])
+        hook = Hook()
+        hook.set_transport(transport)
+        hook.send_robust("foo-hook", extra="foo")
+        transport.flush()
+        self.assertListEqual(
+            backend.published, [b'[["foo-hook", {"extra": "foo"}]]'])
+
+    def test_dispatch_error(self):
+        def failing(signal, sender, **kwargs):
+            raise ValueError("foo")
+
+        def func(signal, sender, **kwargs):
+            self._calls.append(kwargs)
+
+        self._calls = []
+        transport = Transport(BackendMock(), names=["a", "b"])
+        hook = Hook()
+        hook.set_transport(transport)
+        hook.connect("a", failing)
+        hook.connect("b", func)
+        payload = b'[["b", {"n": 1}],["a", {}],["b", {"n": 2}]]'
+
+        with mock.patch('hooks.signalhook.logger') as logger:
+            self.assertEqual(transport.dispatch(payload), 3)
+
+        self.assertTrue(logger.exception.called)
+        self.assertListEqual(self._calls, [{'n': 1}, {'n': 2}])
+
+        # Fail fast receivers are isolated per message
+        hook.set_policy("a", signalhook.FAIL_FAST)
+
+        with mock.patch.object(broadcast.logger, 'exception') as exception:
+            self.assertEqual(transport.dispatch(payload), 3)
+
+        self.assertTrue(exception.called)
+        self.assertListEqual(self._calls, [{'n': 1}, {'n': 2}] * 2)
+
+    def test_not_serializable(self):
+        transport = Transport(BackendMock(), names=["foo-hook"])
+        hook = Hook()
+        hook.set_transport(transport)
+        self.assertRaises(TypeError, hook.send, "foo-hook", extra=object())
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "Requires unix sockets")
+class UnixSocketBackendTest(TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_multiprocess(self):
+        ready = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        worker = multiprocessing.Process(
+            target=_worker, args=(self.path, ready, results))
+        worker.start()
+
+        try:
+            self.assertTrue(ready.wait(5))
+            transport = Transport(UnixSocketBackend(self.path), names=["foo-hook"])
+            hook = Hook()
+            hook.set_transport(transport)
+            hook.send("foo-hook", extra="foo")
+            transport.flush()
+            self.assertDictEqual(results.get(timeout=5), {'extra': "foo"})
+        finally:
+            worker.join(5)
+            transport.backend.close()
+
+    def test_stale_peer(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        stale.bind(self.path + '/0.sock')
+        stale.close()
+        backend = UnixSocketBackend(self.path)
+        backend.publish(b'[]')
+        self.assertListEqual(backend._peers(), [])
+        backend.close()
+
+    def test_message_too_long(self):
+        peer = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        peer.bind(self.path + '/0.sock')
+        backend = UnixSocketBackend(self.path, max_payload=2 ** 24)
+
+        try:
+            with mock.patch.object(broadcast.logger, 'warning') as warning:
+                backend.publish(b'x' * 2 ** 23)
+
+            self.assertTrue(warning.called)
+            self.assertEqual(backend.dropped, 1)
+        finally:
+            peer.close()
+            backend.close()
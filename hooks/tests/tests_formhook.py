@@ -4,9 +4,11 @@ from __future__ import unicode_literals
 
 
 from django.test import TestCase
+from django import forms
 from django.forms import Form
 
-from hooks.formhook import Hook
+from hooks import formhook
+from hooks.formhook import Hook, HookFactory, form_prefix
 
 
 class FormMock(object):
@@ -22,11 +24,26 @@ class FormMock(object):
         return True
 
 
+class EmailForm(Form):
+    email = forms.EmailField()
+    name = forms.CharField()
+
+    def clean_name(self):
+        return self.cleaned_data['name'].upper()
+
+    def clean(self):
+        raise forms.ValidationError("form-wide error")
+
+
 class FormHookTest(TestCase):
 
     def test_instance(self):
         myhook = Hook(providing_args=["foo", "bar"])
         self.assertListEqual(myhook.providing_args, ["foo", "bar"])
+        self.assertIs(Hook().providing_args, Hook().providing_args)
+
+    def test_factory_slots(self):
+        self.assertFalse(hasattr(HookFactory([]), '__dict__'))
 
     def test_register(self):
         myhook = Hook()
@@ -127,3 +144,159 @@ class FormHookTest(TestCase):
             forms.save('foo', bar='bar'),
             [(form_instance, (('foo',), {'bar': 'bar'})), ]
         )
+
+    def test_call_plans(self):
+        """
+        Should cache the (form, prefix) plans
+        """
+        class MyForm(FormMock):
+            """"""
+
+        myhook = Hook()
+        myhook.register(FormMock)
+        myhook()
+        self.assertDictEqual(myhook._plans, {'hook%d': ((FormMock, 'hook0'), )})
+
+        # register/unregister clears the cache
+        myhook.register(MyForm)
+        self.assertDictEqual(myhook._plans, {})
+        self.assertListEqual(
+            [f.kwargs['prefix'] for f in myhook()], ['hook0', 'hook1'])
+        myhook.unregister(FormMock)
+        self.assertDictEqual(myhook._plans, {})
+        self.assertListEqual(
+            [f.kwargs['prefix'] for f in myhook()], ['hook0'])
+
+    def test_call_plans_max(self):
+        """
+        Should clear the plans when the cache is full
+        """
+        myhook = Hook()
+        myhook.register(FormMock)
+
+        for _ in range(formhook.MAX_PLANS):
+            myhook(prefix=lambda form: 'foo')
+
+        self.assertEqual(len(myhook._plans), formhook.MAX_PLANS)
+        myhook(prefix=lambda form: 'foo')
+        self.assertEqual(len(myhook._plans), 1)
+
+    def test_call_prefix_by_identity(self):
+        class MyForm(FormMock):
+            """"""
+
+        myhook = Hook(prefix=form_prefix)
+        myhook.register(FormMock)
+        myhook.register(MyForm)
+        self.assertListEqual(
+            [f.kwargs['prefix'] for f in myhook()],
+            ['hook_hooks_tests_tests_formhook_formmock',
+             'hook_hooks_tests_tests_formhook_myform'])
+
+        # prefix does not change
+        myhook.unregister(FormMock)
+        self.assertListEqual(
+            [f.kwargs['prefix'] for f in myhook()],
+            ['hook_hooks_tests_tests_formhook_myform'])
+
+        # given prefix takes precedence
+        self.assertListEqual(
+            [f.kwargs['prefix'] for f in myhook(prefix='foo_%d')],
+            ['foo_0'])
+
+    def test_register_prefix(self):
+        class MyForm(FormMock):
+            """"""
+
+        myhook = Hook()
+        myhook.register(FormMock)
+        myhook.register(MyForm, prefix='myform')
+        self.assertListEqual(
+            [f.kwargs['prefix'] for f in myhook()], ['hook0', 'myform'])
+        self.assertListEqual(
+            [f.kwargs['prefix'] for f in myhook(prefix='foo_%d')], ['foo_0', 'myform'])
+
+        myhook.unregister(MyForm)
+        self.assertDictEqual(myhook._prefixes, {})
+
+    def test_call_lazy(self):
+        """
+        Should create the forms on first access
+        """
+        class MyForm(FormMock):
+            created = []
+
+            def __init__(self, *args, **kwargs):
+                super(MyForm, self).__init__(*args, **kwargs)
+                self.created.append(self)
+
+        myhook = Hook()
+        myhook.register(MyForm)
+        forms = myhook()
+        self.assertListEqual(MyForm.created, [])
+        self.assertEqual(len(list(forms)), 1)
+        self.assertEqual(len(list(forms)), 1)
+        self.assertEqual(len(MyForm.created), 1)
+
+    def test_factory_instances(self):
+        form = FormMock()
+        self.assertListEqual(list(HookFactory(instances=[form])), [form])
+
+
+class FormHookValidateTest(TestCase):
+
+    def test_validate_fields(self):
+        class MyForm(FormMock):
+            created = []
+
+            def __init__(self, *args, **kwargs):
+                super(MyForm, self).__init__(*args, **kwargs)
+                self.created.append(self)
+
+        myhook = Hook()
+        myhook.register(EmailForm)
+        myhook.register(MyForm)
+        forms = myhook(data={'hook0-email': "foo", 'hook0-name': "bar"})
+        self.assertDictEqual(
+            forms.validate(fields=['hook0-email']),
+            {'hook0': {'email': [
+                {'message': "Enter a valid email address.", 'code': "invalid"}]}})
+        self.assertListEqual(MyForm.created, [])
+
+        # only the given fields are cleaned
+        self.assertDictEqual(forms.validate(fields=['hook0-name']), {})
+        form = list(forms)[0]
+        self.assertDictEqual(form.cleaned_data, {'name': "BAR"})
+
+        # unknown fields and prefixes are ignored
+        self.assertDictEqual(
+            forms.validate(fields=['hook0-foo', 'hook2-email', 'foo']), {})
+
+    def test_validate_forms(self):
+        myhook = Hook()
+        myhook.register(EmailForm)
+        myhook.register(EmailForm)
+        forms = myhook(data={'hook0-email': "foo@bar.com"})
+        errors = forms.validate(forms=['hook0'])
+        self.assertListEqual(list(errors), ['hook0'])
+        self.assertListEqual(
+            sorted(errors['hook0']), ['__all__', 'name'])
+
+        # all the forms
+        self.assertListEqual(sorted(forms.validate()), ['hook0', 'hook1'])
+
+    def test_validate_disabled(self):
+        class DisabledForm(forms.Form):
+            email = forms.EmailField(disabled=True, initial="foo@bar.com")
+
+        myhook = Hook()
+        myhook.register(DisabledForm)
+        forms_ = myhook(data={})
+        self.assertDictEqual(forms_.validate(fields=['hook0-email']), {})
+        self.assertDictEqual(
+            list(forms_)[0].cleaned_data, {'email': "foo@bar.com"})
+
+    def test_validate_unbound(self):
+        myhook = Hook()
+        myhook.register(EmailForm)
+        self.assertDictEqual(myhook().validate(fields=['hook0-email']), {})
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.test import TestCase, TransactionTestCase
+from django.db import models, connection
+from django import forms
+from django.forms.formsets import formset_factory
+from django.forms.models import modelformset_factory, BaseModelFormSet
+
+from hooks.formhook import Hook
+
+
+class Item(models.Model):
+    name = models.CharField(max_length=50)
+    quantity = models.IntegerField(default=1)
+
+    class Meta:
+        app_label = 'hooks'
+
+
+class ItemForm(forms.Form):
+    name = forms.CharField(max_length=5)
+
+
+ItemFormSet = formset_factory(ItemForm)
+ItemModelFormSet = modelformset_factory(
+    Item, fields=('name', 'quantity'), extra=2, can_delete=True)
+
+
+def management_data(prefix, total, initial=0):
+    return {
+        '%s-TOTAL_FORMS' % prefix: str(total),
+        '%s-INITIAL_FORMS' % prefix: str(initial),
+        '%s-MIN_NUM_FORMS' % prefix: '0',
+        '%s-MAX_NUM_FORMS' % prefix: '1000'}
+
+
+class FormHookFormSetTest(TestCase):
+
+    def test_is_valid(self):
+        myhook = Hook()
+        myhook.register(ItemFormSet)
+        data = management_data('hook0', 2)
+        data.update({'hook0-0-name': "foo", 'hook0-1-name': "foobar"})
+        formsets = myhook(data=data)
+        self.assertFalse(formsets.is_valid())
+
+        data['hook0-1-name'] = "bar"
+        self.assertTrue(myhook(data=data).is_valid())
+
+    def test_validate(self):
+        myhook = Hook()
+        myhook.register(ItemFormSet)
+        data = management_data('hook0', 2)
+        data.update({'hook0-0-name': "foobar", 'hook0-1-name': "foobar"})
+        formsets = myhook(data=data)
+        errors = formsets.validate(fields=['hook0-1-name', 'hook0-5-name', 'hook0-x-name'])
+        self.assertListEqual(list(errors), ['hook0'])
+        self.assertListEqual(list(errors['hook0']), ['1'])
+        self.assertEqual(errors['hook0']['1']['name'][0]['code'], "max_length")
+
+        errors = myhook(data=data).validate(forms=['hook0'])
+        self.assertListEqual(sorted(errors['hook0']), ['0', '1'])
+
+    def test_validate_management_form(self):
+        myhook = Hook()
+        myhook.register(ItemFormSet)
+        data = {'hook0-0-name': "foo"}
+
+        for errors in (
+                myhook(data=data).validate(fields=['hook0-0-name']),
+                myhook(data=data).validate(forms=['hook0']),
+                myhook(data=data).validate()):
+            self.assertListEqual(list(errors), ['hook0'])
+            self.assertListEqual(list(errors['hook0']), ['__all__'])
+            self.assertEqual(len(errors['hook0']['__all__']), 1)
+
+
+
+class FormHookModelFormSetTest(TransactionTestCase):
+
+    def setUp(self):
+        # The hooks app has no models module, so no table is created
+        with connection.schema_editor() as editor:
+            editor.create_model(Item)
+
+    def tearDown(self):
+        with connection.schema_editor() as editor:
+            editor.delete_model(Item)
+
+    def test_save_bulk(self):
+        Item.objects.create(name="foo")
+        deleted = Item.objects.create(name="bar")
+        unchanged = Item.objects.create(name="baz")
+        myhook = Hook()
+        myhook.register(ItemModelFormSet)
+        items = list(Item.objects.order_by('pk'))
+        data = management_data('hook0', 5, initial=3)
+        data.update({
+            'hook0-0-id': str(items[0].pk),
+            'hook0-0-name': "changed",
+            'hook0-0-quantity': "2",
+            'hook0-1-id': str(items[1].pk),
+            'hook0-1-name': "bar",
+            'hook0-1-quantity': "1",
+            'hook0-1-DELETE': "on",
+            'hook0-2-id': str(items[2].pk),
+            'hook0-2-name': "baz",
+            'hook0-2-quantity': "1",
+            'hook0-3-name': "new",
+            'hook0-3-quantity': "1",
+            'hook0-4-name': "new2",
+            'hook0-4-quantity': "1"})
+        formsets = myhook(data=data, queryset=Item.objects.order_by('pk'))
+        self.assertTrue(formsets.is_valid())
+
+        # begin, delete, insert and update
+        with self.assertNumQueries(4):
+            formsets.save(bulk=True)
+
+        self.assertListEqual(
+            list(Item.objects.order_by('name').values_list('name', 'quantity')),
+            [("baz", 1), ("changed", 2), ("new", 1), ("new2", 1)])
+        self.assertFalse(Item.objects.filter(pk=deleted.pk).exists())
+        self.assertTrue(Item.objects.filter(pk=unchanged.pk).exists())
+
+    def test_save_not_bulk_by_default(self):
+        myhook = Hook()
+        myhook.register(ItemModelFormSet)
+        data = management_data('hook0', 1)
+        data.update({'hook0-0-name': "foo", 'hook0-0-quantity': "1"})
+        formsets = myhook(data=data, queryset=Item.objects.none())
+        self.assertTrue(formsets.is_valid())
+        saved = []
+
+        def receiver(sender, instance, **kwargs):
+            saved.append(instance.name)
+
+        models.signals.post_save.connect(receiver, sender=Item)
+
+        try:
+            instances = formsets.save()[0][1]
+        finally:
+            models.signals.post_save.disconnect(receiver, sender=Item)
+
+        self.assertListEqual(saved, ["foo"])
+        self.assertIsNotNone(instances[0].pk)
+
+    def test_save_bulk_no_model_fields(self):
+        class NoteForm(forms.ModelForm):
+            note = forms.CharField(required=False)
+
+            class Meta:
+                model = Item
+                fields = ('name', )
+
+        NoteFormSet = modelformset_factory(Item, form=NoteForm, extra=0)
+        item = Item.objects.create(name="foo")
+        myhook = Hook()
+        myhook.register(NoteFormSet)
+        data = management_data('hook0', 1, initial=1)
+        data.update({
+            'hook0-0-id': str(item.pk),
+            'hook0-0-name': "foo",
+            'hook0-0-note': "changed"})
+        formsets = myhook(data=data, queryset=Item.objects.all())
+        self.assertTrue(formsets.is_valid())
+        self.assertListEqual(formsets.save(bulk=True)[0][1], [item])
+        self.assertEqual(Item.objects.get().name, "foo")
+
+    def test_save_custom(self):
+        """
+        Should call the formset save when it's overridden or args are given
+        """
+        class CustomFormSet(BaseModelFormSet):
+            def save(self, *args, **kwargs):
+                return "custom"
+
+        CustomItemFormSet = modelformset_factory(
+            Item, formset=CustomFormSet, fields=('name', ))
+        myhook = Hook()
+        myhook.register(CustomItemFormSet)
+        formsets = myhook(data=management_data('hook0', 0))
+        self.assertEqual(formsets.save()[0][1], "custom")
+
+        myhook = Hook()
+        myhook.register(ItemModelFormSet)
+        data = management_data('hook0', 1)
+        data.update({'hook0-0-name': "foo", 'hook0-0-quantity': "1"})
+        formsets = myhook(data=data, queryset=Item.objects.none())
+        self.assertTrue(formsets.is_valid())
+        self.assertEqual(len(formsets.save(commit=True)[0][1]), 1)
+        self.assertEqual(Item.objects.count(), 1)
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import threading
+from unittest import skipIf
+
+try:
+    from unittest import mock
+except ImportError:  # Python 2
+    import mock
+
+from django.test import TestCase
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:  # Python 2 without the futures backport
+    ThreadPoolExecutor = None
+
+from hooks.graph import Graph, requires
+from hooks.output import OutputPolicy
+from hooks.signalhook import Hook as SignalHook
+from hooks.templatehook import Hook as TemplateHook
+
+
+class GraphTest(TestCase):
+
+    def setUp(self):
+        self.graph = Graph()
+
+    def test_requires(self):
+        @requires('foo', 'bar')
+        def func():
+            pass
+
+        self.assertEqual(func.requires, ('foo', 'bar'))
+
+    def test_plan(self):
+        @requires('bar')
+        def foo():
+            pass
+
+        def bar():
+            pass
+
+        @requires('foo', 'baz')
+        def callback():
+            pass
+
+        self.graph.provide('foo', foo)
+        self.graph.provide('bar', bar)
+        self.graph.provide('baz', bar)
+        plan = self.graph.plan((callback, ))
+        self.assertEqual(
+            plan, ((('bar', bar), ('baz', bar)), (('foo', foo), )))
+        self.assertIs(self.graph.plan((callback, )), plan)
+        self.assertEqual(self.graph.plan((bar, )), ())
+
+    def test_plan_cleared(self):
+        @requires('foo')
+        def callback():
+            pass
+
+        self.graph.provide('foo', lambda: 1)
+        plan = self.graph.plan((callback, ))
+        self.graph.provide('foo', lambda: 2)
+        self.assertIsNot(self.graph.plan((callback, )), plan)
+
+    def test_plan_missing(self):
+        @requires('foo')
+        def callback():
+            pass
+
+        with self.assertRaises(ValueError):
+            self.graph.plan((callback, ))
+
+    def test_plan_cycle(self):
+        self.graph.provide('foo', requires('bar')(lambda: None))
+        self.graph.provide('bar', requires('foo')(lambda: None))
+
+        with self.assertRaises(ValueError):
+            self.graph.plan((requires('foo')(lambda: None), ))
+
+    def test_resolve(self):
+        self.graph.provide('foo', lambda x, **kwargs: x + kwargs['y'])
+        self.graph.provide(
+            'bar', requires('foo')(lambda x, **kwargs: kwargs['foo'] * 2))
+        callback = requires('bar')(lambda: None)
+        values = self.graph.resolve(
+            self.graph.plan((callback, )), (1, ), {'y': 2})
+        self.assertDictEqual(values, {'foo': 3, 'bar': 6})
+
+    @skipIf(ThreadPoolExecutor is None, "concurrent.futures is not installed")
+    def test_pool(self):
+        threads = set()
+
+        def provider(**kwargs):
+            threads.add(threading.current_thread())
+            return 1
+
+        self.graph.provide('foo', provider)
+        self.graph.provide('bar', provider)
+        callback = requires('foo', 'bar')(lambda: None)
+
+        with ThreadPoolExecutor(2) as pool:
+            self.graph.set_pool(pool)
+
+            with mock.patch('hooks.graph.close_old_connections') as close:
+                values = self.graph.resolve(
+                    self.graph.plan((callback, )), (), {})
+
+        self.assertDictEqual(values, {'foo': 1, 'bar': 1})
+        self.assertNotIn(threading.current_thread(), threads)
+        self.assertEqual(close.call_count, 4)
+
+    @skipIf(ThreadPoolExecutor is None, "concurrent.futures is not installed")
+    def test_pool_map(self):
+        threads = set()
+
+        def func(value):
+            threads.add(threading.current_thread())
+            return value
+
+        with ThreadPoolExecutor(2) as pool:
+            self.graph.set_pool(pool)
+            self.assertListEqual(
+                self.graph.map([(func, (1, ), {}), (func, (2, ), {})]), [1, 2])
+
+        self.assertSetEqual(threads, {threading.current_thread()})
+
+
+class TemplateHookGraphTest(TestCase):
+
+    def setUp(self):
+        self.hook = TemplateHook()
+        self.calls = []
+
+    def profile(self, context, **kwargs):
+        self.calls.append('profile')
+        return context['user']
+
+    def test_provide(self):
+        self.hook.provide('profile', self.profile)
+        self.hook.register(
+            'foo', requires('profile')(lambda context, **kwargs: kwargs['profile']))
+        self.hook.register(
+            'foo', requires('profile')(lambda context, **kwargs: kwargs['profile'] * 2))
+        self.hook.register('foo', lambda context, **kwargs: sorted(kwargs))
+        self.hook.register(
+            'foo.*', requires('profile')(lambda context, **kwargs: '<p>'))
+
+        self.assertListEqual(
+            self.hook('foo', {'user': 'a'}), ['a', 'aa', []])
+        self.assertListEqual(self.calls, ['profile'])
+        self.assertEqual(
+            self.hook.render('foo.bar', {'user': 'a'}), '&lt;p&gt;')
+        self.assertEqual(self.hook.render('bar', {'user': 'a'}), '')
+        self.assertEqual(self.hook.first('foo', {'user': 'a'}), 'a')
+        self.assertListEqual(self.calls, ['profile'] * 3)
+
+    def test_not_required(self):
+        self.hook.provide('profile', self.profile)
+        self.hook.register('foo', lambda context: 'foo')
+        self.assertListEqual(self.hook('foo', {}), ['foo'])
+        self.assertListEqual(self.calls, [])
+
+    def test_unprovide(self):
+        self.hook.provide('profile', self.profile)
+        self.hook.provide('other', self.profile)
+        self.hook.unprovide('profile')
+        self.assertListEqual(list(self.hook.graph.providers), ['other'])
+        self.hook.register(
+            'foo', requires('profile')(lambda context, **kwargs: None))
+
+        with self.assertRaises(ValueError):
+            self.hook('foo', {})
+
+    def test_registry_change(self):
+        self.hook.provide('profile', self.profile)
+        self.hook.register('foo', lambda context, **kwargs: 'foo')
+        self.assertListEqual(self.hook('foo', {'user': 'a'}), ['foo'])
+        self.assertListEqual(self.calls, [])
+        self.hook.register(
+            'foo', requires('profile')(lambda context, **kwargs: kwargs['profile']))
+        self.assertListEqual(self.hook('foo', {'user': 'a'}), ['foo', 'a'])
+        self.assertListEqual(self.calls, ['profile'])
+
+    def test_output_policy(self):
+        self.hook.provide('profile', self.profile)
+        self.hook.register(
+            'foo', requires('profile')(lambda context, **kwargs: kwargs['profile']))
+        policy = OutputPolicy(callback_max_size=2)
+        self.assertEqual(policy.render(self.hook, 'foo', {'user': 'abc'}), 'ab')
+
+    @skipIf(ThreadPoolExecutor is None, "concurrent.futures is not installed")
+    def test_pool(self):
+        self.hook.provide('profile', self.profile)
+        self.hook.register(
+            'foo', requires('profile')(lambda context, **kwargs: kwargs['profile']))
+        self.hook.register('foo', lambda context, **kwargs: 'bar')
+
+        with ThreadPoolExecutor(2) as pool:
+            self.hook.set_pool(pool)
+            self.assertListEqual(self.hook('foo', {'user': 'a'}), ['a', 'bar'])
+
+        self.assertListEqual(self.calls, ['profile'])
+
+
+class SignalHookGraphTest(TestCase):
+
+    def setUp(self):
+        self.hook = SignalHook()
+        self.calls = []
+
+    def total(self, sender, **kwargs):
+        self.calls.append('total')
+        return kwargs['price'] * 2
+
+    def test_provide(self):
+        self.hook.provide('total', self.total)
+
+        @requires('total')
+        def receiver(sender, total, **kwargs):
+            return total
+
+        def other(sender, **kwargs):
+            return 'total' in kwargs
+
+        self.hook.connect('foo', receiver)
+        self.hook.connect('foo.*', receiver)
+        self.hook.connect('foo', other)
+        self.assertListEqual(
+            self.hook.send('foo', price=2), [(receiver, 4), (other, False)])
+        self.assertListEqual(
+            self.hook.send('foo.bar', price=2), [(receiver, 4)])
+        self.assertEqual(self.hook.send_first('foo', price=3), 6)
+        self.assertListEqual(self.calls, ['total'] * 3)
+        self.assertListEqual(self.hook.send('bar', price=2), [])
+
+    def test_send_robust(self):
+        self.hook.provide('total', self.total)
+
+        @requires('total')
+        def receiver(sender, total, **kwargs):
+            return total
+
+        @requires('total')
+        def failing(sender, total, **kwargs):
+            raise ValueError(total)
+
+        self.hook.connect('foo', receiver)
+        self.hook.connect('foo', failing)
+        responses = self.hook.send_robust('foo', price=2)
+        self.assertEqual(responses[0], (receiver, 4))
+        self.assertIs(responses[1][0], failing)
+        self.assertIsInstance(responses[1][1], ValueError)
+        self.assertListEqual(self.calls, ['total'])
+        self.assertEqual(
+            sum(stats.calls for stats in self.hook.stats('foo')), 2)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.utils.six import StringIO
+
+from hooks import formhook
+from hooks import signalhook
+from hooks import templatehook
+from hooks import viewmixin
+from hooks import introspection
+from hooks.profiling import profiler
+from hooks.queries import query_counter
+
+
+def func(*args, **kwargs):
+    pass
+
+
+def func_b(*args, **kwargs):
+    raise ValueError("foo")
+
+
+class FormMock(object):
+    """"""
+
+
+class ViewHookMock(viewmixin.HookBase):
+    """"""
+
+
+class IntrospectionTest(TestCase):
+
+    def setUp(self):
+        signalhook.hook._registry.clear()
+        templatehook.hook._registry.clear()
+
+    def tearDown(self):
+        signalhook.hook._registry.clear()
+        templatehook.hook._registry.clear()
+
+    def test_describe_callback(self):
+        self.assertDictEqual(
+            introspection.describe_callback(func, 1),
+            {'name': "hooks.tests.tests_introspection.func",
+             'module': "hooks.tests.tests_introspection",
+             'priority': 1,
+             'stats': None,
+             'profile': None,
+             'queries': None})
+
+    def test_describe_callback_profile(self):
+        profiler.set_rate(1)
+        self.addCleanup(profiler.clear)
+        self.addCleanup(profiler.set_rate, 0)
+        templatehook.hook.register("foo-hook", func)
+        templatehook.hook("foo-hook")
+        templatehook.hook("foo-hook")
+        callback = introspection.describe_callback(func, 0, "foo-hook")
+        self.assertEqual(callback['profile']['calls'], 2)
+        self.assertTrue(callback['profile']['cumtime'] >= 0)
+        self.assertIsNone(
+            introspection.describe_callback(func, 0, "bar-hook")['profile'])
+
+    def test_describe_callback_queries(self):
+        query_counter.enable()
+        self.addCleanup(query_counter.reset)
+        self.addCleanup(query_counter.disable)
+        templatehook.hook.register("foo-hook", func)
+        templatehook.hook("foo-hook")
+        callback = introspection.describe_callback(func, 0, "foo-hook")
+        self.assertEqual(callback['queries']['calls'], 1)
+        self.assertEqual(callback['queries']['queries'], 0)
+
+    def test_signal_hooks(self):
+        signalhook.hook.connect("foo-hook", func)
+        signalhook.hook.connect("foo-hook", func_b)
+        signalhook.hook.send_robust("foo-hook")
+        hooks = introspection.signal_hooks()
+        self.assertEqual(len(hooks), 1)
+        self.assertEqual(hooks[0]['type'], "signal")
+        self.assertEqual(hooks[0]['name'], "foo-hook")
+        callbacks = hooks[0]['callbacks']
+        self.assertListEqual(
+            [(c['name'], c['priority']) for c in callbacks],
+            [("hooks.tests.tests_introspection.func", 0),
+             ("hooks.tests.tests_introspection.func_b", 1)])
+        self.assertEqual(callbacks[1]['stats']['calls'], 1)
+        self.assertEqual(callbacks[1]['stats']['errors'], 1)
+
+    def test_template_hooks(self):
+        templatehook.hook.register("foo-hook", func)
+        self.assertListEqual(
+            introspection.template_hooks(),
+            [{'type': "template",
+              'name': "foo-hook",
+              'callbacks': [introspection.describe_callback(func, 0)]}])
+
+    def test_form_hooks(self):
+        myhook = formhook.Hook(name="foo-hook")
+        myhook.register(FormMock)
+        hooks = [
+            h for h in introspection.form_hooks()
+            if h['name'] == "foo-hook"]
+        self.assertListEqual(
+            hooks,
+            [{'type': "form",
+              'name': "foo-hook",
+              'callbacks': [introspection.describe_callback(FormMock, 0)]}])
+
+    def test_view_hooks(self):
+        myhook = viewmixin.Hook()
+        myhook.register(ViewHookMock)
+        self.assertIn(
+            {'type': "view",
+             'name': None,
+             'callbacks': [introspection.describe_callback(ViewHookMock, 0)]},
+            introspection.view_hooks())
+
+
+class HooksCommandTest(TestCase):
+
+    def setUp(self):
+        signalhook.hook._registry.clear()
+        templatehook.hook._registry.clear()
+
+    def tearDown(self):
+        signalhook.hook._registry.clear()
+        templatehook.hook._registry.clear()
+
+    def test_text(self):
+        signalhook.hook.connect("foo-signal", func)
+        signalhook.hook.send_robust("foo-signal")
+        templatehook.hook.register("foo-template", func)
+        out = StringIO()
+        call_command('hooks', stdout=out)
+        self.assertIn(
+            "signal foo-signal\n"
+            "  0. hooks.tests.tests_introspection.func (calls=1, errors=0",
+            out.getvalue())
+        self.assertIn(
+            "template foo-template\n"
+            "  0. hooks.tests.tests_introspection.func\n",
+            out.getvalue())
+
+    def test_json(self):
+        templatehook.hook.register("foo-template", func)
+        out = StringIO()
+        call_command('hooks', format='json', type='template', stdout=out)
+        self.assertListEqual(
+            json.loads(out.getvalue()),
+            introspection.template_hooks())
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import sys
+import unittest
+
+try:
+    import jinja2
+except ImportError:
+    jinja2 = None
+
+from django.test import TestCase
+from django.utils.html import mark_safe
+
+from hooks.templatehook import hook
+
+if jinja2 is not None:
+    from markupsafe import Markup
+
+    from hooks.jinja2ext import HooksExtension
+
+
+@unittest.skipIf(jinja2 is None, "Requires Jinja2")
+class HooksExtensionTest(TestCase):
+
+    def setUp(self):
+        hook._registry.clear()
+        self.env = jinja2.Environment(
+            autoescape=True, extensions=[HooksExtension])
+
+    def tearDown(self):
+        hook._registry.clear()
+
+    def test_hook(self):
+        def func(context, *args, **kwargs):
+            self.assertEqual(context['foo'], "foo")
+            self.assertEqual(args, ("bar", ))
+            self.assertEqual(kwargs, {'baz': "baz", })
+            return "<b>bad</b>"
+
+        def func_safe(context, *args, **kwargs):
+            return mark_safe("<b>good</b>")
+
+        hook.register("myhook", func)
+        hook.register("myhook", func_safe)
+        out = self.env.from_string(
+            "{{ hook('myhook', 'bar', baz='baz') }}").render(foo="foo")
+        self.assertEqual(out, "&lt;b&gt;bad&lt;/b&gt;\n<b>good</b>")
+
+    def test_hook_markup(self):
+        hook.register("myhook", lambda context: Markup("<b>good</b>"))
+        out = self.env.from_string("{{ hook('myhook') }}").render()
+        self.assertEqual(out, "<b>good</b>")
+
+    def test_hook_empty(self):
+        out = self.env.from_string("{{ hook('myhook') }}").render()
+        self.assertEqual(out, "")
+
+    @unittest.skipIf(sys.version_info < (3, 6), "Requires Python 3.6")
+    def test_hook_async(self):
+        import asyncio
+
+        from .utils_async import func_async
+
+        env = jinja2.Environment(
+            autoescape=True, enable_async=True, extensions=[HooksExtension])
+        hook.register("myhook", func_async)
+        hook.register("myhook", lambda context: mark_safe("<b>good</b>"))
+        template = env.from_string("{{ hook('myhook') }}")
+        loop = asyncio.new_event_loop()
+
+        try:
+            out = loop.run_until_complete(template.render_async())
+        finally:
+            loop.close()
+
+        self.assertEqual(out, "&lt;b&gt;bad&lt;/b&gt;\n<b>good</b>")
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+try:
+    from unittest import mock
+except ImportError:  # Python 2
+    import mock
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.template import Template, Context
+from django.utils.html import mark_safe
+from django.utils.safestring import SafeData
+
+from hooks.output import OutputPolicy, get_policy, TRUNCATE, DROP, _truncate
+from hooks.templatehook import Hook
+
+
+class OutputPolicyTest(TestCase):
+
+    def setUp(self):
+        self.hook = Hook()
+
+    def test_active(self):
+        self.assertFalse(OutputPolicy().active)
+        self.assertTrue(OutputPolicy(callback_max_size=10).active)
+        self.assertTrue(OutputPolicy(max_size=0).active)
+        self.assertTrue(OutputPolicy(minify=True).active)
+
+    def test_render(self):
+        """
+        Should be the same as Hook.render
+        """
+        self.hook.register("my.hook", lambda: "<b>foo</b>")
+        self.hook.register("my.hook", lambda: mark_safe("<b>bar</b>"))
+        self.hook.register("my.*", lambda: "baz")
+        out = OutputPolicy().render(self.hook, "my.hook")
+        self.assertEqual(out, self.hook.render("my.hook"))
+        self.assertEqual(out, "&lt;b&gt;foo&lt;/b&gt;\n<b>bar</b>\nbaz")
+        self.assertIsInstance(out, SafeData)
+        self.assertEqual(OutputPolicy().render(self.hook, "badhook"), "")
+
+    def test_render_safe(self):
+        """
+        Should not escape safe responses
+        """
+        safe = mark_safe("<b>foo</b>")
+        self.hook.register("myhook", lambda: safe)
+
+        with mock.patch('hooks.output.conditional_escape') as escape:
+            out = OutputPolicy(max_size=100).render(self.hook, "myhook")
+
+        self.assertEqual(out, "<b>foo</b>")
+        self.assertFalse(escape.called)
+
+    def test_callback_max_size(self):
+        self.hook.register("myhook", lambda: "a" * 10)
+        self.hook.register("myhook", lambda: "b" * 3)
+
+        with mock.patch('hooks.output.logger') as logger:
+            out = OutputPolicy(callback_max_size=5).render(self.hook, "myhook")
+
+        self.assertEqual(out, "aaaaa\nbbb")
+        self.assertEqual(logger.warning.call_count, 1)
+
+        with mock.patch('hooks.output.logger'):
+            out = OutputPolicy(
+                callback_max_size=5, oversize=DROP).render(self.hook, "myhook")
+
+        self.assertEqual(out, "bbb")
+
+    def test_max_size(self):
+        self.hook.register("myhook", lambda: "a" * 3)
+        self.hook.register("myhook", lambda: "b" * 3)
+        self.hook.register("myhook", lambda: "c" * 3)
+        self.hook.register("myhook", lambda: "d")
+
+        self.assertEqual(
+            OutputPolicy(max_size=15).render(self.hook, "myhook"),
+            "aaa\nbbb\nccc\nd")
+
+        with mock.patch('hooks.output.logger') as logger:
+            out = OutputPolicy(max_size=9).render(self.hook, "myhook")
+
+        self.assertEqual(out, "aaa\nbbb\nc")
+        self.assertEqual(logger.warning.call_count, 1)
+
+        with mock.patch('hooks.output.logger') as logger:
+            out = OutputPolicy(max_size=9, oversize=DROP).render(self.hook, "myhook")
+
+        self.assertEqual(out, "aaa\nbbb\nd")
+        self.assertEqual(logger.warning.call_count, 1)
+
+    def test_truncate(self):
+        self.assertEqual(_truncate("<b>foo</b>", 5), "<b>fo")
+        self.assertEqual(_truncate("<b>foo</b>", 7), "<b>foo")
+        self.assertEqual(_truncate("a &amp; b", 5), "a ")
+        self.assertEqual(_truncate("a &amp; b", 7), "a &amp;")
+        self.hook.register("myhook", lambda: "<b>foo</b>")
+
+        with mock.patch('hooks.output.logger'):
+            out = OutputPolicy(callback_max_size=3).render(self.hook, "myhook")
+
+        self.assertEqual(out, "")
+
+        with mock.patch('hooks.output.logger'):
+            out = OutputPolicy(callback_max_size=4).render(self.hook, "myhook")
+
+        self.assertEqual(out, "&lt;")
+
+    def test_minify(self):
+        self.hook.register(
+            "myhook", lambda: mark_safe("\n  <ul>\n    <li>foo</li>\n  </ul>\n"))
+        out = OutputPolicy(minify=True).render(self.hook, "myhook")
+        self.assertEqual(out, "<ul><li>foo</li></ul>")
+        self.assertIsInstance(out, SafeData)
+
+    def test_get_policy(self):
+        policy = get_policy()
+        self.assertFalse(policy.active)
+        self.assertIs(get_policy(), policy)
+
+        with override_settings(HOOKS_MAX_SIZE=10, HOOKS_OVERSIZE=DROP, HOOKS_MINIFY=True):
+            policy = get_policy()
+            self.assertIsNone(policy.callback_max_size)
+            self.assertEqual(policy.max_size, 10)
+            self.assertEqual(policy.oversize, DROP)
+            self.assertTrue(policy.minify)
+
+        self.assertFalse(get_policy().active)
+        self.assertEqual(get_policy().oversize, TRUNCATE)
+
+
+class HookTagOutputTest(TestCase):
+
+    def setUp(self):
+        from hooks.templatehook import hook
+        self.hook = hook
+        self.hook.unregister_all("myhook")
+
+    def tearDown(self):
+        self.hook.unregister_all("myhook")
+
+    @override_settings(HOOKS_CALLBACK_MAX_SIZE=5)
+    def test_hook_tag(self):
+        self.hook.register("myhook", lambda context: "a" * 10)
+
+        with mock.patch('hooks.output.logger'):
+            out = Template(
+                "{% load hooks_tags %}"
+                "{% hook 'myhook' %}"
+            ).render(Context())
+
+        self.assertEqual(out, "aaaaa")
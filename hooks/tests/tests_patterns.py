@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.test import TestCase
+
+from hooks import patterns
+from hooks.patterns import is_pattern, PatternIndex
+
+
+class PatternIndexTest(TestCase):
+
+    def test_is_pattern(self):
+        self.assertTrue(is_pattern("orders.*"))
+        self.assertTrue(is_pattern("orders.**"))
+        self.assertFalse(is_pattern("orders.paid"))
+
+    def test_match(self):
+        index = PatternIndex()
+        index.add("orders.*", "one")
+        index.add("orders.**", "deep")
+        index.add("*.paid", "paid")
+        index.add("orders.paid.*", "nested")
+        self.assertEqual(index.match("orders.paid"), ("one", "deep", "paid"))
+        self.assertEqual(index.match("orders.paid.late"), ("deep", "nested"))
+        self.assertEqual(index.match("orders"), ())
+        self.assertEqual(index.match("users.paid"), ("paid", ))
+        self.assertEqual(index.match("users"), ())
+        self.assertEqual(len(index), 4)
+
+    def test_match_cache(self):
+        index = PatternIndex()
+        self.assertEqual(index.match("orders.paid"), ())
+        index.add("orders.*", "one")
+        self.assertEqual(index.match("orders.paid"), ("one", ))
+        self.assertEqual(index._cache, {"orders.paid": ("one", )})
+
+        # cache is cleared
+        index.add("orders.**", "deep")
+        self.assertEqual(index._cache, {})
+        self.assertEqual(index.match("orders.paid"), ("one", "deep"))
+        index.remove("orders.*")
+        self.assertEqual(index.match("orders.paid"), ("deep", ))
+        self.assertEqual(len(index), 1)
+
+        # removing twice should do nothing
+        index.remove("orders.*")
+        index.remove("foo.bar")
+        self.assertEqual(len(index), 1)
+
+    def test_match_cache_size(self):
+        index = PatternIndex()
+        index.add("orders.*", "one")
+
+        for i in range(patterns.MAX_MATCHES):
+            index.match("orders.%d" % i)
+
+        self.assertEqual(len(index._cache), patterns.MAX_MATCHES)
+        self.assertEqual(index.match("orders.foo"), ("one", ))
+        self.assertEqual(index._cache, {"orders.foo": ("one", )})
+
+    def test_replace(self):
+        index = PatternIndex()
+        index.add("orders.*", "one")
+        index.add("orders.*", "two")
+        self.assertEqual(index.match("orders.paid"), ("two", ))
+        self.assertEqual(len(index), 1)
+
+    def test_match_pattern(self):
+        index = PatternIndex()
+        index.add("orders.*", "one")
+        self.assertEqual(index.match("orders.*"), ())
+
+    def test_invalid(self):
+        index = PatternIndex()
+        self.assertRaises(AssertionError, index.add, "orders.**.paid", "foo")
+        self.assertRaises(AssertionError, index.add, "orders.pa*", "foo")
+        self.assertRaises(AssertionError, index.add, "orders..*", "foo")
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase
+from django import forms
+
+from hooks.profiling import Profiler, profiler, ANONYMOUS
+from hooks.templatehook import TemplateHook
+from hooks.signalhook import Hook as SignalHook
+from hooks.formhook import Hook as FormHook
+
+
+def slow_callback(*args, **kwargs):
+    return sum(range(1000))
+
+
+class ProfilerTest(TestCase):
+
+    def test_sample(self):
+        myprofiler = Profiler()
+        self.assertEqual(myprofiler.rate, 0)
+        self.assertFalse(any(myprofiler.sample() for _ in range(10)))
+
+        myprofiler.set_rate(3)
+        self.assertListEqual(
+            [myprofiler.sample() for _ in range(6)],
+            [False, False, True, False, False, True])
+
+        myprofiler.set_rate(1)
+        self.assertTrue(all(myprofiler.sample() for _ in range(10)))
+
+    def test_runcall(self):
+        myprofiler = Profiler()
+        res = myprofiler.runcall("myhook", slow_callback, "foo", bar="bar")
+        self.assertEqual(res, sum(range(1000)))
+        self.assertListEqual(myprofiler.names(), ["myhook"])
+        stats = myprofiler.stats("myhook")
+        self.assertTrue(any(
+            func[2] == 'slow_callback' for func in stats.stats))
+        self.assertIsNone(myprofiler.stats("badhook"))
+
+        # Aggregated
+        myprofiler.runcall("myhook", slow_callback)
+        func = [f for f in stats.stats if f[2] == 'slow_callback'][0]
+        self.assertEqual(stats.stats[func][1], 2)
+
+        myprofiler.runcall(None, slow_callback)
+        self.assertListEqual(myprofiler.names(), [ANONYMOUS, "myhook"])
+
+        myprofiler.clear()
+        self.assertListEqual(myprofiler.names(), [])
+
+    def test_runcall_nested(self):
+        """
+        Should profile nested calls as part of the outer one
+        """
+        myprofiler = Profiler()
+
+        def func():
+            return myprofiler.runcall("inner", slow_callback)
+
+        myprofiler.runcall("outer", func)
+        self.assertListEqual(myprofiler.names(), ["outer"])
+
+    def test_runcall_error(self):
+        myprofiler = Profiler()
+
+        def func():
+            raise ValueError
+
+        self.assertRaises(ValueError, myprofiler.runcall, "myhook", func)
+        self.assertListEqual(myprofiler.names(), ["myhook"])
+
+    def test_collapsed(self):
+        myprofiler = Profiler()
+
+        def func():
+            return slow_callback()
+
+        for _ in range(10):
+            myprofiler.runcall("myhook", func)
+            myprofiler.runcall("otherhook", slow_callback)
+
+        lines = myprofiler.collapsed().splitlines()
+        self.assertTrue(lines)
+
+        for line in lines:
+            stack, elapsed = line.rsplit(' ', 1)
+            self.assertTrue(int(elapsed) > 0)
+            self.assertIn(stack.split(';')[0], ("myhook", "otherhook"))
+            self.assertNotIn('disable', stack)
+
+        self.assertTrue(any(
+            line.startswith("myhook;tests_profiling.py:func:")
+            for line in lines))
+        self.assertTrue(any(
+            ";tests_profiling.py:slow_callback:" in line and
+            line.startswith("myhook;tests_profiling.py:func:")
+            for line in lines))
+
+        lines = myprofiler.collapsed("otherhook").splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(all(line.startswith("otherhook;") for line in lines))
+        self.assertEqual(myprofiler.collapsed("badhook"), "")
+
+    def test_dump(self):
+        myprofiler = Profiler()
+        myprofiler.runcall("myhook", slow_callback)
+        tmp_dir = tempfile.mkdtemp()
+
+        try:
+            path = os.path.join(tmp_dir, 'hooks.folded')
+            myprofiler.dump(path)
+
+            with open(path) as fh:
+                self.assertEqual(fh.read(), myprofiler.collapsed())
+        finally:
+            shutil.rmtree(tmp_dir)
+
+
+class ProfiledHooksTest(TestCase):
+
+    def setUp(self):
+        profiler.clear()
+        profiler.set_rate(1)
+
+    def tearDown(self):
+        profiler.set_rate(0)
+        profiler.clear()
+
+    def test_template_hook(self):
+        myhook = TemplateHook(name="myhook")
+        myhook.register(lambda: "<b>foo</b>")
+        myhook.register(slow_callback)
+        self.assertListEqual(myhook(), ["<b>foo</b>", sum(range(1000))])
+        self.assertEqual(
+            myhook.render(), "&lt;b&gt;foo&lt;/b&gt;\n%d" % sum(range(1000)))
+        self.assertListEqual(profiler.names(), ["myhook"])
+
+    def test_template_hook_sampled(self):
+        profiler.set_rate(1000000)
+        myhook = TemplateHook(name="myhook")
+        myhook.register(slow_callback)
+        myhook.render()
+        self.assertListEqual(profiler.names(), [])
+
+    def test_signal_hook(self):
+        myhook = SignalHook()
+
+        def func(signal, sender, **kwargs):
+            return slow_callback()
+
+        myhook.connect("mysignal", func)
+        responses = myhook.send("mysignal", foo="foo")
+        self.assertEqual(responses, [(func, sum(range(1000)))])
+        self.assertListEqual(profiler.names(), ["mysignal"])
+
+    def test_form_hook(self):
+        class MyForm(forms.Form):
+            def save(self, *args, **kwargs):
+                return slow_callback()
+
+        myhook = FormHook(name="myform")
+        myhook.register(MyForm)
+        factory = myhook()
+        self.assertEqual(factory.save()[0][1], sum(range(1000)))
+        self.assertListEqual(profiler.names(), ["myform"])
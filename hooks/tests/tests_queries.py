@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+try:
+    from unittest import mock
+except ImportError:  # Python 2
+    import mock
+
+from django.test import TestCase, RequestFactory
+from django.db import connection
+from django.http import HttpResponse
+from django import forms
+
+from hooks.queries import QueryCounter, QueryStats, query_counter
+from hooks.queries import _count_logged
+from hooks.middleware import QueryCountMiddleware
+from hooks.templatehook import TemplateHook
+from hooks.signalhook import Hook as SignalHook
+from hooks.formhook import Hook as FormHook
+
+
+def query(*args, **kwargs):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+    return "foo"
+
+
+def two_queries(*args, **kwargs):
+    query()
+    query()
+    return "bar"
+
+
+class QueryCounterTest(TestCase):
+
+    def test_count(self):
+        counter = QueryCounter()
+        self.assertFalse(counter.enabled)
+        self.assertDictEqual(counter.totals(), {})
+
+        with counter.count("myhook", two_queries) as stats:
+            two_queries()
+
+        self.assertEqual(stats.queries, 2)
+        self.assertTrue(stats.elapsed > 0)
+
+        with counter.count("myhook", two_queries):
+            query()
+
+        totals = counter.totals()
+        self.assertListEqual(
+            list(totals),
+            [("myhook", "hooks.tests.tests_queries.two_queries")])
+        stats = totals[("myhook", "hooks.tests.tests_queries.two_queries")]
+        self.assertEqual(stats.calls, 2)
+        self.assertEqual(stats.queries, 3)
+
+        counter.reset()
+        self.assertDictEqual(counter.totals(), {})
+
+    def test_count_nested(self):
+        counter = QueryCounter()
+
+        with counter.count("outer", query) as outer:
+            query()
+
+            with counter.count("inner", query) as inner:
+                query()
+
+        self.assertEqual(outer.queries, 2)
+        self.assertEqual(inner.queries, 1)
+        self.assertEqual(connection.execute_wrappers, [])
+
+    def test_count_error(self):
+        counter = QueryCounter()
+
+        def func():
+            with counter.count("myhook", query):
+                query()
+                raise ValueError
+
+        self.assertRaises(ValueError, func)
+        self.assertEqual(
+            counter.totals()[("myhook", "hooks.tests.tests_queries.query")].queries, 1)
+        self.assertEqual(connection.execute_wrappers, [])
+
+    def test_count_logged(self):
+        """
+        Should count the queries\
+        through the log on Django < 2.0
+        """
+        stats = QueryStats()
+
+        with _count_logged(stats, [connection]):
+            two_queries()
+
+        self.assertEqual(stats.queries, 2)
+        self.assertFalse(connection.force_debug_cursor)
+
+    def test_budget(self):
+        counter = QueryCounter()
+        counter.enable(budget=1)
+        self.assertTrue(counter.enabled)
+
+        with mock.patch('hooks.queries.logger') as logger:
+            with counter.count("myhook", two_queries):
+                two_queries()
+
+            with counter.count("myhook", query):
+                query()
+
+        logger.warning.assert_called_once_with(
+            "Hook %s callback %s ran %d queries, the budget is %d",
+            "myhook", "hooks.tests.tests_queries.two_queries", 2, 1)
+
+        counter.disable()
+        self.assertFalse(counter.enabled)
+
+    def test_stats(self):
+        stats = QueryStats()
+        other = QueryStats()
+        other.calls = 1
+        other.queries = 2
+        other.elapsed = 0.5
+        stats.add(other)
+        stats.add(other)
+        self.assertEqual(
+            repr(stats), "<QueryStats calls=2 queries=4 elapsed=1.000000>")
+
+
+class CountedHooksTest(TestCase):
+
+    def setUp(self):
+        query_counter.enable()
+        query_counter.reset()
+
+    def tearDown(self):
+        query_counter.disable()
+        query_counter.budget = None
+        query_counter.reset()
+
+    def test_template_hook(self):
+        myhook = TemplateHook(name="myhook")
+        myhook.register(query)
+        myhook.register(two_queries)
+        self.assertEqual(myhook.render(), "foo\nbar")
+        self.assertListEqual(myhook(), ["foo", "bar"])
+
+        totals = query_counter.totals()
+        self.assertEqual(
+            totals[("myhook", "hooks.tests.tests_queries.query")].queries, 2)
+        self.assertEqual(
+            totals[("myhook", "hooks.tests.tests_queries.two_queries")].queries, 4)
+
+    def test_signal_hook(self):
+        myhook = SignalHook()
+        myhook.connect("mysignal", two_queries)
+        myhook.send("mysignal")
+        self.assertEqual(
+            query_counter.totals()[
+                ("mysignal", "hooks.tests.tests_queries.two_queries")].queries, 2)
+
+    def test_signal_hook_send_robust(self):
+        myhook = SignalHook()
+        myhook.connect("mysignal", two_queries)
+        myhook.send_robust("mysignal")
+        self.assertEqual(
+            query_counter.totals()[
+                ("mysignal", "hooks.tests.tests_queries.two_queries")].queries, 2)
+
+    def test_form_hook(self):
+        class MyForm(forms.Form):
+            def save(self, *args, **kwargs):
+                return two_queries()
+
+        myhook = FormHook(name="myform")
+        myhook.register(MyForm)
+        myhook().save()
+        key, = [
+            key for key in query_counter.totals()
+            if key[1].endswith("MyForm")]
+        self.assertEqual(key[0], "myform")
+        self.assertEqual(query_counter.totals()[key].queries, 2)
+
+    def test_middleware(self):
+        myhook = TemplateHook(name="myhook")
+        myhook.register(query)
+        myhook.render()
+
+        def view(request):
+            myhook.render()
+            return HttpResponse()
+
+        request = RequestFactory().get('/')
+        middleware = QueryCountMiddleware()
+        self.assertIsNone(middleware.process_request(request))
+        self.assertDictEqual(request.hook_queries, {})
+        response = view(request)
+
+        with mock.patch('hooks.middleware.logger') as logger:
+            self.assertIs(middleware.process_response(request, response), response)
+
+        stats = request.hook_queries[("myhook", "hooks.tests.tests_queries.query")]
+        self.assertEqual(stats.queries, 1)
+        self.assertEqual(logger.debug.call_count, 1)
+        self.assertEqual(logger.debug.call_args[0][3], 1)
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+try:
+    from unittest import mock
+except ImportError:  # Python 2
+    import mock
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from django import forms
+
+from hooks import reload
+from hooks.reload import Reloader, reloader, TEMPLATE, SIGNAL, FORM
+from hooks.middleware import ReloadMiddleware
+from hooks.signalhook import hook as signal_hook
+from hooks.templatehook import hook as template_hook
+from hooks.formhook import Hook as FormHook
+
+
+def head(context):
+    return 'head'
+
+
+def foot(context):
+    return 'foot'
+
+
+def receiver(sender, **kwargs):
+    return 'receiver'
+
+
+class MyForm(forms.Form):
+    pass
+
+
+myformhook = FormHook()
+
+HEAD = (TEMPLATE, 'reload.head', 'hooks.tests.tests_reload.head')
+FOOT = (TEMPLATE, 'reload.head', 'hooks.tests.tests_reload.foot')
+RECEIVER = (SIGNAL, 'reload.signal', 'hooks.tests.tests_reload.receiver')
+FORM_ = (FORM, 'hooks.tests.tests_reload.myformhook', 'hooks.tests.tests_reload.MyForm')
+
+registrations = [HEAD]
+
+
+def source():
+    return registrations
+
+
+class ReloaderTest(TestCase):
+
+    def setUp(self):
+        self.source = [HEAD]
+        self.reloader = Reloader(source=self.source)
+
+    def tearDown(self):
+        self.reloader.clear()
+        template_hook.unfreeze()
+
+    def test_reload(self):
+        self.assertTrue(self.reloader.reload())
+        self.assertListEqual(template_hook('reload.head', {}), ['head'])
+        self.assertFalse(self.reloader.reload())
+        self.assertListEqual(self.reloader.registrations, [HEAD])
+
+        self.source.append(FOOT)
+        self.assertTrue(self.reloader.reload())
+        self.assertListEqual(template_hook('reload.head', {}), ['head', 'foot'])
+
+        del self.source[0]
+        self.assertTrue(self.reloader.reload())
+        self.assertListEqual(template_hook('reload.head', {}), ['foot'])
+        self.assertListEqual(self.reloader.registrations, [FOOT])
+
+    def test_reload_keeps_code_registrations(self):
+        template_hook.register('reload.head', foot)
+        self.addCleanup(template_hook.unregister_all, 'reload.head')
+        self.reloader.reload()
+        self.assertListEqual(template_hook('reload.head', {}), ['foot', 'head'])
+        self.reloader.clear()
+        self.assertListEqual(template_hook('reload.head', {}), ['foot'])
+
+    def test_reload_keeps_equal_code_registrations(self):
+        template_hook.register('reload.head', head)
+        self.addCleanup(template_hook.unregister_all, 'reload.head')
+        self.reloader.reload()
+        self.assertListEqual(template_hook('reload.head', {}), ['head'])
+        self.reloader.clear()
+        self.assertListEqual(template_hook('reload.head', {}), ['head'])
+
+        # Registered in code after the swap
+        template_hook.unregister_all('reload.head')
+        self.reloader.reload()
+        template_hook.register('reload.head', head)
+        self.assertListEqual(template_hook('reload.head', {}), ['head'])
+        self.reloader.clear()
+        self.assertListEqual(template_hook('reload.head', {}), ['head'])
+
+    def test_reload_keeps_equal_code_registrations_signal(self):
+        signal_hook.connect('reload.signal', receiver, weak=False)
+        self.addCleanup(signal_hook.disconnect, 'reload.signal', receiver)
+        self.source[:] = [RECEIVER]
+        self.reloader.reload()
+        self.assertListEqual(
+            signal_hook.send('reload.signal'), [(receiver, 'receiver')])
+        self.reloader.clear()
+        self.assertListEqual(
+            signal_hook.send('reload.signal'), [(receiver, 'receiver')])
+
+        # Connected in code after the swap
+        self.source[:] = [RECEIVER]
+        signal_hook.disconnect('reload.signal', receiver)
+        self.reloader.reload()
+        signal_hook.connect('reload.signal', receiver, weak=False)
+        self.reloader.clear()
+        self.assertListEqual(
+            signal_hook.send('reload.signal'), [(receiver, 'receiver')])
+
+    def test_reload_keeps_equal_code_registrations_form(self):
+        myformhook.register(MyForm)
+        self.addCleanup(myformhook.unregister, MyForm)
+        self.source[:] = [FORM_]
+        self.reloader.reload()
+        self.assertListEqual(myformhook._registry, [MyForm])
+        self.reloader.clear()
+        self.assertListEqual(myformhook._registry, [MyForm])
+
+    def test_reload_swaps(self):
+        self.reloader.reload()
+        version = template_hook.version
+        callbacks = template_hook._registry['reload.head']._registry
+        self.source.append(FOOT)
+        self.reloader.reload()
+        self.assertListEqual(callbacks, [head])
+        self.assertIsNot(
+            template_hook._registry['reload.head']._registry, callbacks)
+        self.assertEqual(template_hook.version, version + 1)
+
+    def test_reload_frozen(self):
+        template_hook.freeze(strict=True)
+        self.reloader.reload()
+        self.assertTrue(template_hook.frozen)
+        self.assertListEqual(template_hook('reload.head', {}), ['head'])
+        self.assertIsInstance(
+            template_hook._registry['reload.head']._registry, tuple)
+
+    def test_reload_signal(self):
+        self.source[:] = [RECEIVER]
+        self.reloader.reload()
+        self.assertListEqual(
+            signal_hook.send('reload.signal'), [(receiver, 'receiver')])
+        self.source[:] = []
+        self.reloader.reload()
+        self.assertListEqual(signal_hook.send('reload.signal'), [])
+
+    def test_reload_form(self):
+        self.source[:] = [FORM_]
+        self.reloader.reload()
+        self.assertListEqual(myformhook._registry, [MyForm])
+        self.assertIsInstance(myformhook().instances[0], MyForm)
+        self.source[:] = []
+        self.reloader.reload()
+        self.assertListEqual(myformhook._registry, [])
+
+    def test_source_callable(self):
+        self.reloader.source = 'hooks.tests.tests_reload.source'
+        self.reloader.reload()
+        self.assertListEqual(self.reloader.registrations, [HEAD])
+
+    def test_source_invalid(self):
+        self.source[:] = [('foo', 'bar', 'baz')]
+
+        with self.assertRaises(AssertionError):
+            self.reloader.reload()
+
+    def test_poll(self):
+        self.assertTrue(self.reloader.poll())
+        self.source.append(FOOT)
+        self.assertFalse(self.reloader.poll())
+        self.reloader.interval = 0
+        self.assertTrue(self.reloader.poll())
+        self.reloader.interval = 60
+        self.source.remove(FOOT)
+        self.assertFalse(self.reloader.poll())
+
+    def test_poll_error(self):
+        self.source[:] = [(TEMPLATE, 'reload.head', 'hooks.tests.missing')]
+
+        with mock.patch.object(reload.logger, 'exception') as exception:
+            self.assertFalse(self.reloader.poll())
+
+        self.assertTrue(exception.called)
+        self.assertListEqual(self.reloader.registrations, [])
+
+    def test_settings(self):
+        with override_settings(HOOKS_REGISTRATIONS=[HEAD]):
+            self.assertListEqual(reloader.registrations, [HEAD])
+            self.assertListEqual(template_hook('reload.head', {}), ['head'])
+
+        self.assertListEqual(reloader.registrations, [])
+        self.assertListEqual(template_hook('reload.head', {}), [])
+
+    def test_middleware(self):
+        with mock.patch.object(reload.reloader, 'poll') as poll:
+            ReloadMiddleware().process_request(mock.Mock())
+
+        self.assertTrue(poll.called)
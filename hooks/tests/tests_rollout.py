@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+try:
+    from unittest import mock
+except ImportError:  # Python 2
+    import mock
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from hooks import rollout
+from hooks.rollout import Rule
+from hooks.middleware import RolloutMiddleware
+from hooks.signalhook import Hook as SignalHook
+from hooks.templatehook import Hook as TemplateHook
+
+
+def make_user(pk, groups=()):
+    user = mock.Mock(pk=pk, is_authenticated=True)
+    user.groups.values_list.return_value = list(groups)
+    return user
+
+
+def user_in_bucket(low, high):
+    for pk in range(1000):
+        if low <= rollout._hash('user:%s' % pk) < high:
+            return make_user(pk)
+
+
+class RolloutTest(TestCase):
+
+    def tearDown(self):
+        rollout.deactivate()
+
+    def test_hash(self):
+        self.assertEqual(rollout._hash('foo'), rollout._hash('foo'))
+        self.assertTrue(0 <= rollout._hash('foo') < 100)
+
+    def test_activate(self):
+        rollout.activate(make_user(1))
+        self.assertEqual(rollout.bucket(), rollout._hash('user:1'))
+        rollout.activate(mock.Mock(is_authenticated=False), session_key='abc')
+        self.assertEqual(rollout.bucket(), rollout._hash('session:abc'))
+        rollout.activate(None)
+        self.assertIsNone(rollout.bucket())
+        rollout.activate(make_user(1))
+        rollout.deactivate()
+        self.assertIsNone(rollout.bucket())
+
+    def test_activate_callable(self):
+        user = mock.Mock(pk=1)
+        user.is_authenticated.return_value = True
+        rollout.activate(user)
+        self.assertEqual(rollout.bucket(), rollout._hash('user:1'))
+
+    def test_percent(self):
+        rollout.activate(user_in_bucket(0, 10))
+        self.assertTrue(Rule(percent=10).allows())
+        self.assertTrue(Rule(percent=100).allows())
+        self.assertFalse(Rule(percent=0).allows())
+        rollout.activate(user_in_bucket(50, 100))
+        self.assertFalse(Rule(percent=10).allows())
+        rollout.deactivate()
+        self.assertFalse(Rule(percent=100).allows())
+
+    def test_salt(self):
+        rule = Rule(percent=10, salt='foo')
+        self.assertEqual(rule.offset, rollout._hash('foo'))
+        low = (100 - rule.offset) % 100
+        rollout.activate(user_in_bucket(low, low + 10))
+        self.assertTrue(rule.allows())
+
+    def test_groups(self):
+        user = make_user(1, groups=['beta'])
+        rollout.activate(user)
+        self.assertTrue(Rule(groups=['beta']).allows())
+        self.assertTrue(Rule(percent=0, groups=['beta']).allows())
+        self.assertFalse(Rule(groups=['staff']).allows())
+        self.assertEqual(user.groups.values_list.call_count, 1)
+        rollout.activate(None)
+        self.assertFalse(Rule(groups=['beta']).allows())
+
+    def test_flag(self):
+        with override_settings(HOOKS_FLAGS=['new_menu']):
+            self.assertTrue(Rule(flag='new_menu').allows())
+            self.assertFalse(Rule(flag='foo').allows())
+
+        self.assertFalse(Rule(flag='new_menu').allows())
+
+    def test_rollout(self):
+        @rollout.rollout(percent=0)
+        def func():
+            pass
+
+        self.assertTrue(rollout.has_rules([len, func]))
+        self.assertFalse(rollout.has_rules([len]))
+        self.assertIsInstance(func.rollout, Rule)
+        self.assertFalse(rollout.allowed(func))
+        self.assertTrue(rollout.allowed(lambda: None))
+        self.assertListEqual(rollout.select([func, len]), [len])
+
+    def test_middleware(self):
+        request = mock.Mock(user=make_user(1))
+        middleware = RolloutMiddleware()
+        middleware.process_request(request)
+        self.assertEqual(request.hook_bucket, rollout._hash('user:1'))
+        self.assertEqual(rollout.bucket(), request.hook_bucket)
+        self.assertEqual(middleware.process_response(request, 'foo'), 'foo')
+        self.assertIsNone(rollout.bucket())
+
+
+class HookRolloutTest(TestCase):
+
+    def setUp(self):
+        rollout.activate(make_user(1, groups=['beta']))
+
+    def tearDown(self):
+        rollout.deactivate()
+
+    def test_template_hook(self):
+        hook = TemplateHook()
+        hook.register('foo', lambda: 'foo')
+        hook.register('foo', rollout.rollout(groups=['beta'])(lambda: 'beta'))
+        hook.register('foo', rollout.rollout(groups=['staff'])(lambda: 'staff'))
+        self.assertListEqual(hook('foo'), ['foo', 'beta'])
+        self.assertEqual(hook.render('foo'), 'foo\nbeta')
+        self.assertListEqual(list(hook._registry['foo'].iter_call()), ['foo', 'beta'])
+        self.assertTrue(hook.fragment_key('foo').endswith(':+:-'))
+        rollout.deactivate()
+        self.assertListEqual(hook('foo'), ['foo'])
+        self.assertTrue(hook.fragment_key('foo').endswith(':-:-'))
+
+    def test_template_hook_pattern(self):
+        """
+        Should not add a separator for hooks with no selected callbacks
+        """
+        hook = TemplateHook()
+        hook.register('a.b', lambda: 'y')
+        hook.register('a.*', rollout.rollout(groups=['staff'])(lambda: 'staff'))
+        self.assertEqual(hook.render('a.b'), 'y')
+        hook.register('a.**', lambda: 'z')
+        self.assertEqual(hook.render('a.b'), 'y\nz')
+
+    def test_signal_hook(self):
+        def receiver(**kwargs):
+            return 'receiver'
+
+        @rollout.rollout(groups=['staff'])
+        def staff(**kwargs):
+            return 'staff'
+
+        hook = SignalHook()
+        hook.connect('foo', receiver)
+        hook.connect('foo', staff)
+        self.assertListEqual(hook.send('foo'), [(receiver, 'receiver')])
+        self.assertEqual(hook.send_first('foo'), 'receiver')
+        self.assertListEqual(hook.send_robust('foo'), [(receiver, 'receiver')])
+
+    def test_gated(self):
+        gated = rollout.rollout(groups=['staff'])(lambda *args, **kwargs: 'staff')
+
+        def receiver(**kwargs):
+            return 'receiver'
+
+        template_hook = TemplateHook()
+        template_hook.register('foo', lambda: 'foo')
+        template_hook.register('bar', gated)
+        self.assertFalse(template_hook._registry['foo'].gated)
+        self.assertTrue(template_hook._registry['bar'].gated)
+
+        with mock.patch.object(rollout, 'select') as select:
+            self.assertListEqual(template_hook('foo'), ['foo'])
+
+        self.assertFalse(select.called)
+        template_hook.unregister('bar', gated)
+        self.assertFalse(template_hook._registry['bar'].gated)
+        template_hook.swap('bar', add=[gated])
+        self.assertTrue(template_hook._registry['bar'].gated)
+
+        signal_hook = SignalHook()
+        signal_hook.connect('foo', receiver)
+        signal_hook.connect('bar', gated)
+        self.assertFalse(signal_hook._registry['foo'].gated)
+        self.assertTrue(signal_hook._registry['bar'].gated)
+        signal_hook.disconnect('bar', gated)
+        self.assertFalse(signal_hook._registry['bar'].gated)
+        signal_hook.swap('bar', add=[gated])
+        self.assertTrue(signal_hook._registry['bar'].gated)
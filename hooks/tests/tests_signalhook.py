@@ -2,19 +2,30 @@
 
 from __future__ import unicode_literals
 
+import gc
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
 from django.test import TestCase
 
 from django.dispatch import Signal
-from hooks.signalhook import hook
+from django.dispatch.dispatcher import _make_id
+from hooks import signalhook
+from hooks.signalhook import hook, ReceiverStats
+from hooks.patterns import PatternIndex
 
 
 class MockSignal:
     def __init__(self, providing_args=None):
         self.providing_args = providing_args
 
-    def connect(self, func, sender=None, dispatch_uid=None):
+    def connect(self, func, sender=None, weak=True, dispatch_uid=None):
         self.func = func
         self.sender = sender
+        self.weak = weak
         self.dispatch_uid = dispatch_uid
 
     def disconnect(self, func, dispatch_uid=None):
@@ -48,6 +59,10 @@ class SignalHookTest(TestCase):
         hook.connect("foo-hook", func, sender=FakeHook, dispatch_uid="foo")
         self.assertEqual([mocksignal.func, mocksignal.sender, mocksignal.dispatch_uid],
                          [func, FakeHook, "foo"])
+        self.assertTrue(mocksignal.weak)
+
+        hook.connect("foo-hook", func, weak=False)
+        self.assertFalse(mocksignal.weak)
 
     def test_disconnect(self):
         def func():
@@ -94,3 +109,201 @@ class SignalHookTest(TestCase):
         self.assertEqual(self._extra_b, "foobar")
         self.assertEqual(self._extra_c, "foobar")
         self.assertEqual(self._extra_d, "foobar")
+
+
+class SignalHookStrongTest(TestCase):
+
+    def tearDown(self):
+        hook._registry.clear()
+
+    def test_connect_lambda(self):
+        """
+        Strong receivers are not garbage collected
+        """
+        hook.connect("foo-hook", lambda **kwargs: "foo", weak=False)
+        hook.connect("foo-hook", lambda **kwargs: "bar")
+        gc.collect()
+        self.assertListEqual(
+            [response for _, response in hook.send("foo-hook")],
+            ["foo"])
+
+    def test_send_cache(self):
+        def func_a(**kwargs):
+            return "a"
+
+        def func_b(**kwargs):
+            return "b"
+
+        hook.connect("foo-hook", func_a, weak=False)
+        hook.connect("foo-hook", func_b, sender=FakeHook, weak=False)
+        signal = hook._registry["foo-hook"]
+        self.assertListEqual(hook.send("foo-hook"), [(func_a, "a")])
+        self.assertListEqual(
+            hook.send("foo-hook", sender=FakeHook),
+            [(func_a, "a"), (func_b, "b")])
+        self.assertEqual(len(signal._dispatch_cache), 2)
+
+        with mock.patch.object(signal, '_live_receivers') as live_receivers:
+            hook.send("foo-hook", sender=FakeHook)
+            self.assertFalse(live_receivers.called)
+
+        # cache is cleared on connect/disconnect
+        hook.disconnect("foo-hook", func_a)
+        self.assertDictEqual(signal._dispatch_cache, {})
+        self.assertListEqual(
+            hook.send("foo-hook", sender=FakeHook), [(func_b, "b")])
+        hook.connect("foo-hook", func_a, weak=False)
+        self.assertDictEqual(signal._dispatch_cache, {})
+
+    def test_send_cache_instance_sender(self):
+        """
+        Instance senders are not cached
+        """
+        def func_a(**kwargs):
+            return "a"
+
+        hook.connect("foo-hook", func_a, weak=False)
+        signal = hook._registry["foo-hook"]
+        self.assertListEqual(
+            hook.send("foo-hook", sender=FakeHook()), [(func_a, "a")])
+        self.assertDictEqual(signal._dispatch_cache, {})
+
+    def test_send_weak(self):
+        """
+        Weak receivers are resolved on every send
+        """
+        def func_a(**kwargs):
+            return "a"
+
+        def func_b(**kwargs):
+            return "b"
+
+        hook.connect("foo-hook", func_a, weak=False)
+        hook.connect("foo-hook", func_b)
+        self.assertListEqual(
+            hook.send("foo-hook"), [(func_a, "a"), (func_b, "b")])
+        signal = hook._registry["foo-hook"]
+        self.assertIsNone(signal._dispatch_cache[_make_id(None)])
+
+
+class SignalHookRobustTest(TestCase):
+
+    def tearDown(self):
+        hook._registry.clear()
+
+    def test_send_robust(self):
+        """
+        Should call every receiver even if one fails
+        """
+        def func_a(**kwargs):
+            raise ValueError("foo")
+
+        def func_b(**kwargs):
+            return "b"
+
+        hook.connect("foo-hook", func_a)
+        hook.connect("foo-hook", func_b)
+        responses = hook.send_robust("foo-hook", extra="foobar")
+        self.assertEqual(len(responses), 2)
+        self.assertIsInstance(responses[0][1], ValueError)
+        self.assertEqual(responses[1], (func_b, "b"))
+
+        # send is unaffected
+        self.assertRaises(ValueError, hook.send, "foo-hook")
+
+    def test_send_robust_no_hook(self):
+        self.assertListEqual(hook.send_robust("bar-hook"), [])
+
+    def test_send_robust_fail_fast(self):
+        def func_a(**kwargs):
+            raise ValueError("foo")
+
+        def func_b(**kwargs):
+            self._called_b = True
+
+        self._called_b = False
+        hook.set_policy("foo-hook", signalhook.FAIL_FAST)
+        hook.connect("foo-hook", func_a)
+        hook.connect("foo-hook", func_b)
+        self.assertRaises(ValueError, hook.send_robust, "foo-hook")
+        self.assertFalse(self._called_b)
+
+    def test_send_robust_disable(self):
+        def func(**kwargs):
+            raise ValueError("foo")
+
+        hook.connect("foo-hook", func)
+        hook.set_policy("foo-hook", signalhook.DISABLE, max_failures=2)
+        self.assertEqual(len(hook.send_robust("foo-hook")), 1)
+        self.assertEqual(len(hook.send_robust("foo-hook")), 1)
+        self.assertListEqual(hook.send_robust("foo-hook"), [])
+
+        stats = hook.stats("foo-hook")[0]
+        self.assertEqual(stats.calls, 2)
+        self.assertEqual(stats.errors, 2)
+        self.assertTrue(stats.disabled)
+
+    def test_set_policy_invalid(self):
+        self.assertRaises(AssertionError, hook.set_policy, "foo-hook", "foo")
+        self.assertRaises(AssertionError, hook.set_policy, "foo-hook", signalhook.DISABLE)
+
+    def test_stats(self):
+        def func(**kwargs):
+            pass
+
+        hook.connect("foo-hook", func)
+        hook.send_robust("foo-hook")
+        hook.send_robust("foo-hook")
+        stats = hook.stats("foo-hook")
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0].calls, 2)
+        self.assertEqual(stats[0].errors, 0)
+        self.assertEqual(sum(stats[0].histogram), 2)
+        self.assertTrue(stats[0].name.endswith("func"))
+
+        # disconnecting drops the stats
+        hook.disconnect("foo-hook", func)
+        self.assertListEqual(hook.stats("foo-hook"), [])
+        self.assertListEqual(hook.stats("bar-hook"), [])
+
+    def test_receiver_stats_record(self):
+        stats = ReceiverStats("foo")
+        stats.record(0)
+        stats.record(60, failed=True)
+        self.assertEqual(stats.calls, 2)
+        self.assertEqual(stats.errors, 1)
+        self.assertEqual(stats.histogram[0], 1)
+        self.assertEqual(stats.histogram[-1], 1)
+
+
+class SignalHookPatternTest(TestCase):
+
+    def tearDown(self):
+        hook._registry.clear()
+        hook._patterns = PatternIndex()
+
+    def test_send(self):
+        def func_a(**kwargs):
+            return "a"
+
+        def func_b(**kwargs):
+            return "b"
+
+        def func_c(**kwargs):
+            return "c"
+
+        hook.connect("orders.paid", func_a)
+        hook.connect("orders.*", func_b)
+        hook.connect("orders.**", func_c)
+        self.assertListEqual(
+            hook.send("orders.paid"),
+            [(func_a, "a"), (func_b, "b"), (func_c, "c")])
+        self.assertListEqual(hook.send("orders.new"), [(func_b, "b"), (func_c, "c")])
+        self.assertListEqual(hook.send("orders.new.late"), [(func_c, "c")])
+        self.assertListEqual(hook.send("users.new"), [])
+        self.assertListEqual(
+            hook.send_robust("orders.paid"),
+            [(func_a, "a"), (func_b, "b"), (func_c, "c")])
+
+        hook.disconnect("orders.*", func_b)
+        self.assertListEqual(hook.send("orders.new"), [(func_c, "c")])
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.test import TestCase
+
+from hooks import tracing
+from hooks.strategies import (
+    Done, first, any_response, all_responses, reduce_responses)
+from hooks.signalhook import Hook as SignalHook
+from hooks.templatehook import Hook as TemplateHook
+
+
+class StrategiesTest(TestCase):
+
+    def setUp(self):
+        self.consumed = []
+
+    def responses(self, values):
+        for value in values:
+            self.consumed.append(value)
+            yield value
+
+    def test_first(self):
+        self.assertEqual(first(self.responses([None, 0, 1])), 0)
+        self.assertListEqual(self.consumed, [None, 0])
+        self.assertIsNone(first(self.responses([None, None])))
+        self.assertIsNone(first(iter(())))
+
+    def test_any_response(self):
+        self.assertTrue(any_response(self.responses([0, 1, 2])))
+        self.assertListEqual(self.consumed, [0, 1])
+        self.assertFalse(any_response(self.responses([0, None])))
+        self.assertFalse(any_response(iter(())))
+
+    def test_all_responses(self):
+        self.assertFalse(all_responses(self.responses([1, 0, 2])))
+        self.assertListEqual(self.consumed, [1, 0])
+        self.assertTrue(all_responses(self.responses([1, 2])))
+        self.assertTrue(all_responses(iter(())))
+
+    def test_reduce_responses(self):
+        self.assertEqual(
+            reduce_responses(lambda a, b: a + b, self.responses([1, 2, 3]), 10), 16)
+
+        def total(acc, response):
+            acc += response
+            return Done(acc) if acc >= 3 else acc
+
+        self.consumed = []
+        self.assertEqual(reduce_responses(total, self.responses([1, 2, 3]), 0), 3)
+        self.assertListEqual(self.consumed, [1, 2])
+        self.assertEqual(reduce_responses(total, iter(()), 0), 0)
+
+
+class SignalHookStrategiesTest(TestCase):
+
+    def setUp(self):
+        self.hook = SignalHook()
+        self.called = []
+
+    def receiver(self, value):
+        def func(signal, sender, **kwargs):
+            self.called.append(value)
+            return value
+
+        return func
+
+    def test_send_first(self):
+        self.hook.connect("foo.bar", self.receiver(None), weak=False)
+        self.hook.connect("foo.bar", self.receiver("a"), weak=False)
+        self.hook.connect("foo.*", self.receiver("b"), weak=False)
+        self.assertEqual(self.hook.send_first("foo.bar"), "a")
+        self.assertListEqual(self.called, [None, "a"])
+        self.assertIsNone(self.hook.send_first("bad"))
+
+    def test_send_first_pattern(self):
+        self.hook.connect("foo.bar", self.receiver(None), weak=False)
+        self.hook.connect("foo.*", self.receiver("b"), weak=False)
+        self.assertEqual(self.hook.send_first("foo.bar"), "b")
+
+    def test_send_any_all(self):
+        self.hook.connect("foo", self.receiver(False), weak=False)
+        self.hook.connect("foo", self.receiver(True), weak=False)
+        self.hook.connect("foo", self.receiver(False), weak=False)
+        self.assertTrue(self.hook.send_any("foo"))
+        self.assertListEqual(self.called, [False, True])
+
+        self.called = []
+        self.assertFalse(self.hook.send_all("foo"))
+        self.assertListEqual(self.called, [False])
+        self.assertTrue(self.hook.send_all("bad"))
+        self.assertFalse(self.hook.send_any("bad"))
+
+    def test_send_reduce(self):
+        self.hook.connect("foo", self.receiver(1), weak=False)
+        self.hook.connect("foo", self.receiver(2), weak=False)
+        self.assertEqual(
+            self.hook.send_reduce("foo", lambda a, b: a + [b], []), [1, 2])
+        self.called = []
+        self.assertEqual(
+            self.hook.send_reduce("foo", lambda a, b: Done(b), None), 1)
+        self.assertListEqual(self.called, [1])
+
+    def test_send_kwargs(self):
+        def func(signal, sender, **kwargs):
+            return (sender, kwargs)
+
+        self.hook.connect("foo", func, weak=False)
+        self.assertEqual(
+            self.hook.send_first("foo", sender="me", bar="bar"),
+            ("me", {'bar': "bar"}))
+
+    def test_traced(self):
+        tracer = tracing.InMemoryTracer()
+        tracing.set_tracer(tracer)
+
+        try:
+            self.hook.connect("foo", self.receiver(1), weak=False)
+            self.hook.connect("foo", self.receiver(2), weak=False)
+            self.assertEqual(self.hook.send_first("foo"), 1)
+        finally:
+            tracing.set_tracer(None)
+
+        callback, dispatch = tracer.spans
+        self.assertEqual(dispatch.name, tracing.SIGNAL)
+        self.assertIs(callback.parent, dispatch)
+
+
+class TemplateHookStrategiesTest(TestCase):
+
+    def setUp(self):
+        self.hook = TemplateHook()
+        self.called = []
+
+    def callback(self, value):
+        def func(*args, **kwargs):
+            self.called.append(value)
+            return value
+
+        return func
+
+    def test_first(self):
+        self.hook.register("foo", self.callback(None))
+        self.hook.register("foo", self.callback("a"))
+        self.hook.register("foo", self.callback("b"))
+        self.assertEqual(self.hook.first("foo", "context"), "a")
+        self.assertListEqual(self.called, [None, "a"])
+        self.assertIsNone(self.hook.first("bad"))
+
+    def test_any_all(self):
+        self.hook.register("foo.bar", self.callback(""))
+        self.hook.register("foo.*", self.callback("a"))
+        self.assertTrue(self.hook.any("foo.bar"))
+        self.called = []
+        self.assertFalse(self.hook.all("foo.bar"))
+        self.assertListEqual(self.called, [""])
+
+    def test_reduce(self):
+        self.hook.register("foo", self.callback(1))
+        self.hook.register("foo", self.callback(2))
+        self.assertEqual(self.hook.reduce("foo", lambda a, b: a + b, 0), 3)
+
+    def test_args(self):
+        def func(*args, **kwargs):
+            return (args, kwargs)
+
+        self.hook.register("foo", func)
+        self.assertEqual(
+            self.hook.first("foo", "context", bar="bar"),
+            (("context", ), {'bar': "bar"}))
+        self.assertEqual(
+            list(self.hook._registry["foo"].iter_call("context")),
+            [(("context", ), {})])
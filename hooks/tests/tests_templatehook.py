@@ -2,9 +2,22 @@
 
 from __future__ import unicode_literals
 
+import unittest
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
 from django.test import TestCase
 
-from hooks.templatehook import TemplateHook, hook
+from django.utils.html import mark_safe
+from django.utils.safestring import SafeData
+
+from hooks.templatehook import (
+    Hook, TemplateHook, hook, EMPTY_OUTPUT, fragment_key, StaticHooks, static_hooks)
+from hooks.patterns import PatternIndex
+from . import utils_hooks
 
 
 class TemplateHookTest(TestCase):
@@ -16,6 +29,32 @@ class TemplateHookTest(TestCase):
         myhook = TemplateHook(providing_args=["foo", "bar"])
         self.assertListEqual(myhook.providing_args, ["foo", "bar"])
 
+        # default is shared
+        self.assertIs(TemplateHook().providing_args, TemplateHook().providing_args)
+        self.assertFalse(hasattr(myhook, '__dict__'))
+
+    @unittest.skipIf(tracemalloc is None, "Requires tracemalloc")
+    def test_memory(self):
+        """
+        Should take less memory than a regular (__dict__) object
+        """
+        class DictTemplateHook(object):
+            def __init__(self):
+                self.providing_args = []
+                self.name = None
+                self._registry = []
+
+        def measure(factory):
+            tracemalloc.start()
+
+            try:
+                hooks = [factory() for _ in range(1000)]
+                return tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+
+        self.assertLess(measure(TemplateHook), measure(DictTemplateHook))
+
     def test_register(self):
         def func():
             pass
@@ -72,6 +111,86 @@ class TemplateHookTest(TestCase):
         self.assertEqual(self._args_b, ("foo", ))
         self.assertDictEqual(self._kwargs_b, {'extra': "bar", })
 
+    def test_render(self):
+        def func_a(*args, **kwargs):
+            self._args_a = args
+            self._kwargs_a = kwargs
+            return "<b>a</b>"
+
+        def func_b(*args, **kwargs):
+            return mark_safe("<b>b</b>")
+
+        myhook = TemplateHook()
+        self.assertIs(myhook.render(), EMPTY_OUTPUT)
+
+        myhook.register(func_a)
+        out = myhook.render("foo", extra="bar")
+        self.assertEqual(out, "&lt;b&gt;a&lt;/b&gt;")
+        self.assertIsInstance(out, SafeData)
+        self.assertEqual(self._args_a, ("foo", ))
+        self.assertDictEqual(self._kwargs_a, {'extra': "bar", })
+
+        myhook.register(func_b)
+        out = myhook.render()
+        self.assertEqual(out, "&lt;b&gt;a&lt;/b&gt;\n<b>b</b>")
+        self.assertIsInstance(out, SafeData)
+
+
+class StaticHooksTest(TestCase):
+
+    def setUp(self):
+        utils_hooks.myhook.unregister_all()
+
+    def tearDown(self):
+        utils_hooks.myhook.unregister_all()
+        static_hooks(utils_hooks).refresh()
+
+    def test_static_hooks(self):
+        hooks = static_hooks(utils_hooks)
+        self.assertIsInstance(hooks, StaticHooks)
+        self.assertIs(static_hooks(utils_hooks), hooks)
+        self.assertDictEqual(hooks.hooks, {'myhook': utils_hooks.myhook})
+        self.assertIs(hooks.get('myhook'), utils_hooks.myhook)
+        self.assertIsNone(hooks.get('badhook'))
+        self.assertIsNone(hooks.get('TemplateHook'))
+
+    def test_render(self):
+        def func(context, *args, **kwargs):
+            self.assertEqual(context, "context")
+            self.assertEqual(args, ("foo", ))
+            self.assertEqual(kwargs, {'extra': "bar", })
+            return "<b>hello</b>"
+
+        hooks = static_hooks(utils_hooks)
+        self.assertIs(hooks.render('myhook', "context"), EMPTY_OUTPUT)
+        self.assertIs(hooks.render('badhook', "context"), EMPTY_OUTPUT)
+        self.assertListEqual(hooks('badhook', "context"), [])
+
+        utils_hooks.myhook.register(func)
+        self.assertEqual(
+            hooks.render('myhook', "context", "foo", extra="bar"),
+            "&lt;b&gt;hello&lt;/b&gt;")
+        self.assertListEqual(
+            hooks('myhook', "context", "foo", extra="bar"),
+            ["<b>hello</b>"])
+
+    def test_refresh(self):
+        """
+        Should look up the module attributes once,\
+        until refreshed
+        """
+        hooks = static_hooks(utils_hooks)
+        self.assertIsNone(hooks.get('newhook'))
+        utils_hooks.newhook = TemplateHook()
+
+        try:
+            self.assertIsNone(hooks.get('newhook'))
+            hooks.refresh()
+            self.assertIs(hooks.get('newhook'), utils_hooks.newhook)
+        finally:
+            del utils_hooks.newhook
+            hooks.refresh()
+
 
 class HookTest(TestCase):
 
@@ -80,6 +199,7 @@ class HookTest(TestCase):
 
     def tearDown(self):
         hook._registry.clear()
+        hook._patterns = PatternIndex()
 
     def test_register(self):
         def func_a():
@@ -90,6 +210,7 @@ class HookTest(TestCase):
 
         hook.register("foo-hook", func_a)
         self.assertIsInstance(hook._registry["foo-hook"], TemplateHook)
+        self.assertEqual(hook._registry["foo-hook"].name, "foo-hook")
         self.assertListEqual(hook._registry["foo-hook"]._registry, [func_a, ])
 
         hook.register("foo-hook", func_b)
@@ -117,3 +238,105 @@ class HookTest(TestCase):
         self.assertEqual(response, "ok")
         self.assertEqual(self._args, ("foo", ))
         self.assertDictEqual(self._kwargs, {'extra': "bar", })
+
+    def test_call_pattern(self):
+        def func_a(*args, **kwargs):
+            return "a"
+
+        def func_b(*args, **kwargs):
+            return "b"
+
+        def func_c(*args, **kwargs):
+            return "c"
+
+        hook.register("sidebar.main", func_a)
+        hook.register("sidebar.*", func_b)
+        hook.register("sidebar.**", func_c)
+        self.assertListEqual(hook("sidebar.main"), ["a", "b", "c"])
+        self.assertListEqual(hook("sidebar.footer"), ["b", "c"])
+        self.assertListEqual(hook("sidebar.footer.left"), ["c"])
+        self.assertListEqual(hook("header"), [])
+
+        hook.unregister("sidebar.*", func_b)
+        self.assertListEqual(hook("sidebar.footer"), ["c"])
+
+    def test_render(self):
+        def func_a(*args, **kwargs):
+            return "a"
+
+        def func_b(*args, **kwargs):
+            return "b"
+
+        self.assertIs(hook.render("sidebar.main"), EMPTY_OUTPUT)
+
+        hook.register("sidebar.main", func_a)
+        self.assertEqual(hook.render("sidebar.main"), "a")
+
+        hook.register("sidebar.*", func_b)
+        hook._register("sidebar.**")
+        self.assertEqual(hook.render("sidebar.main"), "a\nb")
+        self.assertEqual(hook.render("sidebar.footer"), "b")
+        self.assertEqual(hook.render("sidebar.footer.left"), "")
+
+    def test_version(self):
+        def func():
+            pass
+
+        version = hook.version
+        hook.register("foo-hook", func)
+        self.assertEqual(hook.version, version + 1)
+        hook.unregister("foo-hook", func)
+        self.assertEqual(hook.version, version + 2)
+        hook.unregister_all("foo-hook")
+        self.assertEqual(hook.version, version + 3)
+
+        # unknown hooks do not change it
+        hook.unregister("bar-hook", func)
+        hook.unregister_all("bar-hook")
+        self.assertEqual(hook.version, version + 3)
+
+    def test_fragment_key(self):
+        @fragment_key(lambda context, *args, **kwargs: context['user'])
+        def func_a(context, *args, **kwargs):
+            pass
+
+        @fragment_key("static")
+        def func_b(context, *args, **kwargs):
+            pass
+
+        def func_c(context, *args, **kwargs):
+            pass
+
+        hook.register("sidebar.main", func_a)
+        hook.register("sidebar.main", func_c)
+        hook.register("sidebar.*", func_b)
+        self.assertEqual(
+            hook.fragment_key("sidebar.main", {'user': 1}),
+            "sidebar.main:%s:1:static" % hook._digest("sidebar.main"))
+        self.assertEqual(
+            hook.fragment_key("header", {'user': 1}),
+            "header:%s" % hook._digest("header"))
+
+    def test_fragment_key_digest(self):
+        """
+        Should be the same for the same callbacks in every process
+        """
+        def func_a(context, *args, **kwargs):
+            pass
+
+        def func_b(context, *args, **kwargs):
+            pass
+
+        other = Hook()
+        other.register("foo", func_b)
+        other.unregister("foo", func_b)
+        other.register("foo", func_a)
+        hook.register("foo", func_a)
+        self.assertNotEqual(hook.version, other.version)
+        self.assertEqual(hook.fragment_key("foo"), other.fragment_key("foo"))
+        key = hook.fragment_key("foo")
+
+        # Same number of registrations
+        hook.unregister("foo", func_a)
+        hook.register("foo", func_b)
+        self.assertNotEqual(hook.fragment_key("foo"), key)
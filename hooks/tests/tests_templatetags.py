@@ -3,11 +3,12 @@
 from __future__ import unicode_literals
 
 from django.test import TestCase
+from django.test.utils import override_settings
 from django.template import Template, Context
 from django.utils.html import mark_safe
 
-from hooks.templatehook import hook
-from hooks.templatetags.hooks_tags import template_hook_collect
+from hooks.templatehook import hook, fragment_key
+from hooks.templatetags.hooks_tags import template_hook_collect, static_hook_tag
 from . import utils_hooks
 
 
@@ -85,6 +86,51 @@ class HookTagTest(TestCase):
 
         self.assertEqual(out, "<span>hello</span>")
 
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_cached_hook_tag(self):
+        @fragment_key(lambda context, *args, **kwargs: context['user'])
+        def func(context, *args, **kwargs):
+            self._calls.append(True)
+            return "<b>%s</b>" % context['user']
+
+        def func_b(context, *args, **kwargs):
+            return mark_safe("<i>b</i>")
+
+        self._calls = []
+        hook.register(self.hook_name, func)
+        template = Template(
+            "{% load hooks_tags %}"
+            "{% cached_hook 60 hook_name %}")
+
+        def render(user):
+            return template.render(Context({"hook_name": self.hook_name, "user": user}))
+
+        self.assertEqual(render("foo"), "&lt;b&gt;foo&lt;/b&gt;")
+        self.assertEqual(render("foo"), "&lt;b&gt;foo&lt;/b&gt;")
+        self.assertEqual(len(self._calls), 1)
+
+        # vary on the callback key
+        self.assertEqual(render("bar"), "&lt;b&gt;bar&lt;/b&gt;")
+        self.assertEqual(len(self._calls), 2)
+
+        # registering a callback invalidates it
+        hook.register(self.hook_name, func_b)
+        self.assertEqual(render("foo"), "&lt;b&gt;foo&lt;/b&gt;\n<i>b</i>")
+        self.assertEqual(len(self._calls), 3)
+
+    def test_hook_fragment_key_tag(self):
+        @fragment_key("foo")
+        def func(context, *args, **kwargs):
+            return "hello"
+
+        hook.register(self.hook_name, func)
+        out = Template(
+            "{% load hooks_tags %}"
+            "{% hook_fragment_key hook_name %}"
+        ).render(Context({"hook_name": self.hook_name, }))
+        self.assertEqual(out, "myhook:%s:foo" % hook._digest(self.hook_name))
+
     def test_template_hook_collect(self):
         def func(context, *args, **kwargs):
             self.assertEqual(context, "context")
@@ -106,3 +152,24 @@ class HookTagTest(TestCase):
         utils_hooks.myhook.register(func)
         res = template_hook_collect(utils_hooks, 'myhook', "context", "foo", extra="bar")
         self.assertEqual(res, "&lt;span&gt;hello&lt;/span&gt;")
+
+    def test_static_hook_tag(self):
+        def func(context, *args, **kwargs):
+            self.assertEqual(context, "context")
+            self.assertEqual(args, ("foo", ))
+            self.assertEqual(kwargs, {'extra': "bar", })
+            return "<span>hello</span>"
+
+        @static_hook_tag(utils_hooks)
+        def my_hook_tag(context, name, *args, **kwargs):
+            return "missing %s" % name
+
+        self.assertEqual(my_hook_tag.__name__, "my_hook_tag")
+        self.assertEqual(my_hook_tag("context", 'myhook'), "")
+
+        utils_hooks.myhook.register(func)
+        res = my_hook_tag("context", 'myhook', "foo", extra="bar")
+        self.assertEqual(res, "&lt;span&gt;hello&lt;/span&gt;")
+
+        res = my_hook_tag("context", 'badhook')
+        self.assertEqual(res, "missing badhook")
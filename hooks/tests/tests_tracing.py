@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.test import TestCase
+from django import forms
+
+from hooks import tracing
+from hooks.tracing import Tracer, InMemoryTracer, OpenTelemetryTracer
+from hooks.templatehook import Hook as TemplateHook
+from hooks.signalhook import Hook as SignalHook
+from hooks.formhook import Hook as FormHook
+
+
+def callback(*args, **kwargs):
+    return "foo"
+
+
+class MockOpenTelemetryTracer(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def start_as_current_span(self, name, attributes=None):
+        self.calls.append((name, attributes))
+        return tracing.Tracer().span(name)
+
+
+class TracerTest(TestCase):
+
+    def tearDown(self):
+        tracing.set_tracer(None)
+
+    def test_default(self):
+        self.assertIsInstance(tracing.tracer, Tracer)
+        self.assertFalse(tracing.tracer.enabled)
+        self.assertFalse(tracing.tracer.callbacks)
+
+        with tracing.tracer.span("foo", {"bar": "bar"}) as span:
+            span.set_attribute("baz", "baz")
+
+    def test_set_tracer(self):
+        default = tracing.tracer
+        tracer = InMemoryTracer()
+        self.assertIs(tracing.set_tracer(tracer), default)
+        self.assertIs(tracing.tracer, tracer)
+        self.assertIs(tracing.set_tracer(None), tracer)
+        self.assertIsInstance(tracing.tracer, Tracer)
+        self.assertFalse(tracing.tracer.enabled)
+
+    def test_in_memory(self):
+        tracer = InMemoryTracer()
+
+        with tracer.span("outer", {"foo": "foo"}) as outer:
+            with tracer.span("inner") as inner:
+                inner.set_attribute("bar", "bar")
+
+        self.assertListEqual(tracer.spans, [inner, outer])
+        self.assertIs(inner.parent, outer)
+        self.assertIsNone(outer.parent)
+        self.assertDictEqual(outer.attributes, {"foo": "foo"})
+        self.assertDictEqual(inner.attributes, {"bar": "bar"})
+        self.assertTrue(outer.duration >= inner.duration >= 0)
+
+        tracer.clear()
+        self.assertListEqual(tracer.spans, [])
+
+    def test_in_memory_error(self):
+        tracer = InMemoryTracer()
+        err = ValueError()
+
+        def func():
+            with tracer.span("foo"):
+                raise err
+
+        self.assertRaises(ValueError, func)
+        self.assertIs(tracer.spans[0].error, err)
+
+    def test_open_telemetry(self):
+        otel_tracer = MockOpenTelemetryTracer()
+        tracer = OpenTelemetryTracer(otel_tracer)
+        self.assertTrue(tracer.enabled)
+        self.assertFalse(tracer.callbacks)
+
+        with tracer.span("foo", {"bar": "bar"}):
+            pass
+
+        self.assertListEqual(otel_tracer.calls, [("foo", {"bar": "bar"})])
+
+
+class TracedHooksTest(TestCase):
+
+    def setUp(self):
+        self.tracer = InMemoryTracer()
+        tracing.set_tracer(self.tracer)
+
+    def tearDown(self):
+        tracing.set_tracer(None)
+
+    def test_template_hook(self):
+        myhook = TemplateHook()
+        myhook.register("myhook", callback)
+        myhook.register("myhook", callback)
+        self.assertEqual(myhook.render("myhook"), "foo\nfoo")
+
+        callback_a, callback_b, dispatch = self.tracer.spans
+        self.assertEqual(dispatch.name, tracing.TEMPLATE)
+        self.assertDictEqual(dispatch.attributes, {
+            'hook.type': 'template',
+            'hook.name': "myhook",
+            'hook.result_size': 7})
+        self.assertEqual(callback_a.name, tracing.CALLBACK)
+        self.assertIs(callback_a.parent, dispatch)
+        self.assertDictEqual(callback_a.attributes, {
+            'hook.type': 'template',
+            'hook.name': "myhook",
+            'hook.callback': "hooks.tests.tests_tracing.callback",
+            'hook.result_size': 3})
+
+        self.tracer.clear()
+        self.assertListEqual(myhook("myhook"), ["foo", "foo"])
+        self.assertEqual(len(self.tracer.spans), 3)
+        self.assertEqual(self.tracer.spans[-1].attributes['hook.result_size'], 2)
+
+    def test_template_hook_no_callbacks(self):
+        self.tracer.callbacks = False
+        myhook = TemplateHook()
+        myhook.register("myhook", callback)
+        self.assertEqual(myhook.render("myhook"), "foo")
+        self.assertEqual(myhook.render("badhook"), "")
+        self.assertListEqual(
+            [span.attributes['hook.name'] for span in self.tracer.spans],
+            ["myhook", "badhook"])
+
+    def test_signal_hook(self):
+        myhook = SignalHook()
+        myhook.connect("mysignal", callback)
+        self.assertListEqual(
+            myhook.send("mysignal", foo="foo"), [(callback, "foo")])
+
+        receiver, dispatch = self.tracer.spans
+        self.assertEqual(dispatch.name, tracing.SIGNAL)
+        self.assertDictEqual(dispatch.attributes, {
+            'hook.type': 'signal',
+            'hook.name': "mysignal",
+            'hook.result_size': 1})
+        self.assertIs(receiver.parent, dispatch)
+        self.assertEqual(
+            receiver.attributes['hook.callback'],
+            "hooks.tests.tests_tracing.callback")
+
+    def test_signal_hook_send_robust(self):
+        myhook = SignalHook()
+        myhook.connect("mysignal", callback)
+        self.assertListEqual(
+            myhook.send_robust("mysignal"), [(callback, "foo")])
+
+        receiver, dispatch = self.tracer.spans
+        self.assertEqual(dispatch.name, tracing.SIGNAL)
+        self.assertEqual(dispatch.attributes['hook.result_size'], 1)
+        self.assertIs(receiver.parent, dispatch)
+
+    def test_form_hook(self):
+        class MyForm(forms.Form):
+            foo = forms.CharField()
+
+            def save(self, *args, **kwargs):
+                return "saved"
+
+        myhook = FormHook(name="myform")
+        myhook.register(MyForm)
+        factory = myhook(data={'hook0-foo': "foo"})
+        self.assertTrue(factory.is_valid())
+
+        form, dispatch = self.tracer.spans
+        self.assertEqual(dispatch.name, tracing.FORM_IS_VALID)
+        self.assertDictEqual(dispatch.attributes, {
+            'hook.type': 'form',
+            'hook.name': "myform",
+            'hook.result_size': 1})
+        self.assertIs(form.parent, dispatch)
+        self.assertTrue(form.attributes['hook.callback'].endswith("MyForm"))
+
+        self.tracer.clear()
+        self.assertEqual(factory.save()[0][1], "saved")
+        form, dispatch = self.tracer.spans
+        self.assertEqual(dispatch.name, tracing.FORM_SAVE)
+        self.assertIs(form.parent, dispatch)
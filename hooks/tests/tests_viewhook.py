@@ -60,6 +60,7 @@ class HookProxyTest(TestCase):
         proxy = HookProxy([hook_a, hook_b], "request", "foo", extra="bar")
         hook_a.assert_called_once_with("request", "foo", extra="bar")
         hook_b.assert_called_once_with("request", "foo", extra="bar")
+        self.assertFalse(hasattr(proxy, '__dict__'))
 
     def test_methods(self):
         test_proxy_method("dispatch")
@@ -116,6 +117,19 @@ class HookProxyTest(TestCase):
         proxy._hooks = [hook_a, hook_b]
         self.assertDictEqual(proxy.context, {"hook_a": "foo", "hook_b": "foo"})
 
+    def test_context_cache(self):
+        class MyHook(HookBase):
+            def get(self, *args, **kwargs):
+                self.context['foo'] = "bar"
+
+        proxy = HookProxy([MyHook, MyHook], "request")
+        context = proxy.context
+        self.assertDictEqual(context, {})
+        self.assertIs(proxy.context, context)
+        proxy.get()
+        self.assertDictEqual(proxy.context, {"foo": "bar"})
+        self.assertIsNot(proxy.context, context)
+
 
 class HookTest(TestCase):
 
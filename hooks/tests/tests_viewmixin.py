@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.test import TestCase, RequestFactory
+from django import forms
+from django.views.generic import FormView, View
+from django.http import HttpResponse
+from django.template import Template, Context
+
+from hooks.viewmixin import (
+    HookBase, HookProxy, Hook, HookViewMixin,
+    HookContext, LazyValue, MergedContext, merge_context)
+
+
+class GetHook(HookBase):
+    created = []
+
+    def get(self, *args, **kwargs):
+        self.created.append(self)
+        self.context['get_hook'] = "get"
+
+
+class PostHook(HookBase):
+    valid = True
+    saved = []
+
+    def post(self, *args, **kwargs):
+        self.context['post_hook'] = "post"
+
+    def is_valid(self):
+        return self.valid
+
+    def save(self, *args, **kwargs):
+        self.saved.append(self)
+
+
+class CommonHook(HookBase):
+
+    def dispatch(self, *args, **kwargs):
+        self.context['common_hook'] = kwargs
+
+
+class MethodsHook(HookBase):
+    http_method_names = ('post', )
+
+
+class HookTest(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_register(self):
+        class BadHook(object):
+            """"""
+
+        hook = Hook()
+        self.assertRaises(AssertionError, hook.register, BadHook)
+        hook.register(GetHook)
+        self.assertListEqual(hook._registry, [GetHook])
+        hook.unregister(GetHook)
+        self.assertListEqual(hook._registry, [])
+
+        # calling unregister again should do nothing
+        hook.unregister(GetHook)
+
+    def test_call(self):
+        """
+        Should only use the hooks for the HTTP method
+        """
+        hook = Hook()
+        hook.register(GetHook)
+        hook.register(PostHook)
+        hook.register(CommonHook)
+        hook.register(MethodsHook)
+        hook.register(HookBase)
+        self.assertTupleEqual(
+            hook(self.factory.get('/'))._registry, (GetHook, CommonHook))
+        self.assertTupleEqual(
+            hook(self.factory.head('/'))._registry, (GetHook, CommonHook))
+        self.assertTupleEqual(
+            hook(self.factory.post('/'))._registry,
+            (PostHook, CommonHook, MethodsHook))
+        self.assertTupleEqual(
+            hook(self.factory.put('/'))._registry,
+            (PostHook, CommonHook, MethodsHook))
+        self.assertTupleEqual(
+            hook(self.factory.delete('/'))._registry, (CommonHook, ))
+        self.assertListEqual(sorted(hook._plans), ['delete', 'get', 'post'])
+
+        # plans are cleared
+        hook.unregister(GetHook)
+        self.assertDictEqual(hook._plans, {})
+
+    def test_call_args(self):
+        hook = Hook()
+        hook.register(CommonHook)
+        request = self.factory.get('/')
+        proxy = hook(request, "foo", extra="bar")
+        instance = proxy._hooks[0]
+        self.assertEqual(instance.request, request)
+        self.assertEqual(instance.args, ("foo", ))
+        self.assertDictEqual(instance.kwargs, {'extra': "bar"})
+
+
+class HookProxyTest(TestCase):
+
+    def test_lazy(self):
+        del GetHook.created[:]
+        proxy = HookProxy((GetHook, ), "request")
+        self.assertIsNone(proxy._instances)
+        proxy.get()
+        self.assertEqual(len(GetHook.created), 1)
+        self.assertIs(proxy._hooks[0], GetHook.created[0])
+
+    def test_context(self):
+        proxy = HookProxy((GetHook, CommonHook), "request")
+        proxy.dispatch(foo="bar")
+        proxy.get()
+        context = proxy.context
+        self.assertDictEqual(
+            context, {'get_hook': "get", 'common_hook': {'foo': "bar"}})
+        self.assertIs(proxy.context, context)
+
+        # a hook context changed
+        proxy._hooks[0].context['get_hook'] = "changed"
+        self.assertIsNot(proxy.context, context)
+        self.assertEqual(proxy.context['get_hook'], "changed")
+
+        # in-place merge
+        proxy._hooks[0].context |= {'get_hook': "merged"}
+        self.assertEqual(proxy.context['get_hook'], "merged")
+
+    def test_is_valid(self):
+        self.assertTrue(HookProxy((), "request").is_valid())
+
+        class InvalidHook(PostHook):
+            valid = False
+            calls = []
+
+            def is_valid(self):
+                self.calls.append(self)
+                return super(InvalidHook, self).is_valid()
+
+        proxy = HookProxy((InvalidHook, PostHook, InvalidHook), "request")
+        self.assertFalse(proxy.is_valid())
+        self.assertEqual(len(InvalidHook.calls), 2)
+
+
+class HookContextTest(TestCase):
+
+    def test_version(self):
+        context = HookContext(foo="foo")
+        self.assertEqual(context.version, 0)
+        context['bar'] = "bar"
+        del context['bar']
+        context.update(bar="bar")
+        context.setdefault('baz', "baz")
+        context.pop('baz')
+        context.popitem()
+        context.clear()
+        self.assertEqual(context.version, 7)
+        self.assertDictEqual(context, {})
+        context |= {'foo': "foo"}
+        self.assertEqual(context.version, 8)
+        self.assertIsInstance(context, HookContext)
+        self.assertDictEqual(context, {'foo': "foo"})
+
+
+class MergeContextTest(TestCase):
+
+    def test_merge_context(self):
+        hook_a = HookBase("request")
+        hook_b = HookBase("request")
+        hook_a.context['a'] = "a"
+        hook_b.context['b'] = "b"
+        context, key = merge_context([hook_a, hook_b])
+        self.assertIsInstance(context, MergedContext)
+        self.assertDictEqual(context, {'a': "a", 'b': "b"})
+        self.assertEqual(
+            merge_context([hook_a, hook_b], context, key), (context, key))
+
+        # changes
+        hook_b.context['b'] = "c"
+        new_context, new_key = merge_context([hook_a, hook_b], context, key)
+        self.assertDictEqual(new_context, {'a': "a", 'b': "c"})
+        self.assertNotEqual(new_key, key)
+
+        hook_b.context = HookContext(b="d")
+        new_context, _ = merge_context([hook_a, hook_b], new_context, new_key)
+        self.assertDictEqual(new_context, {'a': "a", 'b': "d"})
+
+    def test_merge_context_dict(self):
+        """
+        Should not cache plain dict contexts
+        """
+        hook = HookBase("request")
+        hook.context = {'a': "a"}
+        context, key = merge_context([hook])
+        self.assertIsNone(key)
+        self.assertIsNot(merge_context([hook], context, key)[0], context)
+
+    def test_lazy_value(self):
+        calls = []
+
+        def func():
+            calls.append(True)
+            return "foo"
+
+        hook = HookBase("request")
+        hook.context['lazy'] = LazyValue(func)
+        hook.context['other'] = "bar"
+        context, _ = merge_context([hook])
+        self.assertListEqual(calls, [])
+        self.assertEqual(
+            Template("{{ context.other }}").render(Context({'context': context})),
+            "bar")
+        self.assertListEqual(calls, [])
+        self.assertEqual(
+            Template("{{ context.lazy }}{{ context.lazy }}").render(
+                Context({'context': context})),
+            "foofoo")
+        self.assertEqual(context.get('lazy'), "foo")
+        self.assertEqual(context.get('foo', "default"), "default")
+        self.assertListEqual(calls, [True])
+
+        # evaluated once even if the context changes
+        hook.context['other'] = "baz"
+        context, _ = merge_context([hook])
+        self.assertEqual(context['lazy'], "foo")
+        self.assertListEqual(calls, [True])
+
+    def test_lazy_value_items(self):
+        hook = HookBase("request")
+        hook.context['lazy'] = LazyValue(lambda: "foo")
+        hook.context['other'] = "bar"
+        context, _ = merge_context([hook])
+        self.assertIsInstance(dict(context)['lazy'], LazyValue)
+        self.assertListEqual(sorted(context.values()), ["bar", "foo"])
+        context, _ = merge_context([hook])
+        self.assertListEqual(
+            sorted(context.items()), [('lazy', "foo"), ('other', "bar")])
+        self.assertDictEqual(dict(context), {'lazy': "foo", 'other': "bar"})
+
+
+class MyForm(forms.Form):
+    name = forms.CharField()
+
+
+class MyView(HookViewMixin, FormView):
+    view_hook = Hook()
+    form_class = MyForm
+    template_name = 'foo.html'
+    success_url = '/'
+
+    def render_to_response(self, context, **response_kwargs):
+        self.rendered_context = context
+        return context
+
+
+class HookViewMixinTest(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        MyView.view_hook = Hook()
+        MyView.view_hook.register(GetHook)
+        MyView.view_hook.register(PostHook)
+        del PostHook.saved[:]
+
+    def test_get(self):
+        context = MyView.as_view()(self.factory.get('/'))
+        self.assertDictEqual(context['hooks'].context, {'get_hook': "get"})
+
+    def test_post(self):
+        response = MyView.as_view()(self.factory.post('/', {'name': "foo"}))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(PostHook.saved), 1)
+
+    def test_post_invalid_hook(self):
+        class InvalidHook(PostHook):
+            valid = False
+
+        MyView.view_hook.register(InvalidHook)
+        context = MyView.as_view()(self.factory.post('/', {'name': "foo"}))
+        self.assertDictEqual(context['hooks'].context, {'post_hook': "post"})
+        self.assertListEqual(PostHook.saved, [])
+
+    def test_put(self):
+        """
+        PUT is handled by post (ProcessFormView.put)
+        """
+        class OptionalForm(forms.Form):
+            name = forms.CharField(required=False)
+
+        class PutView(MyView):
+            form_class = OptionalForm
+
+        response = PutView.as_view()(self.factory.put('/'))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(PostHook.saved), 1)
+
+        class InvalidHook(PostHook):
+            valid = False
+
+        del PostHook.saved[:]
+        MyView.view_hook.register(InvalidHook)
+        context = PutView.as_view()(self.factory.put('/'))
+        self.assertDictEqual(context['hooks'].context, {'post_hook': "post"})
+        self.assertListEqual(PostHook.saved, [])
+
+    def test_method_not_allowed(self):
+        class PostView(HookViewMixin, View):
+            view_hook = MyView.view_hook
+
+            def post(self, request, *args, **kwargs):
+                return HttpResponse(self.hooks.context.get('post_hook'))
+
+        del GetHook.created[:]
+        response = PostView.as_view()(self.factory.get('/'))
+        self.assertEqual(response.status_code, 405)
+        self.assertListEqual(GetHook.created, [])
+        response = PostView.as_view()(self.factory.post('/'))
+        self.assertEqual(response.content, b"post")
+
+    def test_head(self):
+        del GetHook.created[:]
+        MyView.as_view()(self.factory.head('/'))
+        self.assertEqual(len(GetHook.created), 1)
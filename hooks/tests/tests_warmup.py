@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+try:
+    from unittest import mock
+except ImportError:  # Python 2
+    import mock
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.apps import apps
+from django import forms
+
+from hooks import warmup
+from hooks.utils import FrozenError, MappingProxyType, frozen_mapping
+from hooks.signalhook import hook as signal_hook, Hook as SignalHook
+from hooks.templatehook import hook as template_hook, Hook as TemplateHook
+from hooks.formhook import Hook as FormHook
+from hooks.viewmixin import Hook as ViewHook, HookBase
+
+
+def receiver(*args, **kwargs):
+    pass
+
+
+class MyForm(forms.Form):
+    pass
+
+
+class MyViewHook(HookBase):
+
+    def post(self):
+        pass
+
+
+class FreezeTest(TestCase):
+
+    def test_freeze(self):
+        myhook = TemplateHook()
+        self.assertFalse(myhook.frozen)
+        myhook.freeze()
+        self.assertTrue(myhook.frozen)
+
+        with mock.patch('hooks.utils.logger') as logger:
+            myhook.register("myhook", receiver)
+
+        logger.warning.assert_called_once_with(
+            "Hook %s was registered after the registry was frozen", "myhook")
+        self.assertEqual(len(myhook._registry["myhook"]._registry), 1)
+        self.assertFalse(myhook.frozen)
+
+        myhook.freeze(strict=True)
+        self.assertRaises(FrozenError, myhook.register, "myhook", receiver)
+        self.assertEqual(len(myhook._registry["myhook"]._registry), 1)
+
+        myhook.unfreeze()
+        self.assertFalse(myhook.frozen)
+        myhook.register("myhook", receiver)
+        self.assertEqual(len(myhook._registry["myhook"]._registry), 2)
+
+    def test_freeze_compact(self):
+        """
+        Should convert the registry into immutable\
+        containers, and back on late registrations
+        """
+        myhook = TemplateHook()
+        myhook.register("myhook", receiver)
+        myhook.freeze()
+        self.assertTupleEqual(myhook._registry["myhook"]._registry, (receiver, ))
+
+        if MappingProxyType is not None:
+            self.assertIsInstance(myhook._registry, MappingProxyType)
+
+        self.assertEqual(myhook.render("myhook", "context"), "None")
+
+        with mock.patch('hooks.utils.logger'):
+            myhook.register("myhook", receiver)
+            myhook.register("otherhook", receiver)
+
+        self.assertIsInstance(myhook._registry, dict)
+        self.assertListEqual(
+            myhook._registry["myhook"]._registry, [receiver, receiver])
+
+        myhook.freeze()
+        myhook.unregister("myhook", receiver)
+        self.assertListEqual(myhook._registry["myhook"]._registry, [receiver])
+        myhook.unregister_all("otherhook")
+        self.assertListEqual(myhook._registry["otherhook"]._registry, [])
+
+        myhook.unfreeze()
+        self.assertIsInstance(myhook._registry, dict)
+
+    def test_freeze_late_registration_once(self):
+        myhook = SignalHook()
+        myhook.freeze()
+
+        with mock.patch('hooks.utils.logger') as logger:
+            myhook.connect("mysignal", receiver, weak=False)
+            myhook.connect("othersignal", receiver, weak=False)
+
+        logger.warning.assert_called_once_with(
+            "Hook %s was registered after the registry was frozen", "mysignal")
+        self.assertFalse(myhook.frozen)
+        self.assertIsInstance(myhook._registry, dict)
+
+    def test_freeze_compact_signal_hook(self):
+        myhook = SignalHook()
+        myhook.connect("mysignal", receiver, weak=False)
+        myhook.freeze()
+
+        if MappingProxyType is not None:
+            self.assertIsInstance(myhook._registry, MappingProxyType)
+
+        self.assertEqual(len(myhook.send("mysignal")), 1)
+        myhook.unfreeze()
+        self.assertIsInstance(myhook._registry, dict)
+
+    def test_frozen_mapping(self):
+        mapping = {"foo": "bar"}
+        frozen = frozen_mapping(mapping)
+        self.assertDictEqual(dict(frozen), mapping)
+        mapping["baz"] = "qux"
+        self.assertNotIn("baz", frozen)
+
+        if MappingProxyType is not None:
+            with self.assertRaises(TypeError):
+                frozen["foo"] = "foo"
+
+    def test_freeze_form_and_view_hooks(self):
+        formhook = FormHook()
+        formhook.freeze(strict=True)
+        self.assertRaises(FrozenError, formhook.register, MyForm)
+
+        viewhook = ViewHook()
+        viewhook.freeze(strict=True)
+        self.assertRaises(FrozenError, viewhook.register, MyViewHook)
+
+
+class WarmUpTest(TestCase):
+
+    def setUp(self):
+        signal_hook.connect("warmup-signal", receiver, weak=False)
+        template_hook.register("warmup.hook", receiver)
+        template_hook.register("warmup.*", receiver)
+
+    def tearDown(self):
+        warmup.unfreeze()
+        signal_hook.disconnect("warmup-signal", receiver)
+        template_hook.unregister_all("warmup.hook")
+        template_hook.unregister_all("warmup.*")
+
+    def test_registries(self):
+        formhook = FormHook()
+        viewhook = ViewHook()
+        registries = warmup.registries()
+        self.assertIn(signal_hook, registries)
+        self.assertIn(template_hook, registries)
+        self.assertIn(formhook, registries)
+        self.assertIn(viewhook, registries)
+
+    def test_warm_up(self):
+        formhook = FormHook()
+        formhook.register(MyForm)
+        viewhook = ViewHook()
+        viewhook.register(MyViewHook)
+        signal = signal_hook._registry["warmup-signal"]
+        self.assertDictEqual(signal._dispatch_cache, {})
+
+        warmup.warm_up()
+        self.assertEqual(len(signal._dispatch_cache), 1)
+        self.assertIn("warmup.hook", template_hook._patterns._cache)
+        self.assertIn('hook%d', formhook._plans)
+        self.assertTupleEqual(viewhook._plans['get'], ())
+        self.assertTupleEqual(viewhook._plans['post'], (MyViewHook, ))
+
+        for registry in warmup.registries():
+            self.assertTrue(registry.frozen)
+            self.assertFalse(registry.strict)
+
+    def test_warm_up_strict(self):
+        warmup.warm_up(strict=True)
+        self.assertRaises(
+            FrozenError, signal_hook.connect, "warmup-signal", receiver)
+
+    def test_warm_up_no_freeze(self):
+        warmup.warm_up(freeze=False)
+        self.assertFalse(signal_hook.frozen)
+        self.assertFalse(template_hook.frozen)
+
+    def test_warm_up_gc_freeze(self):
+        with mock.patch('hooks.warmup.gc') as gc:
+            warmup.warm_up(freeze=False)
+            self.assertFalse(gc.freeze.called)
+            warmup.warm_up(freeze=False, gc_freeze=True)
+            gc.freeze.assert_called_once_with()
+            self.assertFalse(gc.collect.called)
+
+    def test_warm_up_templates(self):
+        template = mock.Mock()
+
+        with mock.patch('hooks.warmup.get_template', return_value=template) as get_template:
+            warmup.warm_up(templates=['foo.html'], freeze=False)
+
+        get_template.assert_called_once_with('foo.html')
+        template.render.assert_called_once_with({})
+
+        with mock.patch('hooks.warmup.logger') as logger:
+            warmup.warm_up(templates=['missing.html'], freeze=False)
+
+        self.assertEqual(logger.warning.call_count, 1)
+
+    def test_app_config(self):
+        config = apps.get_app_config('hooks')
+        self.assertEqual(config.verbose_name, "Hooks")
+
+        config.ready()
+        self.assertFalse(template_hook.frozen)
+
+        with override_settings(HOOKS_WARMUP=True, HOOKS_FROZEN_STRICT=True):
+            config.ready()
+
+        self.assertTrue(template_hook.frozen)
+        self.assertTrue(template_hook.strict)
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+# Python 3.5+ only, see tests_jinja2ext
+
+
+async def func_async(context):
+    return "<b>bad</b>"
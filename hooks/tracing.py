@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import threading
+from timeit import default_timer
+
+from .utils import qualname
+
+
+__all__ = [
+    'tracer',
+    'set_tracer',
+    'Tracer',
+    'InMemoryTracer',
+    'OpenTelemetryTracer'
+]
+
+#: Span names
+TEMPLATE = 'hooks.template'
+SIGNAL = 'hooks.signal'
+FORM_IS_VALID = 'hooks.form.is_valid'
+FORM_SAVE = 'hooks.form.save'
+CALLBACK = 'hooks.callback'
+
+
+class _NoopSpan(object):
+    """
+    @Api private
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer(object):
+    """
+    No-op tracer, this is the default one and\
+    the base class for tracers. Hooks check\
+    :py:attr:`enabled` before creating any span,\
+    so the no-op tracer costs an attribute lookup
+
+    :ivar bool enabled: Whether hook dispatches are traced
+    :ivar bool callbacks: Whether every callback\
+    is traced, within the dispatch span
+    """
+    enabled = False
+    callbacks = False
+
+    def span(self, name, attributes=None):
+        """
+        Start a span
+
+        :param str name: The span name
+        :param dict attributes: The span attributes
+        :return: A context manager returning\
+        the span, which must have a ``set_attribute``\
+        method same as OpenTelemetry spans
+        """
+        return _NOOP_SPAN
+
+
+class Span(object):
+    """
+    Span recorded by :py:class:`InMemoryTracer`
+
+    :ivar str name: The span name
+    :ivar dict attributes: The span attributes
+    :ivar parent: The enclosing span or ``None``
+    :ivar float duration: Elapsed seconds
+    :ivar error: The raised exception or ``None``
+    """
+    __slots__ = (
+        'name', 'attributes', 'parent',
+        'start', 'duration', 'error', '_tracer')
+
+    def __init__(self, tracer, name, attributes=None):
+        self.name = name
+        self.attributes = dict(attributes or ())
+        self.parent = None
+        self.start = None
+        self.duration = None
+        self.error = None
+        self._tracer = tracer
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        stack = self._tracer._stack()
+
+        if stack:
+            self.parent = stack[-1]
+
+        stack.append(self)
+        self.start = default_timer()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.duration = default_timer() - self.start
+        self.error = exc_value
+        self._tracer._stack().pop()
+        self._tracer._finish(self)
+        return False
+
+
+class InMemoryTracer(Tracer):
+    """
+    Tracer keeping the finished spans\
+    in memory, meant for tests::
+
+        from hooks import tracing
+
+        tracer = tracing.InMemoryTracer()
+        tracing.set_tracer(tracer)
+        # ...
+        tracer.spans
+
+    :param bool callbacks: Trace every callback
+    :ivar list spans: Finished spans, in finishing order
+    """
+    enabled = True
+
+    def __init__(self, callbacks=True):
+        self.callbacks = callbacks
+        self.spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        """
+        @Api private
+        Spans in progress of the current thread
+        """
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def _finish(self, span):
+        """
+        @Api private
+        """
+        with self._lock:
+            self.spans.append(span)
+
+    def span(self, name, attributes=None):
+        return Span(self, name, attributes)
+
+    def clear(self):
+        """
+        Remove all the finished spans
+        """
+        with self._lock:
+            del self.spans[:]
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Tracer creating OpenTelemetry spans\
+    within the current span::
+
+        from opentelemetry import trace
+        from hooks import tracing
+
+        tracing.set_tracer(tracing.OpenTelemetryTracer(
+            trace.get_tracer('hooks')))
+
+    :param tracer: An OpenTelemetry tracer
+    :param bool callbacks: Trace every callback
+    """
+    enabled = True
+
+    def __init__(self, tracer, callbacks=False):
+        self.tracer = tracer
+        self.callbacks = callbacks
+
+    def span(self, name, attributes=None):
+        return self.tracer.start_as_current_span(name, attributes=attributes)
+
+
+#: Current tracer, see :py:func:`set_tracer`
+tracer = Tracer()
+
+
+def set_tracer(new_tracer):
+    """
+    Change the tracer used by all the hooks
+
+    :param new_tracer: A :py:class:`Tracer` instance,\
+    ``None`` restores the no-op tracer
+    :return: The previous tracer
+    :rtype: :py:class:`Tracer`
+    """
+    global tracer
+
+    previous = tracer
+    tracer = new_tracer or Tracer()
+    return previous
+
+
+def set_result_size(span, result):
+    """
+    @Api private
+    Set the ``hook.result_size`` attribute,\
+    the length of the result when it has one
+    """
+    try:
+        span.set_attribute('hook.result_size', len(result))
+    except TypeError:
+        pass
+
+
+def dispatch_span(name, hook_type, hook_name):
+    """
+    @Api private
+    Span of a hook dispatch
+    """
+    return tracer.span(name, {
+        'hook.type': hook_type,
+        'hook.name': hook_name or ''})
+
+
+def callback_span(hook_type, hook_name, callback):
+    """
+    @Api private
+    Span of a callback call
+    """
+    return tracer.span(CALLBACK, {
+        'hook.type': hook_type,
+        'hook.name': hook_name or '',
+        'hook.callback': qualname(callback)})
+
+
+def call(hook_type, hook_name, callback, func, *args, **kwargs):
+    """
+    @Api private
+    Call a callback within a span
+    """
+    with callback_span(hook_type, hook_name, callback) as span:
+        result = func(*args, **kwargs)
+        set_result_size(span, result)
+        return result
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import logging
+
+try:
+    from sys import intern as _intern
+except ImportError:  # Python 2
+    _intern = intern
+
+try:
+    from types import MappingProxyType
+except ImportError:  # Python 2
+    MappingProxyType = None
+
+
+__all__ = [
+    'EMPTY_ARGS',
+    'intern_name',
+    'qualname',
+    'frozen_mapping',
+    'swapped',
+    'FrozenError',
+    'FreezeMixin'
+]
+
+logger = logging.getLogger(__name__)
+
+#: Shared (immutable) default for ``providing_args``
+EMPTY_ARGS = ()
+
+
+def intern_name(name):
+    """
+    Intern a hook name, so registries share a single\
+    string and lookups can be resolved by identity.\
+    Unicode names are returned as-is in Python 2
+
+    :param str name: Hook name
+    :return: The interned name
+    :rtype: str
+    """
+    try:
+        return _intern(name)
+    except TypeError:
+        return name
+
+
+def qualname(func):
+    """
+    Qualified name of a callable
+
+    :param callable func: Function, method, class or callable object
+    :return: The module and qualified name in dot notation
+    :rtype: str
+    """
+    return '.'.join((
+        getattr(func, '__module__', None) or '?',
+        getattr(func, '__qualname__', None) or
+        getattr(func, '__name__', None) or
+        type(func).__name__))
+
+
+def frozen_mapping(mapping):
+    """
+    Read-only copy of a dict. The copy is compact,\
+    no space is left from deleted keys.\
+    This is a regular dict copy in Python 2
+
+    :param dict mapping: The dict to copy
+    :return: The read-only copy
+    :rtype: :py:class:`types.MappingProxyType`
+    """
+    mapping = dict(mapping)
+
+    if MappingProxyType is None:
+        return mapping
+
+    return MappingProxyType(mapping)
+
+
+def swapped(items, owned, add, remove):
+    """
+    Items after a swap, as done by reloading\
+    (see :py:mod:`hooks.reload`). Added items\
+    already registered are skipped, and only the items\
+    added by a swap (owned) are removed, so registrations\
+    done in code are left alone. This is the same\
+    as :py:meth:`hooks.signalhook.HookSignal.swap`
+
+    :param list items: The registered items
+    :param list owned: The items added by previous swaps
+    :param list add: Items to append
+    :param list remove: Items to remove
+    :return: The new items and the new owned items
+    :rtype: tuple
+    """
+    items = list(items)
+    owned = list(owned)
+
+    for item in remove:
+        if item not in owned:
+            continue
+
+        owned.remove(item)
+
+        try:
+            items.remove(item)
+        except ValueError:  # Unregistered in code
+            pass
+
+    for item in add:
+        if item not in items:
+            items.append(item)
+            owned.append(item)
+
+    return items, owned
+
+
+class FrozenError(RuntimeError):
+    """
+    Registration into a registry frozen with ``strict=True``
+    """
+
+
+class FreezeMixin(object):
+    """
+    Registry that can be frozen once all the hooks\
+    are registered (see :py:func:`hooks.warmup.warm_up`).\
+    Late registrations are logged, or rejected\
+    when the registry is frozen with ``strict=True``.
+
+    Freezing converts the registry into immutable\
+    tuples and read-only mappings, so a pre-fork server\
+    (i.e: gunicorn ``--preload``) shares them across workers.\
+    A late registration converts them back and unfreezes\
+    the registry, so the warning is logged once
+
+    :ivar bool frozen: Whether the registry is frozen
+    """
+    frozen = False
+    strict = False
+
+    def freeze(self, strict=False):
+        """
+        Freeze the registry
+
+        :param bool strict: Raise :py:class:`FrozenError`\
+        on late registrations, instead of logging a warning
+        """
+        self.frozen = True
+        self.strict = strict
+        self._compact()
+
+    def unfreeze(self):
+        """
+        Allow registrations again
+        """
+        self.frozen = False
+        self.strict = False
+        self._thaw()
+
+    def _compact(self):
+        """
+        @Api private
+        Convert the registry into immutable containers
+        """
+
+    def _thaw(self):
+        """
+        @Api private
+        Convert the registry back into mutable containers
+        """
+
+    def _late_registration(self, name):
+        """
+        @Api private
+        Log or reject a registration into the frozen registry
+        """
+        msg = "Hook %s was registered after the registry was frozen"
+
+        if self.strict:
+            raise FrozenError(msg % (name, ))
+
+        logger.warning(msg, name)
+        self.unfreeze()
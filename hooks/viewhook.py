@@ -3,62 +3,24 @@
 from __future__ import unicode_literals
 
 from . import deprecations
+from .viewmixin import HookBase, merge_context
 
 
 __all__ = ["Hook", "HookBase"]
 
 
-deprecations.warn("viewhook is deprecated in favor of formhook")
-
-
-class HookBase(object):
-    """
-    View hooks should subclass this.
-    """
-    def __init__(self, request, *args, **kwargs):
-        self.request = request
-        self.args = args
-        self.kwargs = kwargs
-        self.context = {}
-
-    def dispatch(self, *args, **kwargs):
-        pass
-
-    def get(self, *args, **kwargs):
-        """
-        Should get call on GET request.
-        Returns None.
-        """
-        pass
-
-    def post(self, *args, **kwargs):
-        """
-        Should get call on POST request.
-        You should define all your form here,
-        add forms to kwargs so you can validate them later.
-        Returns None.
-        """
-        pass
-
-    def is_valid(self):
-        """
-        Should get call on validate forms.
-        Returns True if valid or False otherwise.
-        """
-        return True
-
-    def save(self, *args, **kwargs):
-        """
-        Save forms.
-        Returns None.
-        """
-        pass
+deprecations.warn(
+    "viewhook is deprecated in favor of formhook and viewmixin")
 
 
 class HookProxy(object):
 
+    __slots__ = ('_hooks', '_context', '_context_key')
+
     def __init__(self, registry, *args, **kwargs):
         self._hooks = [hook(*args, **kwargs) for hook in registry]
+        self._context = None
+        self._context_key = None
 
     def dispatch(self, *args, **kwargs):
         for hook in self._hooks:
@@ -82,12 +44,9 @@ class HookProxy(object):
 
     @property
     def context(self):
-        context = {}
-
-        for hook in self._hooks:
-            context.update(hook.context)
-
-        return context
+        self._context, self._context_key = merge_context(
+            self._hooks, self._context, self._context_key)
+        return self._context
 
 
 class Hook(object):
@@ -0,0 +1,468 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import weakref
+
+from .utils import FreezeMixin
+
+
+__all__ = [
+    'Hook',
+    'HookBase',
+    'HookViewMixin',
+    'HookContext',
+    'LazyValue',
+    'MergedContext',
+    'merge_context'
+]
+
+# Methods a hook may override per HTTP method
+_HANDLERS = {
+    'get': ('get', ),
+    'post': ('post', 'is_valid', 'save')
+}
+# Overriding these means the hook is used for every HTTP method
+_COMMON_HANDLERS = ('__init__', 'dispatch')
+# View hook method run for every request method, same as the\
+# view handlers (i.e: ProcessFormView.put calls post).\
+# Requests with other methods only run ``dispatch``
+_HOOK_METHODS = {
+    'get': 'get',
+    'head': 'get',
+    'post': 'post',
+    'put': 'post',
+    'patch': 'post'}
+
+
+class HookContext(dict):
+    """
+    The context of a hook. This is a regular dict\
+    keeping a version that changes on every change,\
+    so the merged context of all hooks is only\
+    computed again when a hook context changes
+    """
+    __slots__ = ('version', )
+
+    def __init__(self, *args, **kwargs):
+        super(HookContext, self).__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        super(HookContext, self).__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        super(HookContext, self).__delitem__(key)
+        self.version += 1
+
+    def update(self, *args, **kwargs):
+        super(HookContext, self).update(*args, **kwargs)
+        self.version += 1
+
+    def __ior__(self, other):
+        # dict.__ior__ (Python 3.9+) does not call update
+        self.update(other)
+        return self
+
+    def setdefault(self, key, default=None):
+        self.version += 1
+        return super(HookContext, self).setdefault(key, default)
+
+    def pop(self, *args):
+        self.version += 1
+        return super(HookContext, self).pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super(HookContext, self).popitem()
+
+    def clear(self):
+        super(HookContext, self).clear()
+        self.version += 1
+
+
+class LazyValue(object):
+    """
+    A context value computed on first access,\
+    useful for expensive values that may\
+    not get rendered::
+
+        self.context['articles'] = LazyValue(
+            lambda: list(Article.objects.all()))
+
+    :param callable func: Function returning the value
+    """
+    __slots__ = ('func', '_value', '_evaluated')
+
+    def __init__(self, func):
+        self.func = func
+        self._value = None
+        self._evaluated = False
+
+    def __call__(self):
+        if not self._evaluated:
+            self._value = self.func()
+            self._evaluated = True
+
+        return self._value
+
+
+class MergedContext(dict):
+    """
+    Context of all the hooks merged.\
+    :py:class:`LazyValue` values\
+    are resolved on item access and\
+    by ``items()`` and ``values()``.\
+    Copies (i.e: ``dict(context)``) keep\
+    the values that were not resolved yet
+    """
+    __slots__ = ()
+
+    def _resolve(self):
+        """
+        @Api private
+        Resolve all the lazy values
+        """
+        lazy_keys = [
+            key
+            for key, value in super(MergedContext, self).items()
+            if isinstance(value, LazyValue)]
+
+        for key in lazy_keys:
+            self.__getitem__(key)
+
+    def __getitem__(self, key):
+        value = super(MergedContext, self).__getitem__(key)
+
+        if isinstance(value, LazyValue):
+            value = value()
+            super(MergedContext, self).__setitem__(key, value)
+
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        self._resolve()
+        return super(MergedContext, self).items()
+
+    def values(self):
+        self._resolve()
+        return super(MergedContext, self).values()
+
+
+def merge_context(hooks, context=None, key=None):
+    """
+    Merge the context of the hooks. The previously\
+    merged context is returned when no hook context\
+    changed, this requires the contexts to be\
+    :py:class:`HookContext` instances
+
+    :param list hooks: Hook instances
+    :param dict context: Previously merged context
+    :param tuple key: Key returned along the previous context
+    :return: The merged context and its key
+    :rtype: tuple
+    """
+    if (context is not None and
+            key is not None and
+            len(key) == len(hooks) and
+            all(hook.context is hook_context and
+                hook_context.version == version
+                for hook, (hook_context, version) in zip(hooks, key))):
+        return context, key
+
+    context = MergedContext()
+    key = []
+
+    for hook in hooks:
+        context.update(hook.context)
+        version = getattr(hook.context, 'version', None)
+
+        if key is not None and version is not None:
+            key.append((hook.context, version))
+        else:
+            key = None
+
+    return context, key if key is None else tuple(key)
+
+
+class HookBase(object):
+    """
+    View hooks should subclass this.
+
+    :cvar http_method_names: HTTP methods (lower case)\
+    for which the hook is created. When ``None``,\
+    it's derived from the overridden methods (i.e: a hook\
+    overriding only ``get`` is not created on POST),\
+    hooks overriding ``__init__`` or ``dispatch``\
+    are created for every HTTP method
+    """
+    http_method_names = None
+
+    def __init__(self, request, *args, **kwargs):
+        self.request = request
+        self.args = args
+        self.kwargs = kwargs
+        self.context = HookContext()
+
+    def dispatch(self, *args, **kwargs):
+        pass
+
+    def get(self, *args, **kwargs):
+        """
+        Should get call on GET request.
+        Returns None.
+        """
+        pass
+
+    def post(self, *args, **kwargs):
+        """
+        Should get call on POST request.
+        You should define all your form here,
+        add forms to kwargs so you can validate them later.
+        Returns None.
+        """
+        pass
+
+    def is_valid(self):
+        """
+        Should get call on validate forms.
+        Returns True if valid or False otherwise.
+        """
+        return True
+
+    def save(self, *args, **kwargs):
+        """
+        Save forms.
+        Returns None.
+        """
+        pass
+
+
+def _overrides(hook, name):
+    return any(
+        name in vars(klass)
+        for klass in hook.__mro__
+        if klass not in (HookBase, object))
+
+
+def _serves(hook, method):
+    """
+    Check whether the hook class should\
+    be created for the HTTP method
+    """
+    if hook.http_method_names is not None:
+        return method in hook.http_method_names
+
+    if any(_overrides(hook, name) for name in _COMMON_HANDLERS):
+        return True
+
+    return any(
+        _overrides(hook, name)
+        for name in _HANDLERS.get(method, ()))
+
+
+class HookProxy(object):
+    """
+    Makes a sequence of hooks behave as a single hook.\
+    Hooks are created on first use, the merged\
+    context is computed again only when a hook\
+    context changes. See :py:class:`Hook`
+
+    :param tuple registry: Hook classes to create
+    :param \*args: Positional arguments passed to the hooks,\
+    the first one is the request
+    :param \*\*kwargs: Keyword arguments passed to the hooks
+    """
+    __slots__ = (
+        '_registry', '_args', '_kwargs', '_instances',
+        '_context', '_context_key')
+
+    def __init__(self, registry, *args, **kwargs):
+        self._registry = registry
+        self._args = args
+        self._kwargs = kwargs
+        self._instances = None
+        self._context = None
+        self._context_key = None
+
+    @property
+    def _hooks(self):
+        if self._instances is None:
+            self._instances = [
+                hook(*self._args, **self._kwargs)
+                for hook in self._registry]
+
+        return self._instances
+
+    def dispatch(self, *args, **kwargs):
+        for hook in self._hooks:
+            hook.dispatch(*args, **kwargs)
+
+    def get(self, *args, **kwargs):
+        for hook in self._hooks:
+            hook.get(*args, **kwargs)
+
+    def post(self, *args, **kwargs):
+        for hook in self._hooks:
+            hook.post(*args, **kwargs)
+
+    def is_valid(self):
+        # Validate all so errors are attached
+        return all([hook.is_valid() for hook in self._hooks])
+
+    def save(self, *args, **kwargs):
+        for hook in self._hooks:
+            hook.save(*args, **kwargs)
+
+    @property
+    def context(self):
+        """
+        Context of all the hooks merged,\
+        see :py:func:`merge_context`
+
+        :rtype: :py:class:`MergedContext`
+        """
+        self._context, self._context_key = merge_context(
+            self._hooks, self._context, self._context_key)
+        return self._context
+
+
+class Hook(FreezeMixin):
+    """
+    Container of view hooks, replaces\
+    :py:class:`hooks.viewhook.Hook`. Should be used\
+    through :py:class:`HookViewMixin`
+    """
+    # All created hooks, used for warming up
+    _instances = weakref.WeakSet()
+
+    def __init__(self):
+        self._registry = []
+        self._plans = {}
+        self._instances.add(self)
+
+    def __call__(self, request, *args, **kwargs):
+        """
+        Create the hooks for the request HTTP method
+
+        :param request: The request
+        :param \*args: Positional arguments passed to the hooks
+        :param \*\*kwargs: Keyword arguments passed to the hooks
+        :return: Proxy to handle all the hooks as they were one
+        :rtype: :py:class:`HookProxy`
+        """
+        method = request.method.lower()
+        method = _HOOK_METHODS.get(method, method)
+
+        try:
+            plan = self._plans[method]
+        except KeyError:
+            plan = self._plan(method)
+
+        return HookProxy(plan, request, *args, **kwargs)
+
+    def _plan(self, method):
+        """
+        @Api private
+        Compute and cache the hooks serving the method
+
+        :param str method: Lowercase HTTP method
+        :return: Sequence of hooks
+        :rtype: tuple
+        """
+        plan = tuple(
+            hook
+            for hook in self._registry
+            if _serves(hook, method))
+        self._plans[method] = plan
+        return plan
+
+    def warm_up(self):
+        """
+        Precompute the hooks of the GET and POST methods
+        """
+        self._plan('get')
+        self._plan('post')
+
+    def register(self, hook):
+        """
+        Register a hook
+
+        :param hook: A :py:class:`HookBase` subclass
+        """
+        assert callable(hook), \
+            "Hook must be a callable"
+        assert issubclass(hook, HookBase), \
+            "The hook does not inherit from HookBase"
+
+        if self.frozen:
+            self._late_registration(hook)
+
+        self._registry.append(hook)
+        self._plans.clear()
+
+    def unregister(self, hook):
+        """
+        Unregister a hook
+
+        :param hook: A :py:class:`HookBase` subclass
+        """
+        try:
+            self._registry.remove(hook)
+        except ValueError:
+            return
+
+        self._plans.clear()
+
+
+class HookViewMixin(object):
+    """
+    Mixin for class-based views, runs the view hooks\
+    along the view: ``dispatch``, then ``get`` (for GET\
+    and HEAD requests) or ``post`` (for POST, PUT and PATCH\
+    requests), when the view handles the request method. For form views, the hooks are validated along the form\
+    and saved when everything is valid.\
+    The hooks are available in the template as ``hooks``,\
+    their merged context as ``hooks.context``
+
+    :cvar view_hook: Instance of :py:class:`Hook`
+    """
+    view_hook = None
+
+    def dispatch(self, request, *args, **kwargs):
+        self.hooks = self.view_hook(request, *args, **kwargs)
+        self.hooks.dispatch(*args, **kwargs)
+        method = request.method.lower()
+
+        try:
+            hook_method = _HOOK_METHODS[method]
+        except KeyError:
+            hook_method = None
+
+        # Not allowed methods are left to the view (405)
+        if (hook_method is not None and
+                method in self.http_method_names and
+                hasattr(self, method)):
+            getattr(self.hooks, hook_method)(*args, **kwargs)
+
+        return super(HookViewMixin, self).dispatch(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        if not self.hooks.is_valid():
+            return self.form_invalid(form)
+
+        response = super(HookViewMixin, self).form_valid(form)
+        self.hooks.save()
+        return response
+
+    def get_context_data(self, **kwargs):
+        context = super(HookViewMixin, self).get_context_data(**kwargs)
+        context['hooks'] = self.hooks
+        return context
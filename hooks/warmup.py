@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import gc
+import logging
+
+from django.template.loader import get_template
+
+from . import formhook
+from . import signalhook
+from . import templatehook
+from . import viewmixin
+from .utils import EMPTY_ARGS
+
+
+__all__ = ['warm_up', 'registries']
+
+logger = logging.getLogger(__name__)
+
+
+def registries():
+    """
+    All the hook registries: the signal and template\
+    dispatchers plus every form and view hook
+
+    :return: The registries
+    :rtype: list
+    """
+    return (
+        [signalhook.hook, templatehook.hook] +
+        list(formhook.Hook._instances) +
+        list(viewmixin.Hook._instances))
+
+
+def _render_templates(templates):
+    """
+    @Api private
+    Compile and render the templates with an empty context
+    """
+    for template_name in templates:
+        try:
+            get_template(template_name).render({})
+        except Exception:
+            logger.warning(
+                "Template %s could not be pre-rendered",
+                template_name, exc_info=True)
+
+
+def warm_up(templates=EMPTY_ARGS, freeze=True, strict=False, gc_freeze=False):
+    """
+    Precompute the dispatch state of every registered hook,\
+    so the first requests don't pay for it.\
+    This is called by :py:class:`hooks.apps.HooksConfig`\
+    when the ``HOOKS_WARMUP`` setting is ``True``,\
+    or it can be called once all the hooks are registered,\
+    i.e: in ``wsgi.py`` after ``get_wsgi_application()``
+
+    :param list templates: Names of templates to compile\
+    and render with an empty context, so their hook tags\
+    are compiled as well. Errors are logged
+    :param bool freeze: Freeze the registries,\
+    see :py:class:`hooks.utils.FreezeMixin`
+    :param bool strict: Reject late registrations\
+    instead of logging a warning
+    :param bool gc_freeze: Move every tracked object into the\
+    permanent generation (``gc.freeze()``, Python 3.7+),\
+    so the collector of forked workers doesn't write into\
+    the pages shared with the master. No collection is run\
+    before, it would leave holes in those pages. This is best\
+    done right before forking, with ``gc.disable()`` called\
+    early in the master and ``gc.enable()`` in the workers
+    """
+    for registry in registries():
+        registry.warm_up()
+
+    _render_templates(templates)
+
+    if freeze:
+        for registry in registries():
+            registry.freeze(strict=strict)
+
+    if gc_freeze and hasattr(gc, 'freeze'):
+        gc.freeze()
+
+
+def unfreeze():
+    """
+    Allow registrations again in every registry
+    """
+    for registry in registries():
+        registry.unfreeze()
@@ -21,6 +21,8 @@ setup(
     packages=[
         'hooks',
         'hooks.templatetags',
+        'hooks.management',
+        'hooks.management.commands',
     ],
     include_package_data=True,
     zip_safe=False,